@@ -1,61 +1,243 @@
 import json
 import os
+import sqlite3
+import tempfile
 
 import pandas as pd
+import xlsxwriter
+
+# Number of products turned into a DataFrame at a time
+CHUNK_SIZE = 5000
+# Number of characters read from a JSON file at a time
+READ_BLOCK_SIZE = 1 << 20
 
 
 def find_json_files(directory='.'):
-    """Find all JSON files in the directory and its subdirectories."""
+    """Find all JSON and JSON Lines files in the directory and its subdirectories."""
     json_files = []
     for root, dirs, files in os.walk(directory):
         for file in files:
-            if file.endswith('.json'):
+            if file.endswith(('.json', '.jsonl')):
                 json_files.append(os.path.join(root, file))
     return json_files
 
 
-def json_to_dataframe(json_file):
+def iter_json_array(json_file, block_size=READ_BLOCK_SIZE):
+    """
+    Yield the elements of a top-level JSON array one at a time.
+    The file is read in blocks, so memory use does not grow with the file size.
+    """
+    decoder = json.JSONDecoder()
+    with open(json_file, 'r', encoding='utf-8') as f:
+        buffer = ''
+        pos = 0
+        eof = False
+        # None before '[', then 'first', 'element' (after a ',') or 'separator' (after an element)
+        expect = None
+        while True:
+            while pos < len(buffer) and buffer[pos].isspace():
+                pos += 1
+
+            if pos >= len(buffer):
+                if eof:
+                    raise ValueError(f"Unexpected end of JSON array in {json_file}")
+                more = f.read(block_size)
+                eof = not more
+                buffer = buffer[pos:] + more
+                pos = 0
+                continue
+
+            char = buffer[pos]
+            if expect is None:
+                if char != '[':
+                    raise ValueError(f"{json_file} does not contain a JSON array")
+                expect = 'first'
+                pos += 1
+                continue
+
+            # Exactly one ',' between elements; a leading, doubled or trailing one is an error
+            if expect == 'separator':
+                if char == ']':
+                    return
+                if char != ',':
+                    raise ValueError(f"Expected ',' or ']' after an element in {json_file}")
+                expect = 'element'
+                pos += 1
+                continue
+            if char == ']' and expect == 'first':
+                return
+            if char in ',]':
+                raise ValueError(f"Unexpected '{char}' in JSON array in {json_file}")
+
+            try:
+                element, end = decoder.raw_decode(buffer, pos)
+                # A number cut off by the block boundary ("1." or "1e") still decodes, so the
+                # element only counts as complete once the following ',' or ']' is in the buffer
+                after = end
+                while after < len(buffer) and buffer[after].isspace():
+                    after += 1
+                if after < len(buffer) and buffer[after] not in ',]':
+                    if eof:
+                        raise ValueError(f"Expected ',' or ']' after an element in {json_file}")
+                    complete = False
+                else:
+                    complete = after < len(buffer) or eof
+            except json.JSONDecodeError:
+                # An element cut off at the end of the buffer needs the next block
+                if eof:
+                    raise
+                complete = False
+            if not complete:
+                more = f.read(block_size)
+                eof = not more
+                buffer = buffer[pos:] + more
+                pos = 0
+                continue
+            yield element
+            pos = end
+            expect = 'separator'
+
+
+def iter_jsonl(json_file):
     """
-    Convert a JSON file to a pandas DataFrame with params expanded.
-    Each paramName becomes its own column.
+    Yield the products in a JSON Lines file.
+    Lines written by the crawlers ({"url": ..., "data": ...}) are unwrapped to their data.
     """
     with open(json_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if isinstance(record, dict) and 'data' in record and 'url' in record:
+                record = record['data']
+            yield record
+
+
+def iter_products(json_file):
+    """Stream the products of a JSON array file or a JSON Lines file."""
+    if json_file.endswith('.jsonl'):
+        return iter_jsonl(json_file)
+    return iter_json_array(json_file)
 
-    # Create a list to hold the expanded records
-    expanded_records = []
 
-    # Process each product
-    for product in data:
-        # Create a base record with product details
-        base_record = {
-            'product_id': product.get('product_id', ''),
-            'product_name': product.get('product_name', '')
-        }
+def product_to_record(product):
+    """Flatten one product into a record where each paramName becomes its own column."""
+    # Create a base record with product details
+    record = {
+        'product_id': product.get('product_id', ''),
+        'product_name': product.get('product_name', '')
+    }
 
-        # Extract params array
-        params = product.get('params', [])
+    # Add param values
+    for param in product.get('params', []):
+        param_name = param.get('paramName', '')
+        if param_name:
+            record[param_name] = param.get('param', '')
 
-        # Create a dictionary for param values
-        param_dict = {}
-        for param in params:
-            param_name = param.get('paramName', '')
-            param_value = param.get('param', '')
-            if param_name:
-                param_dict[param_name] = param_value
+    return record
 
-        # Combine base record with param dict
-        full_record = {**base_record, **param_dict}
-        expanded_records.append(full_record)
 
-    # Convert to DataFrame
-    df = pd.DataFrame(expanded_records)
+def iter_dataframes(json_file, chunk_size=CHUNK_SIZE):
+    """
+    Yield the products of a JSON (or JSON Lines) file as DataFrames of at most chunk_size rows.
+    Each paramName becomes its own column; chunks only have the columns their own products use.
+    """
+    records = []
+    for product in iter_products(json_file):
+        records.append(product_to_record(product))
+        if len(records) >= chunk_size:
+            yield pd.DataFrame(records)
+            records = []
+    if records:
+        yield pd.DataFrame(records)
+
 
-    return df
+def json_to_dataframe(json_file):
+    """
+    Convert a JSON (or JSON Lines) file to a single pandas DataFrame with params expanded.
+    The whole file ends up in memory; create_excel_file streams instead.
+    """
+    chunks = list(iter_dataframes(json_file))
+    if not chunks:
+        return pd.DataFrame(columns=['product_id', 'product_name'])
+    return pd.concat(chunks, ignore_index=True, sort=False)
 
 
-def create_excel_file(df, json_filename, output_dir='tmp'):
-    """Create an Excel file with the same base name as the JSON file."""
+def _scan_columns_and_pivot(json_file, pivot_db):
+    """
+    First pass over the file: collect the columns in order of first appearance and
+    spill every param value into the SQLite table used to build the pivot sheet.
+    """
+    columns = {'product_id': None, 'product_name': None}
+    pivot_db.execute("CREATE TABLE cells (name TEXT, col TEXT, value TEXT, seq INTEGER)")
+    rows = []
+    for seq, product in enumerate(iter_products(json_file)):
+        record = product_to_record(product)
+        name = record.pop('product_name')
+        record.pop('product_id')
+        for col, value in record.items():
+            columns.setdefault(col, None)
+            # pivot_table drops products without a name and skips missing values
+            if name is not None and value is not None:
+                if not isinstance(value, (str, int, float)):
+                    value = str(value)
+                rows.append((str(name), col, value, seq))
+        if len(rows) >= CHUNK_SIZE:
+            pivot_db.executemany("INSERT INTO cells VALUES (?, ?, ?, ?)", rows)
+            rows = []
+    pivot_db.executemany("INSERT INTO cells VALUES (?, ?, ?, ?)", rows)
+    pivot_db.execute("CREATE INDEX cells_name ON cells (name, col, seq)")
+    return list(columns)
+
+
+def _write_cell(worksheet, row, col, value):
+    """Write one cell, keeping strings as text rather than formulas or links."""
+    if isinstance(value, str):
+        worksheet.write_string(row, col, value)
+    else:
+        worksheet.write(row, col, value)
+
+
+def _write_pivot_sheet(workbook, pivot_db, header_format):
+    """
+    Add a sheet with the first value of every param per product name, sorted by name and
+    column, the same layout as pd.pivot_table(df, index='product_name', aggfunc='first').
+    The sheet is skipped when there are no param values.
+    """
+    value_columns = [row[0] for row in pivot_db.execute("SELECT DISTINCT col FROM cells ORDER BY col")]
+    if not value_columns:
+        return
+    positions = {col: i + 1 for i, col in enumerate(value_columns)}
+    worksheet = workbook.add_worksheet('Pivot Table')
+    worksheet.write_row(0, 0, ['product_name'] + value_columns, header_format)
+
+    row_index = 0
+    current = None
+    query = "SELECT name, col, value FROM cells ORDER BY name, col, seq"
+    for name, col, value in pivot_db.execute(query):
+        if name != current:
+            current = name
+            last_col = None
+            row_index += 1
+            worksheet.write_string(row_index, 0, name)
+        if col != last_col:
+            last_col = col
+            _write_cell(worksheet, row_index, positions[col], value)
+
+
+def create_excel_file(json_filename, output_dir='tmp', chunk_size=CHUNK_SIZE):
+    """
+    Create an Excel file with the same base name as the JSON file.
+
+    The Data sheet is written chunk by chunk through xlsxwriter's constant_memory mode,
+    and the pivot sheet is built from values spilled to a temporary SQLite file, so
+    memory use stays bounded by chunk_size whatever the size of the input.
+    The products are read from json_filename, so no DataFrame is passed in.
+
+    Returns:
+        excel_filename
+    """
     # Create the output directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
 
@@ -65,27 +247,36 @@ def create_excel_file(df, json_filename, output_dir='tmp'):
     # Create output filename
     excel_filename = os.path.join(output_dir, f"{base_name}.xlsx")
 
-    # Create Excel writer
-    with pd.ExcelWriter(excel_filename, engine='xlsxwriter') as writer:
-        df.to_excel(writer, sheet_name='Data', index=False)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pivot_db = sqlite3.connect(os.path.join(tmp_dir, 'pivot.db'))
+        try:
+            columns = _scan_columns_and_pivot(json_filename, pivot_db)
+
+            workbook = xlsxwriter.Workbook(excel_filename, {'constant_memory': True})
+            try:
+                header_format = workbook.add_format({'bold': True, 'border': 1})
+                data_sheet = workbook.add_worksheet('Data')
+                data_sheet.write_row(0, 0, columns, header_format)
 
-        # Create pivot table if there are enough columns
-        if len(df.columns) > 2:  # More than just product_id and product_name
-            # Select columns for pivot
-            value_columns = [col for col in df.columns if col not in ['product_id', 'product_name']]
+                row_count = 0
+                for chunk in iter_dataframes(json_filename, chunk_size):
+                    chunk = chunk.reindex(columns=columns)
+                    for values in chunk.itertuples(index=False, name=None):
+                        row_count += 1
+                        for col_index, value in enumerate(values):
+                            if not pd.isna(value):
+                                _write_cell(data_sheet, row_count, col_index, value)
+                print(f"  Converted {row_count} products into {len(columns)} columns")
 
-            if value_columns:
-                # Create pivot DataFrame
+                # Create pivot table if there are param columns
                 try:
-                    pivot_df = pd.pivot_table(
-                        df,
-                        index='product_name',
-                        values=value_columns,
-                        aggfunc='first'  # Since we're just showing the values
-                    )
-                    pivot_df.to_excel(writer, sheet_name='Pivot Table')
+                    _write_pivot_sheet(workbook, pivot_db, header_format)
                 except Exception as e:
                     print(f"  Warning: Could not create pivot table: {str(e)}")
+            finally:
+                workbook.close()
+        finally:
+            pivot_db.close()
 
     return excel_filename
 
@@ -104,11 +295,8 @@ def main():
     for json_file in json_files:
         try:
             print(f"Processing {json_file}...")
-            df = json_to_dataframe(json_file)
-            print(f"  Converted to DataFrame with shape {df.shape}")
-
             # Create Excel file
-            excel_file = create_excel_file(df, json_file)
+            excel_file = create_excel_file(json_file)
             processed_files.append(excel_file)
             print(f"  Created Excel file: {excel_file}")
 
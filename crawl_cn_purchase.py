@@ -1,182 +1,481 @@
+import argparse
+import asyncio
+import itertools
 import json
+import os
+import re
 import time
+from datetime import date, timedelta
+from urllib.parse import urlencode
 
-from curl_cffi import requests
+from curl_cffi.requests import AsyncSession
 from fake_useragent import UserAgent
 from lxml import etree
 
+from crawlers import config
+from crawlers.frontier import UrlFrontier
+from crawlers.html_tables import table_records
+from crawlers.scheduler import get_scheduler
+
 # 初始化UserAgent对象
 ua = UserAgent()
 
+# 按主机限速的调度器（搜索页的速率在config.SCHEDULER_HOST_OVERRIDES中单独设置）
+scheduler = get_scheduler()
 
-def get_dynamic_headers():
-    """动态生成headers"""
-    return {
-        'User-Agent': ua.random,
+SEARCH_URL = 'https://search.ccgp.gov.cn/bxsearch'
+OUTPUT_PATH = 'data/purchase_cn.json'
+# 记录上次采集进度的状态文件
+STATE_PATH = os.path.join(config.STATE_DIR, 'purchase_cn.state.json')
+
+# 按日期窗口拆分采集范围
+DEFAULT_START = date(2025, 1, 1)  # 没有采集记录时的默认起始日期
+WINDOW_DAYS = {'day': 1, 'week': 7}  # 窗口类型对应的天数
+MAX_PAGES = 200  # 搜索结果页中找不到总页数时逐页翻页的上限
+PAGER_PATTERN = re.compile(r'Pager\(\s*\{\s*size\s*:\s*(\d+)')  # 分页脚本中的总页数
+# 数据键：page{N}_{i}，N为跨窗口、跨运行连续编号的页码
+KEY_PATTERN = re.compile(r'page(\d+)_(\d+)')
+
+# 轮换使用的浏览器身份（TLS指纹），每个身份有独立的会话、Cookie和固定的User-Agent
+IDENTITY_TARGETS = ('chrome136', 'chrome131', 'chrome124')
+# 被封锁时的处理
+BLOCK_MARKERS = ('验证码', 'captcha', '访问过于频繁', '请求过于频繁')  # 出现这些文字说明请求被拦截
+BLOCK_BACKOFF = 30  # 身份第一次被封锁后暂停使用的秒数，连续被封锁时翻倍
+BLOCK_MAX_BACKOFF = 600  # 暂停时间上限（秒）
+BLOCK_MAX_ATTEMPTS = 4  # 一个请求最多尝试的次数（每次被封锁后换一个身份）
+
+
+class Identity:
+    """一个浏览器身份：固定的TLS指纹和User-Agent，以及保存Cookie、复用连接的会话"""
+
+    def __init__(self, impersonate, user_agent):
+        self.impersonate = impersonate
+        self.user_agent = user_agent
+        self.session = AsyncSession(impersonate=impersonate, max_clients=config.ASYNC_CONCURRENCY)
+        self.blocked_until = 0.0  # 在此时间（time.monotonic）之前暂停使用
+        self.strikes = 0  # 连续被封锁的次数
+
+
+class IdentityPool:
+    """
+    浏览器身份池
+
+    按顺序轮换身份，被封锁的身份清空Cookie并按指数退避暂停使用，所有身份都在暂停时等待最早恢复的一个
+    """
+
+    def __init__(self, targets=IDENTITY_TARGETS):
+        self.identities = [Identity(target, ua.chrome) for target in targets]
+        self._order = itertools.cycle(self.identities)
+
+    async def acquire(self):
+        """取得下一个可用的身份"""
+        while True:
+            now = time.monotonic()
+            for _ in range(len(self.identities)):
+                identity = next(self._order)
+                if identity.blocked_until <= now:
+                    return identity
+            await asyncio.sleep(min(identity.blocked_until for identity in self.identities) - now)
+
+    def report_ok(self, identity):
+        """请求成功，清零身份的封锁计数"""
+        identity.strikes = 0
+
+    def report_blocked(self, identity):
+        """请求被封锁，暂停使用该身份并丢弃它的Cookie"""
+        identity.strikes += 1
+        delay = min(BLOCK_BACKOFF * 2 ** (identity.strikes - 1), BLOCK_MAX_BACKOFF)
+        identity.blocked_until = time.monotonic() + delay
+        identity.session.cookies.clear()
+        print(f'身份 {identity.impersonate} 疑似被封锁，暂停 {delay} 秒')
+
+    async def close(self):
+        """关闭所有会话"""
+        for identity in self.identities:
+            await identity.session.close()
+
+
+def is_blocked(response, expect=None):
+    """
+    判断响应是否为封锁页面：403/429状态码、验证码页面，或缺少正常页面应有的内容
+
+    包含expect的页面一定是正常页面，即使公告正文中出现“验证码”等文字也不算封锁，
+    拦截文字只在缺少expect（或没有指定expect）时检查
+
+    Args:
+        response: 响应对象
+        expect: 正常页面中一定包含的文字，None表示不检查
+    """
+    if response.status_code in (403, 429):
+        return True
+    text = response.text
+    if expect and expect in text:
+        return False
+    if any(marker in text for marker in BLOCK_MARKERS):
+        return True
+    return bool(expect) and response.status_code == 200
+
+
+def get_dynamic_headers(identity, referer=None):
+    """生成与身份对应的headers，同一身份始终使用相同的User-Agent"""
+    headers = {
+        'User-Agent': identity.user_agent,
         'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
         'Accept-Language': 'zh-CN,zh;q=0.9',
-        'Referer': 'https://search.ccgp.gov.cn/bxsearch?searchtype=2&page_index=1&bidSort=&buyerName=&projectId=&pinMu=&bidType=7&dbselect=bidx&kw=%E6%91%84%E5%83%8F%E5%A4%B4&start_time=2025%3A01%3A01&end_time=2025%3A07%3A17&timeType=6&displayZone=&zoneId=&pppStatus=0&agentName='
     }
+    if referer:
+        headers['Referer'] = referer
+    return headers
 
 
-def get_html(params):
-    response = requests.get('https://search.ccgp.gov.cn/bxsearch', params=params, headers=get_dynamic_headers(),
-                            impersonate="chrome136", timeout=10)
-    response.encoding = 'utf-8'
+def search_params(page, start, end):
+    """生成日期范围[start, end]内第page页搜索结果的查询参数"""
+    return {
+        'searchtype': '2',
+        'page_index': page,
+        'bidSort': '',
+        'buyerName': '',
+        'projectId': '',
+        'pinMu': '',
+        'bidType': '7',
+        'dbselect': 'bidx',
+        'kw': '摄像头',
+        'start_time': start.strftime('%Y:%m:%d'),
+        'end_time': end.strftime('%Y:%m:%d'),
+        'timeType': '6',  # 指定日期范围
+        'displayZone': '',
+        'zoneId': '',
+        'pppStatus': '0',
+        'agentName': '',
+    }
+
+
+def search_url(page, window):
+    """日期窗口内第page页搜索结果的完整地址，作为从该页发出的请求的Referer"""
+    return f'{SEARCH_URL}?{urlencode(search_params(page, *window))}'
+
+
+async def fetch(pool, limit, url, expect=None, referer=None, **kwargs):
+    """
+    经调度器限速后在全局并发上限内发送GET请求，被封锁时暂停当前身份并换一个身份重试
+
+    等待可用身份（被封锁后的退避）和等待调度器时不占用并发名额，信号量只在请求进行期间持有
+
+    Args:
+        pool: 浏览器身份池
+        limit: 限制同时进行的请求数的信号量
+        url: 请求URL
+        expect: 正常页面中一定包含的文字，用于识别封锁页面
+        referer: 请求的Referer
+
+    Returns:
+        响应对象
+
+    Raises:
+        RuntimeError: 多次尝试都被封锁
+    """
+    for attempt in range(BLOCK_MAX_ATTEMPTS):
+        identity = await pool.acquire()
+        async with scheduler.async_slot(url):
+            async with limit:
+                response = await identity.session.get(url, headers=get_dynamic_headers(identity, referer), **kwargs)
+        # 429/503同时降低该主机的请求速率
+        scheduler.feedback(url, response.status_code, response.headers.get("Retry-After"))
+        response.encoding = 'utf-8'
+        if not is_blocked(response, expect):
+            pool.report_ok(identity)
+            return response
+        pool.report_blocked(identity)
+    raise RuntimeError(f'请求多次被封锁: {url}')
+
+
+async def get_html(pool, limit, page, window):
+    # 按从上一页翻页的方式设置Referer
+    referer = search_url(max(page - 1, 1), window)
+    response = await fetch(pool, limit, SEARCH_URL, expect='vT-srch-result', referer=referer,
+                           params=search_params(page, *window), timeout=10)
     return response.text
 
 
-def parse(page,html):
+def split_windows(start, end, days):
+    """
+    把日期范围[start, end]拆分为连续的日期窗口
+
+    Args:
+        start: 起始日期
+        end: 结束日期（包含）
+        days: 每个窗口的天数
+
+    Returns:
+        (窗口起始日期, 窗口结束日期)列表
+    """
+    windows = []
+    while start <= end:
+        window_end = min(start + timedelta(days=days - 1), end)
+        windows.append((start, window_end))
+        start = window_end + timedelta(days=1)
+    return windows
+
+
+def window_key(window):
+    """日期窗口在数据键中的名称，如20250101或20250101-20250107"""
+    start, end = window
+    if start == end:
+        return f'{start:%Y%m%d}'
+    return f'{start:%Y%m%d}-{end:%Y%m%d}'
+
+
+def parse_page_count(html):
+    """从搜索结果页的分页脚本（如Pager({size:27, ...})）中读取总页数，找不到时返回None"""
+    # 只匹配分页脚本中的size，避免匹配到内联样式中的font-size等
+    match = PAGER_PATTERN.search(html)
+    return int(match.group(1)) if match else None
+
+
+def parse_list(html):
+    """从搜索结果页中解析公告详情页链接"""
     tree = etree.HTML(html)
-    hrefs = tree.xpath('//ul[@class="vT-srch-result-list-bid"]/li/a/@href')
-    all_data = {}  # 使用字典而不是列表来存储数据
-    for index, href in enumerate(hrefs, start=1):
-        print(href)
-        item_data = {
-            "url": href,
-            "relevant_rows": {}  # 使用字典存储相关行
-        }
-
-        res = requests.get(href, impersonate="chrome136")
-        res.encoding = 'utf-8'
-        tree_info = etree.HTML(res.text)
-
-        # 采购单位和时间
-        table_ = tree_info.xpath('//div[@class="table"]/table')[0]
-        item_data["unit"] = table_.xpath('.//tr[4]/td[2]/text()')[0]
-        item_data["time"] = table_.xpath('.//tr[5]/td[4]/text()')[0]
-
-        tables = tree_info.xpath('//div[@class="vF_detail_content"]//table')
-
-        row_counter = 1  # 行计数器
-
-        for table in tables:
-            # 提取表头
-            headers = []
-            thead_th = table.xpath('.//thead//th[not(ancestor::script) and not(ancestor::style)]')
-            if thead_th:
-                headers = [
-                    ''.join(th.xpath('.//text()[not(ancestor::script) and not(ancestor::style)]')).strip()
-                    for th in thead_th
-                    if ''.join(th.xpath('.//text()[not(ancestor::script) and not(ancestor::style)]')).strip()
-                ]
-            else:
-                all_tr = table.xpath('.//tr[not(ancestor::script) and not(ancestor::style)]')
-                for tr in all_tr:
-                    tr_th = tr.xpath('./th[not(ancestor::script) and not(ancestor::style)]')
-                    if tr_th:
-                        headers = [
-                            ''.join(th.xpath('.//text()[not(ancestor::script) and not(ancestor::style)]')).strip()
-                            for th in tr_th
-                            if ''.join(th.xpath('.//text()[not(ancestor::script) and not(ancestor::style)]')).strip()
-                        ]
-                        break
-                    tr_td = tr.xpath('./td[not(ancestor::script) and not(ancestor::style)]')
-                    if tr_td and any(
-                            ''.join(td.xpath('.//text()[not(ancestor::script) and not(ancestor::style)]')).strip()
-                            for td in tr_td):
-                        headers = [
-                            ''.join(td.xpath('.//text()[not(ancestor::script) and not(ancestor::style)]')).strip()
-                            for td in tr_td
-                            if ''.join(td.xpath('.//text()[not(ancestor::script) and not(ancestor::style)]')).strip()
-                        ]
-                        break
-
-            # 提取数据行
-            rows = []
-            tbody_rows = table.xpath('.//tbody/tr[not(ancestor::script) and not(ancestor::style)]')
-            if tbody_rows:
-                if thead_th:
-                    rows = tbody_rows
-                else:
-                    header_row_index = 0
-                    for i, tr in enumerate(tbody_rows):
-                        cells = [
-                            ''.join(e.xpath('.//text()[not(ancestor::script) and not(ancestor::style)]')).strip()
-                            for e in tr.xpath(
-                                './th[not(ancestor::script) and not(ancestor::style)] | ./td[not(ancestor::script) and not(ancestor::style)]')
-                            if ''.join(e.xpath('.//text()[not(ancestor::script) and not(ancestor::style)]')).strip()
-                        ]
-                        if cells == headers:
-                            header_row_index = i
-                            break
-                    rows = tbody_rows[header_row_index + 1:]
-            else:
-                all_tr = table.xpath('.//tr[not(ancestor::script) and not(ancestor::style)]')
-                header_row_index = 0
-                for i, tr in enumerate(all_tr):
-                    cells = [
-                        ''.join(e.xpath('.//text()[not(ancestor::script) and not(ancestor::style)]')).strip()
-                        for e in tr.xpath(
-                            './th[not(ancestor::script) and not(ancestor::style)] | ./td[not(ancestor::script) and not(ancestor::style)]')
-                        if ''.join(e.xpath('.//text()[not(ancestor::script) and not(ancestor::style)]')).strip()
-                    ]
-                    if cells == headers:
-                        header_row_index = i
-                        break
-                rows = all_tr[header_row_index + 1:]
-
-            # 处理数据行，只保留包含摄像头
-            for row in rows:
-                cells = [
-                    ''.join(td.xpath('.//text()[not(ancestor::script) and not(ancestor::style)]')).strip()
-                    for td in row.xpath('./td[not(ancestor::script) and not(ancestor::style)]')
-                    if ''.join(td.xpath('.//text()[not(ancestor::script) and not(ancestor::style)]')).strip()
-                ]
-
-                # 检查是否包含关键词
-                if any(('摄像头' in cell) for cell in cells):
-                    if headers and len(headers) == len(cells):
-                        row_data = {}
-                        for i in range(len(headers)):
-                            if (cells[i] and headers[i] and
-                                    'script' not in headers[i].lower() and
-                                    'style' not in headers[i].lower() and
-                                    'script' not in cells[i].lower() and
-                                    'style' not in cells[i].lower()):
-                                row_data[headers[i]] = cells[i].replace('                                                ','')
-
-                        if row_data:
-                            item_data["relevant_rows"][f"row_{row_counter}"] = row_data
-                            row_counter += 1
-
-        if item_data["relevant_rows"]:  # 只有当有相关行时才添加
-            all_data[f'page{page}_{index}'] = item_data
-
-    return all_data
+    return tree.xpath('//ul[@class="vT-srch-result-list-bid"]/li/a/@href')
+
+
+def parse_detail(href, html):
+    """
+    解析公告详情页，提取采购单位、时间和包含摄像头的表格行
+
+    Returns:
+        公告数据字典，没有相关行时返回None
+    """
+    item_data = {
+        "url": href,
+        "relevant_rows": {}  # 使用字典存储相关行
+    }
+
+    tree_info = etree.HTML(html)
+
+    # 采购单位和时间
+    table_ = tree_info.xpath('//div[@class="table"]/table')[0]
+    item_data["unit"] = table_.xpath('.//tr[4]/td[2]/text()')[0]
+    item_data["time"] = table_.xpath('.//tr[5]/td[4]/text()')[0]
+
+    tables = tree_info.xpath('//div[@class="vF_detail_content"]//table')
+
+    row_counter = 1  # 行计数器
+
+    for table in tables:
+        # 每个表格展开一次，只保留包含摄像头的行
+        for record in table_records(table, keyword='摄像头'):
+            row_data = {
+                header: cell.replace('                                                ', '')
+                for header, cell in record.items()
+                if ('script' not in header.lower() and 'style' not in header.lower() and
+                    'script' not in cell.lower() and 'style' not in cell.lower())
+            }
+            if row_data:
+                item_data["relevant_rows"][f"row_{row_counter}"] = row_data
+                row_counter += 1
+
+    if item_data["relevant_rows"]:  # 只有当有相关行时才返回
+        return item_data
+    return None
+
+
+async def crawl_detail(pool, limit, href, referer):
+    """
+    获取并解析一个公告详情页，出错时不影响其他公告
+
+    网络错误和封锁算作采集失败（下次运行时重新采集），页面结构异常导致的解析错误重试也无法解决，记录后跳过
+
+    Returns:
+        (公告数据或None, 是否采集成功)
+    """
+    print(href)
+    try:
+        res = await fetch(pool, limit, href, expect='vF_detail_content', referer=referer)
+        res.raise_for_status()
+    except Exception as e:
+        print(f'采集详情页出错 {href}: {e}')
+        return None, False
+    try:
+        return parse_detail(href, res.text), True
+    except Exception as e:
+        print(f'解析详情页出错，跳过该公告 {href}: {e!r}')
+        return None, True
+
+
+async def crawl_page(pool, limit, frontier, window, page, html):
+    """
+    并发采集一页搜索结果中所有未采集过的公告详情页
+
+    Args:
+        pool: 浏览器身份池
+        limit: 限制同时进行的请求数的信号量
+        frontier: 已采集过的公告链接
+        window: 日期窗口
+        page: 页码
+        html: 搜索结果页内容
+
+    Returns:
+        ([(公告在页中的序号, 公告数据)], 采集失败的详情页数量)
+    """
+    key = window_key(window)
+    hrefs = parse_list(html)
+    new_links = [(index, href) for index, href in enumerate(hrefs, start=1) if frontier.add(href)]
+    referer = search_url(page, window)
+    results = await asyncio.gather(*(crawl_detail(pool, limit, href, referer) for _, href in new_links))
+    print(f'{key} 第{page}页已采集完毕，新公告 {len(new_links)}/{len(hrefs)} 条')
+
+    page_items = []
+    failures = 0
+    for (index, _), (item_data, ok) in zip(new_links, results):
+        failures += not ok
+        if item_data:
+            page_items.append((index, item_data))
+    return page_items, failures
+
+
+async def crawl_window(pool, limit, frontier, window):
+    """
+    采集一个日期窗口：先读取第一页得到总页数，再并发采集其余页面
+
+    Returns:
+        (按页码顺序排列的各页公告列表, 采集失败的详情页数量)
+
+    Raises:
+        Exception: 搜索结果页采集失败
+    """
+    key = window_key(window)
+    first_html = await get_html(pool, limit, 1, window)
+    page_count = parse_page_count(first_html)
+    first_items, failures = await crawl_page(pool, limit, frontier, window, 1, first_html)
+
+    if page_count is not None:
+        async def crawl_search_page(page):
+            html = await get_html(pool, limit, page, window)
+            return await crawl_page(pool, limit, frontier, window, page, html)
+
+        page_results = await asyncio.gather(*(crawl_search_page(page) for page in range(2, page_count + 1)))
+    else:
+        # 页面中没有总页数时逐页翻页，直到某页没有结果
+        print(f'日期窗口 {key} 的搜索结果页中没有找到分页脚本，改为逐页翻页')
+        page_results = []
+        html, page = first_html, 1
+        while parse_list(html) and page < MAX_PAGES:
+            page += 1
+            html = await get_html(pool, limit, page, window)
+            page_results.append(await crawl_page(pool, limit, frontier, window, page, html))
+
+    # 按页码顺序合并
+    pages = [first_items]
+    for page_items, page_failures in page_results:
+        pages.append(page_items)
+        failures += page_failures
+    print(f'日期窗口 {key} 采集完毕，共读取 {len(pages)} 页')
+    return pages, failures
+
+
+async def crawl(windows, frontier, first_page=1):
+    """
+    并发采集所有日期窗口，同时进行的请求数和各主机的请求速率受全局上限约束
+
+    Args:
+        windows: 日期窗口列表（按日期排序）
+        frontier: 已采集过的公告链接，本次只采集不在其中的公告
+        first_page: 本次采集的第一页使用的页码，各窗口的页按日期顺序接着编号
+
+    Returns:
+        (以page{N}_{i}为键的数据, 从第一个窗口起连续采集成功的最后日期，第一个窗口就失败时为None)
+    """
+    limit = asyncio.Semaphore(config.ASYNC_CONCURRENCY)
+    pool = IdentityPool()
+    try:
+        window_results = await asyncio.gather(*(crawl_window(pool, limit, frontier, window) for window in windows),
+                                              return_exceptions=True)
+    finally:
+        await pool.close()
+
+    all_data = {}
+    completed = None
+    contiguous = True
+    # 按日期顺序合并，键的顺序与逐个窗口采集时一致
+    for window, result in zip(windows, window_results):
+        if isinstance(result, Exception):
+            print(f'日期窗口 {window_key(window)} 采集失败: {result}')
+            contiguous = False
+            continue
+        pages, failures = result
+        for page_items in pages:
+            for index, item_data in page_items:
+                all_data[f'page{first_page}_{index}'] = item_data
+            first_page += 1
+        if failures:
+            print(f'日期窗口 {window_key(window)} 有 {failures} 个详情页采集失败，下次运行时重新采集')
+            contiguous = False
+        elif contiguous:
+            completed = window[1]
+    return all_data, completed
+
+
+def load_json(path, default):
+    """读取JSON文件，文件不存在时返回default"""
+    if not os.path.exists(path):
+        return default
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def next_page_number(data):
+    """已有数据中最大页码的下一页，新采集的公告从这一页开始编号，避免与已有的键重复"""
+    last_page = 0
+    for key in data:
+        match = KEY_PATTERN.fullmatch(key)
+        if match:
+            last_page = max(last_page, int(match.group(1)))
+    return last_page + 1
+
+
+def save_json(path, data, indent=None):
+    """先写临时文件再替换，避免中断时留下写了一半的文件"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=indent)
+    os.replace(tmp_path, path)
 
 
 def main():
-    filename = 'data/purchase_cn.json'
-    all_data = {}  # 改了个更明确的变量名
-    for page in range(1, 28):
-        params = {
-            'searchtype': '2',
-            'page_index': page,
-            'bidSort': '',
-            'buyerName': '',
-            'projectId': '',
-            'pinMu': '',
-            'bidType': '7',
-            'dbselect': 'bidx',
-            'kw': '摄像头',
-            'start_time': '2025:01:01',
-            'end_time': '2025:07:17',
-            'timeType': '5',
-            'displayZone': '',
-            'zoneId': '',
-            'pppStatus': '0',
-            'agentName': '',
-        }
-        html = get_html(params)
-        page_data = parse(page, html)
-        all_data.update(page_data)
-        print(f'第{page}页已采集完毕')
-        time.sleep(2)
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(all_data, f, ensure_ascii=False, indent=4)  # 添加了要保存的数据和格式化参数
-
-    print(f"所有数据已保存到 {filename}")
+    parser = argparse.ArgumentParser(description="按日期窗口采集中国政府采购网的摄像头采购公告")
+    parser.add_argument("--start", type=date.fromisoformat, default=None,
+                        help="起始日期（YYYY-MM-DD），默认从上次采集到的日期继续")
+    parser.add_argument("--end", type=date.fromisoformat, default=None,
+                        help="结束日期（YYYY-MM-DD），默认为今天")
+    parser.add_argument("--window", choices=sorted(WINDOW_DAYS), default="week",
+                        help="日期窗口大小，各窗口并行采集")
+    parser.add_argument("--full", action="store_true",
+                        help="忽略上次的采集记录和已有数据，重新采集整个日期范围")
+    args = parser.parse_args()
+
+    state = {} if args.full else load_json(STATE_PATH, {})
+    last_crawled = state.get('last_crawled_date')
+    # 从上次采集到的日期当天重新开始，补上当天较晚发布的公告（已采集的公告按URL去重）
+    start = args.start or (date.fromisoformat(last_crawled) if last_crawled else DEFAULT_START)
+    end = args.end or date.today()
+    windows = split_windows(start, end, WINDOW_DAYS[args.window])
+    print(f'采集日期范围 {start} ~ {end}，共 {len(windows)} 个窗口')
+
+    all_data = {} if args.full else load_json(OUTPUT_PATH, {})
+    frontier = UrlFrontier()
+    for item_data in all_data.values():
+        frontier.add(item_data['url'])
+
+    new_data, completed = asyncio.run(crawl(windows, frontier, next_page_number(all_data)))
+    all_data.update(new_data)
+    save_json(OUTPUT_PATH, all_data, indent=4)
+    print(f"新增 {len(new_data)} 条公告，所有数据已保存到 {OUTPUT_PATH}")
+
+    if completed and (not last_crawled or completed.isoformat() > last_crawled):
+        state['last_crawled_date'] = completed.isoformat()
+        save_json(STATE_PATH, state)
+        print(f'已采集到 {completed}')
 
 
 if __name__ == '__main__':
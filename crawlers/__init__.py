@@ -1,26 +1,45 @@
-from .base_crawler import BaseCrawler
-from .dahua_crawler import DahuaCrawler
-from .hikvision_crawler import HikvisionCrawler
-from .vivotek_crawler import VivotekCrawler
-from .acti_crawler import ActiCrawler
-from .everfocus_crawler import EverFocusCrawler
-from .cpplusworld_crawler import CPlusWorldCrawler
-from .hisharp_crawler import HisharpCrawler
-from .lilin_crawler import LilinCrawler
-from .geovision_crawler import GeoVisionCrawler
-from .aver_crawler import AVerCrawler
+import importlib
+
+# 爬虫类名到所在模块的映射，只有实际用到的爬虫才会被导入（连同它依赖的Selenium等模块）
+CRAWLER_REGISTRY = {
+    'DahuaCrawler': '.dahua_crawler',
+    'HikvisionCrawler': '.hikvision_crawler',
+    'VivotekCrawler': '.vivotek_crawler',
+    'ActiCrawler': '.acti_crawler',
+    'EverFocusCrawler': '.everfocus_crawler',
+    'CPlusWorldCrawler': '.cpplusworld_crawler',
+    'HisharpCrawler': '.hisharp_crawler',
+    'LilinCrawler': '.lilin_crawler',
+    'GeoVisionCrawler': '.geovision_crawler',
+    'AVerCrawler': '.aver_crawler',
+}
 
 # 将所有爬虫类添加到__all__列表中，方便from crawlers import *的使用
-__all__ = [
-    'BaseCrawler',
-    'DahuaCrawler',
-    'HikvisionCrawler',
-    'VivotekCrawler',
-    'ActiCrawler',
-    'EverFocusCrawler',
-    'CPlusWorldCrawler',
-    'HisharpCrawler',
-    'LilinCrawler',
-    'GeoVisionCrawler',
-    'AVerCrawler'
-]
\ No newline at end of file
+__all__ = ['BaseCrawler'] + list(CRAWLER_REGISTRY)
+
+
+def load_crawler(name):
+    """
+    按类名导入并返回爬虫类
+
+    Args:
+        name: 爬虫类名
+
+    Returns:
+        爬虫类
+
+    Raises:
+        KeyError: 没有注册该爬虫
+    """
+    module = importlib.import_module(CRAWLER_REGISTRY[name], __name__)
+    return getattr(module, name)
+
+
+def __getattr__(name):
+    """首次访问爬虫类时才导入对应模块"""
+    if name == 'BaseCrawler':
+        from .base_crawler import BaseCrawler
+        return BaseCrawler
+    if name in CRAWLER_REGISTRY:
+        return load_crawler(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
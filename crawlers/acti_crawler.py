@@ -1,12 +1,5 @@
-import time
 from urllib.parse import urljoin
 
-import requests
-from parsel import Selector
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-
 from .base_crawler import BaseCrawler
 
 
@@ -14,6 +7,11 @@ class ActiCrawler(BaseCrawler):
     """
     ACTI网站爬虫，继承自BaseCrawler
     """
+    # 页面和规格参数的就绪条件
+    page_ready_selector = "span#selfModelName"
+    spec_ready_selector = "table.c-table > tbody > tr"
+    # 规格参数由后台请求加载，尝试捕获该接口后直接请求
+    spec_api_pattern = r"(?i)spec"
 
     def __init__(self, data_dir="data"):
         """
@@ -24,31 +22,13 @@ class ActiCrawler(BaseCrawler):
 
         # 设置ACTI特定的属性
         self.base_url = "https://www.acti.com"
+        self.request_timeout = 20
 
         # 设置起始URL
         self.start_urls = ["https://www.acti.com"]
 
         self.logger.info("ACTI爬虫初始化完成")
 
-    def get_selector(self, url):
-        """
-        使用requests和Parsel获取页面内容
-
-        Args:
-            url: 要获取的URL
-
-        Returns:
-            Selector对象
-        """
-        try:
-            resp = requests.get(url, timeout=20)
-            resp.raise_for_status()
-            selector = Selector(text=resp.text)
-            return selector
-        except Exception as e:
-            self.logger.error(f"获取页面内容时出错 {url}: {str(e)}")
-            return None
-
     def get_links_from_page(self, url, selector=None):
         """
         从页面获取产品链接
@@ -122,60 +102,78 @@ class ActiCrawler(BaseCrawler):
             self.logger.info(f"访问规格参数页面: {spec_url}")
 
             # 使用selenium访问
-            self.driver.get(spec_url)
-            time.sleep(2)  # 等待页面加载
-
-            # 获取product_id (span#selfModelName的text)
-            try:
-                product_id_element = self.wait.until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "span#selfModelName"))
-                )
-                product_id = product_id_element.text.strip()
-                self.logger.debug(f"获取到产品ID: {product_id}")
-            except (TimeoutException, NoSuchElementException) as e:
-                self.logger.error(f"无法获取产品ID: {str(e)}")
-                return None
-
-            # 获取产品名称 (可能需要根据实际HTML结构调整选择器)
-            try:
-                name_element = self.driver.find_element(By.CSS_SELECTOR, "div#popupHeaderSpec")
-                product_name = name_element.text.strip()
-                self.logger.debug(f"获取到产品名称: {product_name}")
-            except (TimeoutException, NoSuchElementException) as e:
-                self.logger.warning(f"无法获取产品名称: {str(e)}")
-                product_name = "未知名称"
-
-            # 提取规格参数
-            params = []
-            try:
-                param_rows = self.driver.find_elements(By.CSS_SELECTOR, "table.c-table > tbody > tr")
-                for row in param_rows:
-                    try:
-                        cells = row.find_elements(By.TAG_NAME, "td")
-                        if len(cells) >= 2:
-                            param_name = cells[0].text.strip()
-                            param_value = cells[1].text.strip()
-                            if param_name and param_value:
-                                params.append({
-                                    "paramName": param_name,
-                                    "param": param_value
-                                })
-                    except Exception as e:
-                        self.logger.warning(f"解析参数行时出错: {str(e)}")
-
-                self.logger.debug(f"提取到 {len(params)} 个参数")
-            except Exception as e:
-                self.logger.warning(f"提取规格参数时出错: {str(e)}")
-
-            # 构建并返回产品数据
-            product_data = {
-                'product_id': product_id,
-                'product_name': product_name,
-                'params': params
-            }
-
-            return product_data
+            self.open_url(spec_url)
+            self.wait_until_ready(css=self.spec_ready_selector, network_idle=True)  # 等待规格参数加载
+
+            # 一次性获取渲染后的页面，后续解析在本地完成
+            return self.parse_product_page(url, self.page_selector())
 
         except Exception as e:
             self.logger.error(f"提取产品详情时出错: {str(e)}")
             return None
+
+    def parse_product_identity(self, page):
+        """
+        从ACTI产品页面解析产品ID和名称
+
+        Args:
+            page: 页面的Selector对象
+
+        Returns:
+            (product_id, product_name)
+        """
+        product_id = self.element_text(page.css("span#selfModelName"))
+        product_name = self.element_text(page.css("div#popupHeaderSpec"))
+        return product_id, product_name
+
+    def parse_product_page(self, url, page):
+        """
+        从渲染后的ACTI规格参数页面解析产品详情
+
+        Args:
+            url: 产品页面URL
+            page: 页面的Selector对象
+
+        Returns:
+            产品数据字典或None（如果解析失败）
+        """
+        # 获取product_id (span#selfModelName的text)
+        product_id_element = page.css("span#selfModelName")
+        if not product_id_element:
+            self.logger.error(f"无法获取产品ID: {url}")
+            return None
+        product_id = self.element_text(product_id_element)
+        self.logger.debug(f"获取到产品ID: {product_id}")
+
+        # 获取产品名称 (可能需要根据实际HTML结构调整选择器)
+        name_element = page.css("div#popupHeaderSpec")
+        if name_element:
+            product_name = self.element_text(name_element)
+            self.logger.debug(f"获取到产品名称: {product_name}")
+        else:
+            self.logger.warning(f"无法获取产品名称: {url}")
+            product_name = "未知名称"
+
+        # 提取规格参数
+        params = []
+        for row in page.css("table.c-table > tbody > tr"):
+            cells = row.css("td")
+            if len(cells) >= 2:
+                param_name = self.element_text(cells[0])
+                param_value = self.element_text(cells[1])
+                if param_name and param_value:
+                    params.append({
+                        "paramName": param_name,
+                        "param": param_value
+                    })
+
+        self.logger.debug(f"提取到 {len(params)} 个参数")
+
+        # 构建并返回产品数据
+        product_data = {
+            'product_id': product_id,
+            'product_name': product_name,
+            'params': params
+        }
+
+        return product_data
@@ -0,0 +1,82 @@
+import asyncio
+
+from curl_cffi.requests import AsyncSession
+
+from . import config
+from .http_cache import CacheMissError
+from .scheduler import get_scheduler
+
+
+class AsyncFetcher:
+    """
+    基于asyncio的页面抓取器
+
+    与HttpClient共用磁盘缓存和按主机的调度器，用信号量限制同时进行的请求数；
+    磁盘缓存的读写在线程中进行，不阻塞事件循环
+    """
+
+    def __init__(self, cache=None, scheduler=None, concurrency=None, timeout=None):
+        """
+        初始化异步抓取器（需要在事件循环中创建）
+
+        Args:
+            cache: ResponseCache对象，None表示不使用磁盘缓存
+            scheduler: HostScheduler对象，默认使用进程内共享的调度器
+            concurrency: 同时进行的请求数上限，默认取配置
+            timeout: 默认请求超时时间（秒），默认取配置
+        """
+        self.cache = cache
+        self.scheduler = scheduler or get_scheduler()
+        self.timeout = timeout or config.HTTP_TIMEOUT
+        concurrency = concurrency or config.ASYNC_CONCURRENCY
+
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._session = AsyncSession(max_clients=concurrency)
+
+    async def fetch_text(self, url, timeout=None):
+        """
+        获取页面文本，启用缓存时优先使用磁盘缓存，过期后通过条件请求重新验证
+
+        Args:
+            url: 页面URL
+            timeout: 超时时间（秒），None则使用默认值
+
+        Returns:
+            页面文本
+
+        Raises:
+            CacheMissError: 离线模式下缓存中没有该URL
+            curl_cffi.requests.RequestsError: 请求失败或状态码不是200
+        """
+        cache = self.cache
+        entry = None
+        headers = {}
+        if cache is not None:
+            entry = await asyncio.to_thread(cache.lookup, url)
+            if entry and (cache.offline or cache.is_fresh(entry)):
+                return cache.to_response(url, entry).text
+            if cache.offline:
+                raise CacheMissError(f"离线模式下缓存中没有该页面: {url}")
+            if entry:
+                headers.update(cache.conditional_headers(entry))
+
+        async with self._semaphore:
+            for attempt in range(config.SCHEDULER_MAX_RETRIES + 1):
+                async with self.scheduler.async_slot(url):
+                    response = await self._session.get(url, headers=headers, timeout=timeout or self.timeout)
+                throttled = self.scheduler.feedback(url, response.status_code,
+                                                    response.headers.get("Retry-After"))
+                if not throttled:
+                    break
+
+        if cache is not None and response.status_code == 304 and entry:
+            await asyncio.to_thread(cache.refresh, url, entry)
+            return cache.to_response(url, entry).text
+        response.raise_for_status()
+        if cache is not None and response.status_code == 200:
+            await asyncio.to_thread(cache.store, url, response.content, response.headers, response.encoding)
+        return response.text
+
+    async def close(self):
+        """关闭会话并释放连接"""
+        await self._session.close()
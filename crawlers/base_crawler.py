@@ -1,17 +1,62 @@
-import json
+import asyncio
+import glob
+import hashlib
 import os
 import logging
+import queue
 import sys
+import threading
+import time
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from urllib.parse import quote
 
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.support.ui import WebDriverWait
-from webdriver_manager.chrome import ChromeDriverManager
+from parsel import Selector
+
+from . import config
+from .crawl_state import CrawlState
+from .frontier import UrlFrontier
+from .http_cache import CacheMissError, ResponseCache
+from .http_client import HttpClient
+from .incremental import FingerprintStore, ProductSnapshot
+from .jsonl_writer import JsonlWriter, finalize_jsonl
+from .network_capture import (build_endpoint_template, capture_json_responses, drain_performance_log,
+                              enable_performance_log, extract_params_from_json, param_names)
+from .selector_memo import SelectorMemo
+from .sharding import ShardQueue
+from .webdriver_pool import WebDriverPool
+
+# 流水线模式中通知详情线程退出的哨兵对象
+_STOP = object()
+
+# 提取文本时前后需要换行的块级标签
+_BLOCK_TAGS = {
+    "address", "article", "br", "dd", "div", "dl", "dt", "footer", "h1", "h2", "h3", "h4", "h5", "h6",
+    "header", "hr", "li", "ol", "p", "pre", "section", "table", "tbody", "thead", "tr", "ul"
+}
 
 
 class BaseCrawler(ABC):
+    # 链接发现阶段是否也使用WebDriver（子类按需覆盖）
+    discovery_uses_driver = False
+    # WebDriver会话池大小，None表示使用默认配置（子类按需覆盖）
+    driver_pool_size = None
+    # 表示页面主体已加载的元素CSS选择器（子类按需覆盖）
+    page_ready_selector = None
+    # 表示规格参数已加载的元素CSS选择器（子类按需覆盖）
+    spec_ready_selector = None
+    # 在全局屏蔽列表之外额外屏蔽的请求URL模式（子类按需覆盖）
+    blocked_url_patterns = []
+    # 加载规格参数的后台JSON接口URL正则，设置后会尝试发现接口并直接请求（子类按需覆盖）
+    spec_api_pattern = None
+    # 是否开启浏览器网络日志，用于从页面发起的请求中发现接口（设置spec_api_pattern时自动开启）
+    capture_network = False
+    # 增量模式下计算内容指纹的规格区域CSS选择器，None表示使用HTTP验证头（子类按需覆盖）
+    fingerprint_selector = None
+    # 是否使用asyncio抓取引擎并发抓取（仅对不使用Selenium的爬虫生效，子类按需覆盖）
+    async_fetch = False
+
     def __init__(self, brand_name, data_dir="data", use_selenium=True):
         """
         初始化爬虫
@@ -29,7 +74,47 @@ class BaseCrawler(ABC):
         # 设置日志
         self.logger = self._setup_logger()
 
-        # 只有在需要使用Selenium时才初始化WebDriver
+        # 磁盘响应缓存，requests请求和浏览器渲染结果共用
+        self.cache = ResponseCache() if config.HTTP_CACHE_ENABLED else None
+
+        # 按主机复用连接的HTTP客户端，所有requests请求都通过它发送
+        self.http = HttpClient(cache=self.cache)
+        self.request_timeout = config.HTTP_TIMEOUT
+        # 异步抓取器，在异步模式运行期间创建
+        self.fetcher = None
+        # 本次运行内已解析页面的Selector，同一页面只下载和解析一次
+        self.selector_memo = SelectorMemo(config.SELECTOR_MEMO_SIZE)
+
+        # 流水线运行模式设置
+        self.pipeline = config.PIPELINE_ENABLED
+        self.detail_workers = config.PIPELINE_DETAIL_WORKERS
+        self._link_queue = None
+        # 本次运行内已发现的产品链接，按规范化URL去重，保证每个产品只提取一次
+        self.frontier = UrlFrontier()
+
+        # 产品数据边提取边追加写入JSON Lines文件，运行结束时合并为JSON
+        self.writer = None
+
+        # 爬取进度保存在SQLite中，resume为True时从上次中断的进度继续
+        self.resume = config.RESUME_ENABLED
+        self.state = None
+
+        # 增量爬取设置，指纹存储在运行时加载
+        self.incremental = config.INCREMENTAL_ENABLED
+        self.fingerprints = None
+        self.previous_products = None
+
+        # 规格接口捕获状态
+        self._spec_api_template = None
+        self._spec_api_attempts = 0
+        self._spec_api_failures = 0
+        self._spec_api_lock = threading.Lock()
+
+        # 每个线程当前占用的WebDriver会话
+        self._local = threading.local()
+        self.driver_pool = None
+
+        # 只有在需要使用Selenium时才创建WebDriver会话池（浏览器在首次使用时才启动）
         if self.use_selenium:
             self._initialize_webdriver()
 
@@ -52,16 +137,15 @@ class BaseCrawler(ABC):
         if logger.handlers:
             return logger
 
-        # 创建控制台处理器
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setLevel(logging.INFO)
-
         # 创建格式化器
         formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        console_handler.setFormatter(formatter)
 
-        # 添加控制台处理器
-        logger.addHandler(console_handler)
+        # 创建并添加控制台处理器
+        if config.LOG_CONSOLE:
+            console_handler = logging.StreamHandler(sys.stdout)
+            console_handler.setLevel(logging.INFO)
+            console_handler.setFormatter(formatter)
+            logger.addHandler(console_handler)
 
         # 创建文件处理器
         log_dir = "logs"
@@ -77,24 +161,562 @@ class BaseCrawler(ABC):
         return logger
 
     def _initialize_webdriver(self):
-        """初始化WebDriver（仅在use_selenium=True时调用）"""
-        # 设置Chrome选项
+        """
+        初始化WebDriver会话池（仅在use_selenium=True时调用）
+
+        ChromeDriver和浏览器会话在首次使用时才准备，分片模式下只发现链接或合并输出的进程不会启动浏览器
+        """
+        self._driver_path = None
+        self._driver_path_lock = threading.Lock()
+        pool_size = self.driver_pool_size or config.WEBDRIVER_POOL_SIZE
+        self.driver_pool = WebDriverPool(self._create_webdriver, pool_size,
+                                         config.WEBDRIVER_MAX_PAGES, self.logger)
+
+    def _chromedriver_path(self):
+        """首次创建会话时下载或定位ChromeDriver"""
+        with self._driver_path_lock:
+            if self._driver_path is None:
+                # Selenium相关模块只在使用浏览器的爬虫中导入，静态爬虫启动时不加载
+                from webdriver_manager.chrome import ChromeDriverManager
+
+                self._driver_path = ChromeDriverManager().install()
+            return self._driver_path
+
+    def warm_up_driver(self):
+        """预先创建一个会话，尽早暴露初始化错误（离线重放模式下不需要浏览器）"""
+        if self.driver_pool is None or self.offline:
+            return
+        try:
+            self.driver_pool.release(self.driver_pool.acquire())
+            self.logger.info(f"WebDriver初始化成功，会话池大小: {self.driver_pool.size}")
+        except Exception as e:
+            self.logger.error(f"WebDriver初始化失败: {str(e)}")
+            raise
+
+    def _build_chrome_options(self):
+        """生成爬取用的Chrome选项：无头模式、禁止图片和媒体自动播放、共享磁盘缓存"""
+        from selenium.webdriver.chrome.options import Options
+
         chrome_options = Options()
-        # chrome_options.add_argument("--headless")  # 无头模式
+        if config.BROWSER_HEADLESS:
+            chrome_options.add_argument("--headless=new")  # 无头模式
         chrome_options.add_argument("--no-sandbox")
         chrome_options.add_argument("--disable-dev-shm-usage")
         chrome_options.add_argument("--disable-gpu")
         chrome_options.add_argument("--window-size=1920,1080")
+        chrome_options.add_argument("--mute-audio")
+        chrome_options.add_argument("--autoplay-policy=user-gesture-required")
+        chrome_options.add_argument("--disable-extensions")
+        chrome_options.add_argument("--disable-background-networking")
+
+        if config.BROWSER_BLOCK_IMAGES:
+            chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+            chrome_options.add_experimental_option(
+                "prefs", {"profile.managed_default_content_settings.images": 2}
+            )
+
+        if config.BROWSER_CACHE_DIR:
+            self._ensure_dir_exists(config.BROWSER_CACHE_DIR)
+            chrome_options.add_argument(f"--disk-cache-dir={os.path.abspath(config.BROWSER_CACHE_DIR)}")
+            chrome_options.add_argument(f"--disk-cache-size={config.BROWSER_CACHE_SIZE}")
+
+        if self.spec_api_pattern or self.capture_network:
+            enable_performance_log(chrome_options)
+
+        return chrome_options
+
+    def _create_webdriver(self):
+        """创建一个新的WebDriver会话，并通过DevTools屏蔽不需要的请求"""
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+
+        service = Service(self._chromedriver_path())
+        driver = webdriver.Chrome(service=service, options=self._build_chrome_options())
+
+        patterns = config.BROWSER_BLOCKED_URL_PATTERNS + self.blocked_url_patterns
+        if patterns or self.spec_api_pattern or self.capture_network:
+            try:
+                driver.execute_cdp_cmd("Network.enable", {})
+                driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+            except Exception as e:
+                self.logger.warning(f"设置请求屏蔽列表失败: {str(e)}")
+
+        return driver
+
+    @property
+    def driver(self):
+        """
+        当前线程使用的WebDriver
 
+        线程首次访问时从会话池借出一个会话并一直占用，直到调用release_driver
+        """
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self.driver_pool.acquire()
+            self._local.session = session
+            self._local.wait = None
+        return session.driver
+
+    @property
+    def wait(self):
+        """当前线程WebDriver对应的WebDriverWait"""
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        driver = self.driver
+        if self._local.wait is None:
+            self._local.wait = WebDriverWait(driver, 10)  # 10秒等待时间
+        return self._local.wait
+
+    def release_driver(self, broken=False):
+        """将当前线程占用的WebDriver归还给会话池"""
+        session = getattr(self._local, "session", None)
+        if session is not None:
+            self._local.session = None
+            self._local.wait = None
+            self.driver_pool.release(session, broken)
+
+    @contextmanager
+    def driver_session(self):
+        """为当前线程借出一个独立的WebDriver会话，退出时归还并计入处理页数"""
+        self.release_driver()
+        session = self.driver_pool.acquire()
+        self._local.session = session
+        self._local.wait = None
+        broken = False
         try:
-            # 初始化WebDriver
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
-            self.wait = WebDriverWait(self.driver, 10)  # 10秒等待时间
-            self.logger.info("WebDriver初始化成功")
-        except Exception as e:
-            self.logger.error(f"WebDriver初始化失败: {str(e)}")
+            yield session.driver
+        except Exception:
+            broken = True
             raise
+        finally:
+            session.pages += 1
+            self._local.session = None
+            self._local.wait = None
+            self.driver_pool.release(session, broken)
+
+    def _network_idle_condition(self):
+        """
+        生成网络空闲判断条件：文档加载完成，没有进行中的jQuery请求，
+        且已发起的资源请求数在NETWORK_IDLE_QUIET秒内没有变化
+        """
+        state = {"count": -1, "since": 0.0}
+
+        def condition(driver):
+            ready, count = driver.execute_script(
+                "return [document.readyState === 'complete' && "
+                "(!window.jQuery || window.jQuery.active === 0), "
+                "performance.getEntriesByType('resource').length];"
+            )
+            now = time.monotonic()
+            if not ready or count != state["count"]:
+                state["count"] = count
+                state["since"] = now
+                return False
+            return now - state["since"] >= config.NETWORK_IDLE_QUIET
+
+        return condition
+
+    def wait_until_ready(self, css=None, condition=None, network_idle=False, timeout=None):
+        """
+        等待页面就绪，所有给定条件同时满足后立即返回
+
+        Args:
+            css: 出现即表示就绪的元素CSS选择器
+            condition: 额外的就绪条件，接收driver并返回真值表示就绪
+            network_idle: 是否等待网络请求空闲
+            timeout: 最长等待时间（秒），None则使用默认配置
+
+        Returns:
+            超时前条件是否满足
+        """
+        from selenium.common.exceptions import TimeoutException
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        checks = []
+        if css:
+            checks.append(lambda driver: driver.find_elements(By.CSS_SELECTOR, css))
+        if condition:
+            checks.append(condition)
+        if network_idle:
+            checks.append(self._network_idle_condition())
+        if not checks:
+            return True
+
+        try:
+            WebDriverWait(self.driver, timeout or config.READY_TIMEOUT,
+                          poll_frequency=config.READY_POLL_INTERVAL).until(
+                lambda driver: all(check(driver) for check in checks)
+            )
+            return True
+        except TimeoutException:
+            self.logger.warning(f"等待页面就绪超时: {self.driver.current_url}")
+            return False
+
+    def open_url(self, url):
+        """经按主机的调度器限速后，让当前线程的WebDriver打开URL"""
+        with self.http.scheduler.slot(url):
+            self.driver.get(url)
+        self._local.session.loaded_url = url
+
+    def is_loaded(self, url):
+        """当前线程的WebDriver最近一次打开的是否就是url（用于避免重复加载同一页面）"""
+        session = getattr(self._local, "session", None)
+        return session is not None and session.loaded_url == url
+
+    def load_page(self, url, css=None, network_idle=False):
+        """
+        使用WebDriver打开页面并等待就绪
+
+        Args:
+            url: 页面URL
+            css: 表示页面就绪的元素CSS选择器，默认使用page_ready_selector
+            network_idle: 是否等待网络请求空闲
+
+        Returns:
+            超时前页面是否就绪
+        """
+        self.open_url(url)
+        return self.wait_until_ready(css=css or self.page_ready_selector, network_idle=network_idle)
+
+    def page_selector(self):
+        """
+        一次性获取当前页面渲染后的HTML并解析为Selector
+
+        之后的元素查找和取文本都在本地完成，不再产生WebDriver调用。
+        当前线程正在渲染某个URL时记录最近一次的HTML，确认解析成功后由save_render写入磁盘缓存
+
+        Returns:
+            Selector对象
+        """
+        html = self.driver.page_source
+        if getattr(self._local, "render_url", None):
+            self._local.render_html = html
+        return Selector(text=html)
+
+    @property
+    def offline(self):
+        """是否处于离线重放模式（只使用磁盘缓存，不访问网络）"""
+        return self.cache is not None and self.cache.offline
+
+    @staticmethod
+    def _render_key(url):
+        """浏览器渲染结果在磁盘缓存中的键"""
+        return f"rendered:{url}"
+
+    def cached_render(self, url):
+        """
+        获取缓存中的浏览器渲染结果（离线模式下不检查有效期）
+
+        Returns:
+            Selector对象，没有可用缓存时返回None
+        """
+        if self.cache is None:
+            return None
+        entry = self.cache.lookup(self._render_key(url))
+        if entry and (self.cache.offline or self.cache.is_fresh(entry)):
+            return Selector(text=entry["body"].decode("utf-8"))
+        if self.cache.offline:
+            raise CacheMissError(f"离线模式下缓存中没有该页面的渲染结果: {url}")
+        return None
+
+    @contextmanager
+    def rendering(self, url):
+        """标记当前线程正在渲染url，期间page_selector获取的HTML会被记录下来"""
+        previous = (getattr(self._local, "render_url", None), getattr(self._local, "render_html", None))
+        self._local.render_url = url
+        self._local.render_html = None
+        try:
+            yield
+        finally:
+            self._local.render_url, self._local.render_html = previous
+
+    def save_render(self):
+        """
+        把当前线程正在渲染的页面最近一次获取的HTML写入磁盘缓存
+
+        只应在页面确认渲染完整（解析成功）后调用，避免不完整的渲染结果在有效期内被反复重放
+        """
+        render_url = getattr(self._local, "render_url", None)
+        html = getattr(self._local, "render_html", None)
+        if render_url and html is not None and self.cache is not None:
+            self.cache.store(self._render_key(render_url), html.encode("utf-8"), encoding="utf-8")
+
+    def render_page(self, url, css=None, network_idle=False):
+        """
+        获取页面渲染后的Selector，优先使用本次运行已解析的结果和磁盘缓存，否则用WebDriver加载并缓存结果
+
+        Args:
+            url: 页面URL
+            css: 表示页面就绪的元素CSS选择器
+            network_idle: 是否等待网络请求空闲
+
+        Returns:
+            Selector对象
+        """
+        key = self._render_key(url)
+        page = self.selector_memo.get(key) or self.cached_render(url)
+        if page is None:
+            with self.rendering(url):
+                self.open_url(url)
+                ready = self.wait_until_ready(css=css, network_idle=network_idle)
+                page = self.page_selector()
+                # 等待超时的页面可能没有渲染完整，不写入缓存
+                if ready:
+                    self.save_render()
+        self.selector_memo.put(key, page)
+        return page
+
+    def parse_product_page(self, url, page):
+        """
+        从产品页面的Selector解析产品详情（子类按需实现），用于重放缓存的渲染结果和异步提取
+
+        Args:
+            url: 产品页面URL
+            page: 页面的Selector对象
+
+        Returns:
+            产品数据字典或None
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def element_text(selector):
+        """
+        提取元素的文本，效果接近WebElement.text：块级元素之间换行，行内空白合并
+
+        Args:
+            selector: Selector或SelectorList（取第一个元素）
+
+        Returns:
+            去除首尾空白的文本，元素不存在时返回空字符串
+        """
+        if isinstance(selector, list):
+            if not selector:
+                return ""
+            selector = selector[0]
+
+        root = selector.root
+        if isinstance(root, str):
+            return root.strip()
+
+        parts = []
+
+        def collect(element):
+            tag = element.tag if isinstance(element.tag, str) else ""
+            if tag in ("script", "style"):
+                return
+            if tag in _BLOCK_TAGS:
+                parts.append("\n")
+            if element.text and tag:
+                parts.append(element.text)
+            for child in element:
+                collect(child)
+                if child.tail:
+                    parts.append(child.tail)
+            if tag in _BLOCK_TAGS:
+                parts.append("\n")
+
+        collect(root)
+        lines = (" ".join(line.split()) for line in "".join(parts).split("\n"))
+        return "\n".join(line for line in lines if line)
+
+    def product_key(self, url):
+        """
+        产品在URL中的标识，用于把捕获到的规格接口URL推广到其他产品
+
+        默认取URL路径的最后一段（去掉扩展名），子类可按需覆盖
+        """
+        path = url.split("?", 1)[0].split("#", 1)[0].rstrip("/")
+        return os.path.splitext(path.rsplit("/", 1)[-1])[0]
+
+    def parse_product_identity(self, page):
+        """
+        从页面中解析产品ID和名称，供直接请求规格接口时使用（子类按需覆盖）
+
+        Returns:
+            (product_id, product_name)，无法解析时返回(None, None)
+        """
+        return None, None
+
+    def parse_spec_payload(self, url, payload):
+        """
+        将规格接口返回的JSON转换为参数列表，默认按通用的"名称-值"结构解析（子类按需覆盖）
+        """
+        return extract_params_from_json(payload)
+
+    def _spec_api_capturing(self):
+        """当前是否还需要通过浏览器日志发现规格接口"""
+        return (self.spec_api_pattern is not None and self._spec_api_template is None
+                and self._spec_api_attempts < config.SPEC_API_DISCOVERY_ATTEMPTS)
+
+    def discover_spec_api(self, url, product_data):
+        """
+        在浏览器提取完一个产品后，从performance日志中寻找加载规格参数的接口
+
+        找到的接口需要能推广到其他产品，且解析出的参数名与页面上的参数名有足够的重合，才会被采用
+
+        Args:
+            url: 产品页面URL
+            product_data: 浏览器提取到的产品数据（用于校验接口数据）
+        """
+        # 页面没有提取到参数时无法校验接口数据，不计入尝试次数
+        dom_names = param_names(product_data.get("params", [])) if product_data else set()
+        if not dom_names or not self._spec_api_capturing():
+            return
+
+        with self._spec_api_lock:
+            if not self._spec_api_capturing():
+                return
+            self._spec_api_attempts += 1
+
+        key = self.product_key(url)
+        try:
+            responses = capture_json_responses(self.driver, self.spec_api_pattern)
+        except Exception as e:
+            self.logger.debug(f"读取浏览器网络日志失败: {str(e)}")
+            responses = []
+
+        for api_url, payload in responses:
+            template = build_endpoint_template(api_url, key)
+            if not template:
+                continue
+            overlap = len(param_names(self.parse_spec_payload(url, payload)) & dom_names)
+            if overlap and overlap >= len(dom_names) * config.SPEC_API_MIN_COVERAGE:
+                with self._spec_api_lock:
+                    if self._spec_api_template is None:
+                        self._spec_api_template = template
+                        self.logger.info(f"发现规格参数接口，后续产品将直接请求: {template}")
+                return
+
+        if self._spec_api_attempts >= config.SPEC_API_DISCOVERY_ATTEMPTS and self._spec_api_template is None:
+            self.logger.info("未发现可直接请求的规格参数接口，继续使用浏览器提取")
+
+    def fetch_spec_via_api(self, url):
+        """
+        通过已发现的规格接口直接获取产品详情，不使用浏览器
+
+        产品ID和名称从静态HTML中解析，参数从接口JSON中解析
+
+        Args:
+            url: 产品页面URL
+
+        Returns:
+            产品数据字典，接口不可用或解析失败时返回None（由浏览器提取兜底）
+        """
+        template = self._spec_api_template
+        if not template:
+            return None
+
+        api_url = template.format(key=quote(self.product_key(url), safe=""))
+        try:
+            response = self.http.get(api_url, timeout=self.request_timeout, headers={
+                "Accept": "application/json, text/plain, */*",
+                "X-Requested-With": "XMLHttpRequest",
+                "Referer": url,
+            })
+            response.raise_for_status()
+            params = self.parse_spec_payload(url, response.json())
+
+            page = self.get_selector(url)
+            product_id, product_name = self.parse_product_identity(page) if page else (None, None)
+            if not params or not product_id:
+                raise ValueError("接口数据或产品标识为空")
+        except Exception as e:
+            self.logger.warning(f"直接请求规格接口失败 {api_url}: {str(e)}")
+            with self._spec_api_lock:
+                self._spec_api_failures += 1
+                if self._spec_api_failures >= config.SPEC_API_MAX_FAILURES and self._spec_api_template:
+                    self._spec_api_template = None
+                    self.logger.warning("规格接口连续失败，改回浏览器提取")
+            return None
+
+        self._spec_api_failures = 0
+        self.logger.info(f"通过规格接口提取产品信息: {product_name} ({product_id})")
+        return {
+            'product_id': product_id,
+            'product_name': product_name or "未知名称",
+            'params': params
+        }
+
+    def get_selector(self, url):
+        """
+        使用共享的HTTP客户端获取页面的Selector对象，本次运行已获取过的页面直接返回之前的结果
+
+        Args:
+            url: 要获取的页面URL
+
+        Returns:
+            Selector对象，失败则返回None
+        """
+        page = self.selector_memo.get(url)
+        if page is not None:
+            return page
+        try:
+            response = self.http.get(url, timeout=self.request_timeout)
+            response.raise_for_status()
+            page = Selector(text=response.text)
+            self.selector_memo.put(url, page)
+            return page
+        except Exception as e:
+            self.logger.error(f"获取页面内容时出错 {url}: {str(e)}")
+            return None
+
+    async def aget_selector(self, url):
+        """
+        get_selector的协程版本，通过异步抓取器获取页面（仅在异步模式运行期间可用）
+
+        Args:
+            url: 要获取的页面URL
+
+        Returns:
+            Selector对象，失败则返回None
+        """
+        page = self.selector_memo.get(url)
+        if page is not None:
+            return page
+        try:
+            page = Selector(text=await self.fetcher.fetch_text(url, timeout=self.request_timeout))
+            self.selector_memo.put(url, page)
+            return page
+        except Exception as e:
+            self.logger.error(f"获取页面内容时出错 {url}: {str(e)}")
+            return None
+
+    def product_fingerprint(self, url):
+        """
+        计算产品页面的指纹，用于增量模式下判断产品是否有变化
+
+        设置了fingerprint_selector时取静态HTML中规格区域文本的哈希，
+        否则使用HEAD请求返回的ETag/Last-Modified
+
+        Args:
+            url: 产品页面URL
+
+        Returns:
+            指纹字符串，无法计算时返回None（该产品总是重新提取）
+        """
+        if self.fingerprint_selector:
+            page = self.get_selector(url)
+            region = page.css(self.fingerprint_selector) if page else []
+            if not region:
+                return None
+            text = "\n".join(self.element_text(element) for element in region)
+            return f"sha256:{hashlib.sha256(text.encode('utf-8')).hexdigest()}"
+
+        # 离线模式下不能访问网络，无法获取验证头
+        if self.cache is not None and self.cache.offline:
+            return None
+        try:
+            response = self.http.head(url, timeout=self.request_timeout, allow_redirects=True)
+        except Exception as e:
+            self.logger.debug(f"获取产品页面验证头失败 {url}: {str(e)}")
+            return None
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if response.status_code != 200 or not (etag or last_modified):
+            return None
+        return f"etag:{etag or ''}|last-modified:{last_modified or ''}"
 
     @abstractmethod
     def get_links_from_page(self, url, selector=None):
@@ -111,47 +733,588 @@ class BaseCrawler(ABC):
         """处理类别页面（子类必须实现）"""
         pass
 
-    def process_and_save_data(self, products):
-        """处理并保存产品数据"""
-        if not products:
+    def _jsonl_path(self):
+        """本次运行逐条写入产品数据的JSON Lines文件路径"""
+        return os.path.join(config.STATE_DIR, f"{self.brand_name}.jsonl")
+
+    def save_product(self, url, product_data):
+        """将一个产品追加写入JSON Lines文件（线程安全）"""
+        if self.writer is not None:
+            self.writer.write(url, product_data)
+
+    async def aget_links_from_page(self, url, selector=None):
+        """get_links_from_page的协程版本，默认在线程中调用同步实现（子类可覆盖为真正的异步实现）"""
+        return await asyncio.to_thread(self.get_links_from_page, url, selector)
+
+    async def aextract_product_details(self, url):
+        """extract_product_details的协程版本，默认在线程中调用同步实现（子类可覆盖为真正的异步实现）"""
+        return await asyncio.to_thread(self.extract_product_details, url)
+
+    async def aprocess_category_page(self, url):
+        """process_category_page的协程版本，默认在线程中调用同步实现（子类可覆盖为真正的异步实现）"""
+        return await asyncio.to_thread(self.process_category_page, url)
+
+    def process_and_save_data(self):
+        """处理并保存产品数据：将JSON Lines文件合并为JSON文件"""
+        if self.writer is not None:
+            self.writer.close()
+
+        return self._finalize_output([self._jsonl_path()])
+
+    def _finalize_output(self, jsonl_paths):
+        """将一个或多个JSON Lines文件合并保存为<brand>.json，返回保存的产品数量"""
+        jsonl_paths = [path for path in jsonl_paths if os.path.exists(path)]
+        if not jsonl_paths:
             self.logger.warning("没有产品数据可保存")
-            return
+            return 0
 
         # 保存为JSON文件
         json_path = os.path.join(self.data_dir, f"{self.brand_name}.json")
         try:
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(products, f, ensure_ascii=False, indent=4)
+            count = finalize_jsonl(jsonl_paths, json_path)
+            if not count:
+                self.logger.warning("没有产品数据可保存")
+                return 0
             self.logger.info(f"JSON数据已保存至: {json_path}")
+            return count
         except Exception as e:
             self.logger.error(f"保存JSON数据到 {json_path} 时出错: {str(e)}")
+            return 0
 
-    def run(self):
-        """运行爬虫"""
-        self.logger.info(f"开始爬取 {self.brand_name} 产品数据...")
+    def publish_links(self, links):
+        """
+        将刚发现的产品链接立即交给详情提取线程（仅流水线模式下生效）
+
+        子类可以在类别页面处理过程中随时调用，已发现过的链接会被忽略
 
-        all_products = []
+        Args:
+            links: 产品链接列表
+        """
+        if self._link_queue is None:
+            return
+
+        new_links = self.frontier.filter_new(links)
+        if self.state is not None:
+            self.state.add_links(new_links)
+        for link in new_links:
+            self._link_queue.put(link)
+
+    def _unchanged_product(self, link, fingerprint):
+        """增量模式下指纹未变化时从上次运行的输出快照中读取产品数据，否则返回None"""
+        if self.fingerprints is None or not self.fingerprints.unchanged(link, fingerprint):
+            return None
+        product_data = self.previous_products.get(link)
+        if product_data is not None:
+            self.fingerprints.update(link, fingerprint)
+            self.logger.info(f"产品未变化，沿用上次数据: {link}")
+        return product_data
+
+    @staticmethod
+    def _extraction_complete(product_data):
+        """提取结果是否完整（解析出了规格参数），不完整的渲染结果不写入缓存，缓存中的也不采用"""
+        return bool(product_data and product_data.get("params"))
+
+    def _finish_extraction(self, link, fingerprint, product_data):
+        """记录提取结果的日志，增量模式下更新产品指纹"""
+        if product_data:
+            self.logger.info(f"成功提取产品: {product_data.get('product_id', 'unknown')}")
+            if self.fingerprints is not None:
+                self.fingerprints.update(link, fingerprint)
+        else:
+            self.logger.warning(f"提取产品详情失败: {link}")
+        return product_data
+
+    def _extract_link(self, link):
+        """提取单个产品链接的详情并记录日志，增量模式下跳过没有变化的产品"""
+        fingerprint = self.product_fingerprint(link) if self.fingerprints is not None else None
+        product_data = self._unchanged_product(link, fingerprint)
+        if product_data is not None:
+            return product_data
+
+        self.logger.info(f"提取产品详情: {link}")
+        if self.use_selenium:
+            # 优先重放缓存的渲染结果，其次直接请求已发现的规格接口，最后才用浏览器提取
+            try:
+                cached_page = self.cached_render(link)
+            except CacheMissError as e:
+                self.logger.warning(str(e))
+                return None
+            if cached_page is not None:
+                product_data = self.parse_product_page(link, cached_page)
+                if not self._extraction_complete(product_data) and not self.offline:
+                    # 缓存的渲染结果不完整，重新用浏览器提取并覆盖缓存
+                    self.logger.info(f"缓存的渲染结果解析失败，重新使用浏览器提取: {link}")
+                    product_data = None
+            else:
+                product_data = self.fetch_spec_via_api(link)
+            if product_data is None and not self.offline:
+                with self.driver_session(), self.rendering(link):
+                    capturing = self._spec_api_capturing()
+                    if capturing:
+                        drain_performance_log(self.driver)
+                    product_data = self.extract_product_details(link)
+                    if self._extraction_complete(product_data):
+                        self.save_render()
+                    if capturing:
+                        self.discover_spec_api(link, product_data)
+        else:
+            product_data = self.extract_product_details(link)
+        return self._finish_extraction(link, fingerprint, product_data)
+
+    def _process_link(self, link):
+        """
+        提取单个产品并在爬取状态中记录完成或失败，恢复运行时跳过已完成的产品
+
+        Returns:
+            产品数据字典，已完成或提取失败时返回None
+        """
+        if self.state is None:
+            return self._extract_link(link)
+        if self.state.is_done(link):
+            return None
+        try:
+            product_data = self._extract_link(link)
+        except Exception as e:
+            self.state.mark_failed(link, str(e))
+            raise
+        self._record_result(link, product_data)
+        return product_data
+
+    def _record_result(self, link, product_data):
+        """在爬取状态中记录产品提取完成或失败"""
+        if self.state is None:
+            return
+        if product_data:
+            self.state.mark_done(link, product_data)
+        else:
+            self.state.mark_failed(link)
+
+    def _discover_links(self, start_url):
+        """
+        处理类别页面获取产品链接，恢复运行时已完成的类别页面直接使用上次的结果
+
+        Args:
+            start_url: 类别页面URL
+
+        Returns:
+            产品链接列表
+        """
+        product_links = self.state.category_links(start_url) if self.state is not None else None
+        if product_links is not None:
+            self.logger.info(f"类别页面上次已完成，沿用 {len(product_links)} 个产品链接: {start_url}")
+            return product_links
+
+        self.logger.info(f"处理类别页面: {start_url}")
+        product_links = self.process_category_page(start_url)
+        self.logger.info(f"找到 {len(product_links)} 个产品链接")
+        if self.state is not None:
+            self.state.mark_category_done(start_url, product_links)
+        return product_links
+
+    def _can_pipeline(self):
+        """判断当前爬虫能否使用流水线模式"""
+        # 链接发现需要独占一个WebDriver，会话池中至少还要留一个给详情提取
+        if self.use_selenium and self.discovery_uses_driver and self.driver_pool.size < 2:
+            self.logger.info("链接发现依赖WebDriver且会话池只有一个会话，使用顺序模式运行")
+            return False
+        return True
+
+    def _pipeline_worker_count(self):
+        """流水线模式下的详情提取线程数"""
+        # 每个详情线程占用一个WebDriver会话，线程数不能超过可用会话数
+        if self.use_selenium:
+            available = self.driver_pool.size - (1 if self.discovery_uses_driver else 0)
+            return max(1, min(self.detail_workers, available))
+        return max(1, self.detail_workers)
+
+    def _extract_links(self, links):
+        """
+        提取一组产品链接的详情并逐条写入，Selenium爬虫按会话池大小并发提取
+
+        Args:
+            links: 产品链接列表，本次运行内已发现过的链接会被忽略
+        """
+        links = self.frontier.filter_new(links)
+        if not self.use_selenium or self.driver_pool.size < 2 or len(links) < 2:
+            for link in links:
+                self._process_and_save(link)
+        else:
+            # 顺序模式下链接发现已经结束，归还主线程占用的会话供详情提取使用
+            self.release_driver()
+            with ThreadPoolExecutor(max_workers=self.driver_pool.size,
+                                    thread_name_prefix=f"{self.brand_name}-detail") as executor:
+                # 结果需要消费完，保证所有链接都处理完毕
+                list(executor.map(self._process_and_save, links))
+
+    def _process_and_save(self, link):
+        """提取并保存单个产品，出错时记录日志并继续处理其他产品（失败已在爬取状态中记录）"""
+        try:
+            product_data = self._process_link(link)
+            if product_data:
+                self.save_product(link, product_data)
+        except Exception as e:
+            self.logger.error(f"处理产品 {link} 时出错: {str(e)}")
+
+    def _run_sequential(self):
+        """顺序模式：处理完一个类别页面的链接发现后再逐个提取产品详情"""
         for start_url in self.start_urls:
             # 获取产品链接
-            self.logger.info(f"处理类别页面: {start_url}")
-            product_links = self.process_category_page(start_url)
-            self.logger.info(f"找到 {len(product_links)} 个产品链接")
+            product_links = self._discover_links(start_url)
 
             # 爬取每个产品页面
-            for link in product_links:
-                self.logger.info(f"提取产品详情: {link}")
-                product_data = self.extract_product_details(link)
-                if product_data:
-                    all_products.append(product_data)
-                    self.logger.info(f"成功提取产品: {product_data.get('product_id', 'unknown')}")
-                else:
-                    self.logger.warning(f"提取产品详情失败: {link}")
-
-        # 保存数据
-        self.process_and_save_data(all_products)
-        self.logger.info(f"爬取完成，共获取 {len(all_products)} 个产品数据")
-
-        # 如果使用了Selenium，关闭WebDriver
-        if self.use_selenium and hasattr(self, 'driver'):
-            self.driver.quit()
+            self._extract_links(product_links)
+
+    def _run_pipelined(self):
+        """流水线模式：链接发现与详情提取同时进行，通过有界队列衔接"""
+        worker_count = self._pipeline_worker_count()
+        self._link_queue = queue.Queue(maxsize=config.PIPELINE_QUEUE_SIZE)
+
+        def detail_worker():
+            while True:
+                link = self._link_queue.get()
+                if link is _STOP:
+                    return
+                self._process_and_save(link)
+
+        workers = [
+            threading.Thread(target=detail_worker, name=f"{self.brand_name}-detail-{i}", daemon=True)
+            for i in range(worker_count)
+        ]
+        for worker in workers:
+            worker.start()
+        self.logger.info(f"流水线模式已启动，详情提取线程数: {worker_count}")
+
+        try:
+            for start_url in self.start_urls:
+                product_links = self._discover_links(start_url)
+                # 子类没有提前发布的链接在这里统一发布
+                self.publish_links(product_links)
+        finally:
+            for _ in workers:
+                self._link_queue.put(_STOP)
+            for worker in workers:
+                worker.join()
+            self._link_queue = None
+
+    def _can_run_async(self):
+        """判断当前爬虫能否使用异步抓取引擎"""
+        return self.async_fetch and config.ASYNC_FETCH_ENABLED and not self.use_selenium
+
+    async def _aextract_link(self, link):
+        """_extract_link的协程版本，增量模式下的指纹在线程中计算"""
+        fingerprint = None
+        if self.fingerprints is not None:
+            fingerprint = await asyncio.to_thread(self.product_fingerprint, link)
+        product_data = self._unchanged_product(link, fingerprint)
+        if product_data is not None:
+            return product_data
+
+        self.logger.info(f"提取产品详情: {link}")
+        product_data = await self.aextract_product_details(link)
+        return self._finish_extraction(link, fingerprint, product_data)
+
+    async def _aprocess_link(self, link):
+        """提取并保存单个产品，出错时记录失败并继续处理其他产品"""
+        if self.state is not None and self.state.is_done(link):
+            return
+        try:
+            product_data = await self._aextract_link(link)
+        except Exception as e:
+            self.logger.error(f"提取产品详情时出错 {link}: {str(e)}")
+            if self.state is not None:
+                self.state.mark_failed(link, str(e))
+            return
+        self._record_result(link, product_data)
+        if product_data:
+            self.save_product(link, product_data)
+
+    async def _adiscover_links(self, start_url):
+        """_discover_links的协程版本"""
+        product_links = self.state.category_links(start_url) if self.state is not None else None
+        if product_links is not None:
+            self.logger.info(f"类别页面上次已完成，沿用 {len(product_links)} 个产品链接: {start_url}")
+            return product_links
+
+        self.logger.info(f"处理类别页面: {start_url}")
+        product_links = await self.aprocess_category_page(start_url)
+        self.logger.info(f"找到 {len(product_links)} 个产品链接")
+        if self.state is not None:
+            self.state.mark_category_done(start_url, product_links)
+        return product_links
+
+    async def _crawl_async(self):
+        """异步模式：所有类别页面和产品页面并发抓取，并发数由抓取器和按主机的调度器限制"""
+        from .async_engine import AsyncFetcher
+
+        self.fetcher = AsyncFetcher(cache=self.cache, scheduler=self.http.scheduler, timeout=self.request_timeout)
+
+        async def crawl_category(start_url):
+            product_links = await self._adiscover_links(start_url)
+            new_links = self.frontier.filter_new(product_links)
+            await asyncio.gather(*(self._aprocess_link(link) for link in new_links))
+
+        try:
+            await asyncio.gather(*(crawl_category(start_url) for start_url in self.start_urls))
+        finally:
+            await self.fetcher.close()
+            self.fetcher = None
+
+    def _run_async(self):
+        """在独立的事件循环中运行异步模式"""
+        self.logger.info(f"异步模式已启动，最大并发请求数: {config.ASYNC_CONCURRENCY}")
+        asyncio.run(self._crawl_async())
+
+    def run(self):
+        """
+        运行爬虫
+
+        Returns:
+            保存的产品数量
+        """
+        self.logger.info(f"开始爬取 {self.brand_name} 产品数据...")
+        self.selector_memo.clear()
+        self.frontier.clear()
+
+        try:
+            self.warm_up_driver()
+            if self.incremental:
+                self._load_fingerprints()
+
+            state_path = os.path.join(config.STATE_DIR, f"{self.brand_name}.sqlite3")
+            self.state = CrawlState(state_path, reset=not self.resume)
+            self.writer = JsonlWriter(self._jsonl_path())
+            if self.resume:
+                # 上次已完成的产品直接从状态库写入本次的输出
+                restored = 0
+                for url, product_data in self.state.iter_results():
+                    self.save_product(url, product_data)
+                    restored += 1
+                self.logger.info(f"恢复模式：沿用 {restored} 个已完成的产品，链接状态: {self.state.summary()}")
+
+            if self._can_run_async():
+                self._run_async()
+            elif self.pipeline and self._can_pipeline():
+                self._run_pipelined()
+            else:
+                self._run_sequential()
+
+            if self.fingerprints is not None:
+                # 本次没有访问到的历史产品保留在数据集中，恢复运行时沿用的产品比历史数据更新，不能被覆盖
+                kept = 0
+                for url, product_data in self.previous_products.iter_products():
+                    if not self.fingerprints.visited(url) and not self.state.is_done(url):
+                        self.save_product(url, product_data)
+                        kept += 1
+                if kept:
+                    self.logger.info(f"增量模式：保留 {kept} 个本次未访问的历史产品")
+
+            # 保存数据
+            product_count = self.process_and_save_data()
+            if self.fingerprints is not None and product_count:
+                self._save_fingerprints([self._jsonl_path()])
+            self.logger.info(f"爬取完成，共获取 {product_count} 个产品数据")
+            return product_count
+        finally:
+            self.close()
+
+    def _fingerprint_path(self):
+        """增量模式下产品指纹文件的路径"""
+        return os.path.join(config.STATE_DIR, f"{self.brand_name}.fingerprints.json")
+
+    def _snapshot_path(self):
+        """增量模式下上次运行输出的产品数据快照（JSON Lines）的路径，与指纹文件一同更新"""
+        return os.path.join(config.STATE_DIR, f"{self.brand_name}.previous.jsonl")
+
+    def _load_fingerprints(self):
+        """增量模式下加载上次运行的产品指纹和输出快照"""
+        self.fingerprints = FingerprintStore(self._fingerprint_path())
+        self.previous_products = ProductSnapshot(self._snapshot_path())
+        self.logger.info(f"增量模式：已加载 {len(self.fingerprints)} 个产品的指纹，"
+                         f"{len(self.previous_products)} 个产品的历史数据")
+
+    def _save_fingerprints(self, jsonl_paths):
+        """
+        输出保存成功后，把本次运行的输出保存为新的快照并写回指纹文件
+
+        两者在同一时刻更新，指纹未变化时从快照中读到的总是同一次运行的产品数据
+        """
+        self.previous_products.close()
+        ProductSnapshot.save(self._snapshot_path(), jsonl_paths)
+        self.fingerprints.save()
+
+    def _shard_fingerprint_path(self, shard):
+        """分片模式下各分片本次访问到的产品指纹的保存路径，合并时汇总到指纹文件"""
+        return os.path.join(config.STATE_DIR, f"{self.brand_name}.shard{shard}.fingerprints.json")
+
+    def _shard_previous_path(self):
+        """分片模式下本次没有访问到的历史产品的JSON Lines文件路径（增量模式）"""
+        return os.path.join(config.STATE_DIR, f"{self.brand_name}.shards.previous.jsonl")
+
+    def _shard_queue_path(self):
+        """分片模式下任务队列数据库的路径"""
+        return os.path.join(config.STATE_DIR, f"{self.brand_name}.shards.sqlite3")
+
+    def _shard_jsonl_path(self, shard):
+        """分片模式下各分片逐条写入产品数据的JSON Lines文件路径"""
+        return os.path.join(config.STATE_DIR, f"{self.brand_name}.shard{shard}.jsonl")
+
+    def run_discovery(self, shard_count):
+        """
+        分片模式第一步：处理所有类别页面，把产品链接按一致性哈希写入分片任务队列
+
+        恢复模式下沿用已有的队列，已完成的链接不会重新分配
+
+        Args:
+            shard_count: 分片数量
+
+        Returns:
+            本次新加入队列的链接数
+        """
+        self.logger.info(f"分片模式：开始发现 {self.brand_name} 的产品链接，分片数: {shard_count}")
+        self.frontier.clear()
+        work_queue = ShardQueue(self._shard_queue_path(), shard_count, reset=not self.resume)
+        try:
+            if work_queue.fresh:
+                # 新的队列对应新的一轮爬取，清除上一轮各分片的输出和指纹访问记录
+                for path in glob.glob(self._shard_jsonl_path("*")) + glob.glob(self._shard_fingerprint_path("*")):
+                    os.remove(path)
+            else:
+                work_queue.retry_failed()
+
+            added = 0
+            for start_url in self.start_urls:
+                product_links = self._discover_links(start_url)
+                added += work_queue.add(self.frontier.filter_new(product_links))
+            self.logger.info(f"分片模式：新加入 {added} 个产品链接，队列状态: {work_queue.summary()}")
+            return added
+        finally:
+            work_queue.close()
+            self.close()
+
+    def _extract_queued_link(self, link):
+        """提取分片中的一个链接，返回(产品数据, 错误信息)"""
+        try:
+            return self._extract_link(link), None
+        except Exception as e:
+            self.logger.error(f"提取产品详情时出错 {link}: {str(e)}")
+            return None, str(e)
+
+    def run_shard(self, shard):
+        """
+        分片模式第二步：领取并提取一个分片中的产品链接，结果追加写入该分片的JSON Lines文件
+
+        每个分片在独立的进程中运行，使用各自的浏览器会话
+
+        Args:
+            shard: 分片编号
+
+        Returns:
+            本次提取成功的产品数量
+        """
+        work_queue = ShardQueue(self._shard_queue_path())
+        executor = None
+        try:
+            self.warm_up_driver()
+            work_queue.requeue_running(shard)
+            self.logger.info(f"分片 {shard}/{work_queue.shard_count} 开始运行，队列状态: {work_queue.summary(shard)}")
+            if self.incremental:
+                # 各分片读取同一份历史指纹，本次的访问记录单独保存，恢复运行时接着上次的记录
+                self._load_fingerprints()
+                self.fingerprints.merge_visited(self._shard_fingerprint_path(shard))
+            self.writer = JsonlWriter(self._shard_jsonl_path(shard), append=True)
+            if self.use_selenium and self.driver_pool.size > 1:
+                executor = ThreadPoolExecutor(max_workers=self.driver_pool.size,
+                                              thread_name_prefix=f"{self.brand_name}-shard{shard}")
+
+            saved = 0
+            while True:
+                links = work_queue.claim(shard, config.SHARD_CLAIM_BATCH)
+                if not links:
+                    break
+                results = executor.map(self._extract_queued_link, links) if executor else \
+                    map(self._extract_queued_link, links)
+                for link, (product_data, error) in zip(links, results):
+                    if product_data:
+                        self.save_product(link, product_data)
+                        work_queue.mark_done(link)
+                        saved += 1
+                    else:
+                        work_queue.mark_failed(link, error)
+                if self.fingerprints is not None:
+                    # 每批保存一次，进程中断时已完成链接的指纹不会丢失
+                    self.fingerprints.save_visited(self._shard_fingerprint_path(shard))
+
+            self.logger.info(f"分片 {shard} 完成，本次提取 {saved} 个产品，队列状态: {work_queue.summary(shard)}")
+            return saved
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
+            work_queue.close()
+            self.close()
+
+    def merge_shards(self, shard_count):
+        """
+        分片模式第三步：合并各分片的输出，保存为<brand>.json
+
+        增量模式下同时汇总各分片的产品指纹，本次没有访问到的历史产品保留在数据集中，保存成功后更新指纹和快照
+
+        Args:
+            shard_count: 分片数量
+
+        Returns:
+            保存的产品数量
+        """
+        try:
+            jsonl_paths = [self._shard_jsonl_path(shard) for shard in range(shard_count)]
+            if self.incremental:
+                jsonl_paths.insert(0, self._merge_shard_fingerprints(shard_count))
+            count = self._finalize_output(jsonl_paths)
+            if self.fingerprints is not None and count:
+                self._save_fingerprints(jsonl_paths)
+            self.logger.info(f"分片模式：合并 {shard_count} 个分片，共保存 {count} 个产品数据")
+            return count
+        finally:
+            self.close()
+
+    def _merge_shard_fingerprints(self, shard_count):
+        """
+        增量模式下汇总各分片的指纹访问记录，本次没有访问到的历史产品从上次的快照写入单独的JSON Lines文件
+
+        Returns:
+            历史产品JSON Lines文件的路径（合并时放在各分片输出之前，同一URL以分片中的新数据为准）
+        """
+        self._load_fingerprints()
+        for shard in range(shard_count):
+            self.fingerprints.merge_visited(self._shard_fingerprint_path(shard))
+
+        previous_path = self._shard_previous_path()
+        writer = JsonlWriter(previous_path)
+        try:
+            for url, product_data in self.previous_products.iter_products():
+                if not self.fingerprints.visited(url):
+                    writer.write(url, product_data)
+        finally:
+            writer.close()
+        if writer.count:
+            self.logger.info(f"增量模式：保留 {writer.count} 个本次未访问的历史产品")
+        return previous_path
+
+    def close(self):
+        """释放爬虫占用的WebDriver会话、HTTP连接和输出文件"""
+        if self.writer is not None:
+            self.writer.close()
+        if self.state is not None:
+            self.state.close()
+            self.state = None
+        if self.previous_products is not None:
+            self.previous_products.close()
+        self.selector_memo.clear()
+
+        # 如果使用了Selenium，关闭所有WebDriver会话
+        if self.driver_pool is not None:
+            self.release_driver()
+            self.driver_pool.close()
             self.logger.info("WebDriver已关闭")
+
+        # 关闭HTTP连接池
+        self.http.close()
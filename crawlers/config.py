@@ -0,0 +1,90 @@
+"""
+爬虫全局配置
+"""
+
+# HTTP连接池配置
+HTTP_POOL_CONNECTIONS = 10  # 每个Session缓存的连接池数量
+HTTP_POOL_MAXSIZE = 20  # 每个主机连接池中保持的最大连接数
+HTTP_TIMEOUT = 20  # 默认请求超时时间（秒）
+HTTP_MAX_RETRIES = 2  # 建立连接失败时的重试次数
+SELECTOR_MEMO_SIZE = 256  # 单次运行内缓存的已解析页面数量，0表示不缓存
+
+# 流水线运行模式配置
+PIPELINE_ENABLED = False  # 是否默认启用“边发现链接边提取详情”的流水线模式
+PIPELINE_DETAIL_WORKERS = 4  # 详情提取线程数
+PIPELINE_QUEUE_SIZE = 200  # 待提取链接队列的最大长度
+PAGINATION_WORKERS = 6  # 并发获取分页列表页面的线程数
+
+# WebDriver会话池配置
+WEBDRIVER_POOL_SIZE = 3  # 每个爬虫默认同时打开的浏览器会话数
+WEBDRIVER_MAX_PAGES = 200  # 单个会话处理多少个产品页面后重建，0表示不重建
+
+# 页面就绪等待配置
+READY_TIMEOUT = 10  # 等待页面就绪的最长时间（秒）
+READY_POLL_INTERVAL = 0.1  # 检查就绪条件的间隔（秒）
+NETWORK_IDLE_QUIET = 0.5  # 网络请求数保持不变多久视为网络空闲（秒）
+
+# 浏览器爬取配置（无头模式并屏蔽不需要的资源以加快页面加载）
+BROWSER_HEADLESS = True  # 是否使用无头模式，调试时可改为False显示浏览器窗口
+BROWSER_BLOCK_IMAGES = True  # 是否禁止加载图片
+BROWSER_CACHE_DIR = "cache/browser"  # 所有浏览器会话共用的磁盘缓存目录，None表示不指定
+BROWSER_CACHE_SIZE = 512 * 1024 * 1024  # 磁盘缓存大小上限（字节）
+# 通过DevTools屏蔽的请求URL模式（支持*通配符）
+BROWSER_BLOCKED_URL_PATTERNS = [
+    # 媒体和字体
+    "*.mp4*", "*.webm*", "*.mp3*", "*.ogg*", "*.woff*", "*.woff2*", "*.ttf*", "*.otf*", "*.eot*",
+    # 统计分析与广告追踪
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*googlesyndication.com*",
+    "*facebook.net*", "*connect.facebook.com*", "*hotjar.com*", "*clarity.ms*", "*hm.baidu.com*",
+    "*cnzz.com*", "*linkedin.com/px*", "*snap.licdn.com*", "*bat.bing.com*", "*addthis.com*",
+    # 第三方嵌入内容
+    "*youtube.com/embed*", "*player.vimeo.com*", "*maps.googleapis.com*",
+]
+
+# 规格接口捕获配置
+SPEC_API_DISCOVERY_ATTEMPTS = 5  # 最多尝试多少个产品页面来发现规格接口
+SPEC_API_MAX_FAILURES = 3  # 直接请求规格接口连续失败多少次后改回浏览器提取
+SPEC_API_MIN_COVERAGE = 0.5  # 页面上的参数名至少有这个比例出现在接口数据中才采用该接口
+
+# 磁盘响应缓存配置
+HTTP_CACHE_ENABLED = True  # 是否启用磁盘响应缓存
+HTTP_CACHE_DIR = "cache/http"  # 缓存目录
+HTTP_CACHE_TTL = 12 * 3600  # 缓存在多少秒内直接使用，超过后通过条件请求重新验证
+HTTP_CACHE_MAX_BYTES = 2 * 1024 * 1024 * 1024  # 缓存响应体的总大小上限（字节）
+HTTP_CACHE_OFFLINE = False  # 离线重放模式：只使用缓存，从不访问网络
+
+# 增量爬取配置
+STATE_DIR = "state"  # 运行状态文件（产品指纹等）的保存目录，data目录只保存最终结果
+INCREMENTAL_ENABLED = False  # 是否默认只重新提取新增或内容有变化的产品
+
+# 产品数据输出配置
+OUTPUT_FSYNC_EVERY = 20  # 每追加多少个产品后将JSON Lines文件落盘
+OUTPUT_FSYNC_INTERVAL = 5  # 距上次落盘超过多少秒后落盘
+
+# 断点续爬配置
+RESUME_ENABLED = False  # 是否默认从上次中断的进度继续（跳过已完成的类别页面和产品）
+
+# 按主机的请求调度配置（令牌桶限速 + 并发上限 + 限流退避）
+SCHEDULER_RATE = 5.0  # 每个主机每秒的请求数
+SCHEDULER_BURST = 5  # 每个主机允许的突发请求数
+SCHEDULER_MAX_CONCURRENCY = 6  # 每个主机同时进行的请求数上限
+SCHEDULER_BACKOFF_BASE = 5  # 收到429/503且没有Retry-After时的基础暂停时间（秒）
+SCHEDULER_MAX_PENALTY = 32  # 限流后速率最多降低到原来的几分之一
+SCHEDULER_RECOVERY_STEP = 0.1  # 每个成功请求恢复的速率倍数
+SCHEDULER_MAX_RETRIES = 2  # 收到429/503后最多重试次数
+SCHEDULER_ASYNC_POLL_INTERVAL = 0.05  # 异步请求等待并发名额时的轮询间隔（秒）
+# 按主机覆盖以上设置
+SCHEDULER_HOST_OVERRIDES = {
+    # 政府采购网搜索页对频繁请求很敏感
+    "search.ccgp.gov.cn": {"rate": 0.5, "burst": 1, "max_concurrency": 1},
+}
+
+# 异步抓取配置（仅用于不使用Selenium且声明了async_fetch的爬虫）
+ASYNC_FETCH_ENABLED = True  # 是否允许爬虫使用异步抓取引擎
+ASYNC_CONCURRENCY = 16  # 每个爬虫同时进行的请求数上限
+
+# 日志配置
+LOG_CONSOLE = True  # 爬虫日志是否直接输出到控制台（进程模式下子进程关闭，由主进程统一输出）
+
+# 分片爬取配置（同一品牌的产品链接按一致性哈希分给多个进程）
+SHARD_CLAIM_BATCH = 20  # 分片进程每次从任务队列领取的链接数
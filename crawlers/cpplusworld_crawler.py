@@ -1,14 +1,18 @@
-import requests
+import asyncio
 from urllib.parse import urljoin
-from parsel import Selector
 
 from .base_crawler import BaseCrawler
+from .frontier import dedupe_urls
 
 
 class CPlusWorldCrawler(BaseCrawler):
     """
     CPlusWorld网站爬虫，继承自BaseCrawler
     """
+    # 增量模式下用于判断产品是否变化的规格区域
+    fingerprint_selector = ".product-title, .product-info-header, .table-product"
+    # 不使用浏览器，所有页面通过异步抓取引擎并发获取
+    async_fetch = True
 
     def __init__(self, data_dir="data"):
         """
@@ -19,28 +23,11 @@ class CPlusWorldCrawler(BaseCrawler):
 
         # 设置CPlusWorld特定的属性
         self.base_url = "https://www.cpplusworld.com"
+        self.request_timeout = 10
 
         # 设置起始URL
         self.start_urls = ["https://www.cpplusworld.com/Products/network-camera"]
 
-    def get_selector(self, url):
-        """
-        获取页面的Selector对象
-
-        Args:
-            url: 要获取的页面URL
-
-        Returns:
-            Selector对象，失败则返回None
-        """
-        try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()  # 如果响应状态码不是200，抛出异常
-            return Selector(text=response.text)
-        except Exception as e:
-            self.logger.error(f"获取页面内容时出错 {url}: {str(e)}")
-            return None
-
     def get_links_from_page(self, url, selector=None):
         """
         获取页面中的链接
@@ -52,11 +39,34 @@ class CPlusWorldCrawler(BaseCrawler):
         Returns:
             链接列表
         """
-        links = []
         selector = self.get_selector(url)
         if not selector:
-            return links
+            return []
+
+        entries = self._parse_listing(url, selector)
+        # 访问子列表页面获取商品链接
+        sub_pages = {sub_url: self.get_selector(sub_url) for is_sub, sub_url in entries if is_sub}
+        return self._collect_links(url, entries, sub_pages)
+
+    async def aget_links_from_page(self, url, selector=None):
+        """get_links_from_page的协程版本，子列表页面并发获取"""
+        selector = await self.aget_selector(url)
+        if not selector:
+            return []
+
+        entries = self._parse_listing(url, selector)
+        sub_urls = list(dict.fromkeys(sub_url for is_sub, sub_url in entries if is_sub))
+        sub_selectors = await asyncio.gather(*(self.aget_selector(sub_url) for sub_url in sub_urls))
+        return self._collect_links(url, entries, dict(zip(sub_urls, sub_selectors)))
 
+    def _parse_listing(self, url, selector):
+        """
+        解析列表页面中的条目
+
+        Returns:
+            [(是否为子列表页面, URL)]列表，子列表页面需要再次访问才能拿到商品链接
+        """
+        entries = []
         content_divs = selector.css('.search-content > div > div')
         self.logger.debug(f"在页面 {url} 找到 {len(content_divs)} 个内容div")
 
@@ -66,26 +76,28 @@ class CPlusWorldCrawler(BaseCrawler):
                 # 如果h4下有a标签，获取其href属性
                 href = h4_with_a.attrib.get('href')
                 if href:
-                    full_url = urljoin(self.base_url, href)
-                    # 访问这个URL获取商品链接
-                    sub_selector = self.get_selector(full_url)
-                    if sub_selector:
-                        item_image = sub_selector.css('a.item-image')
-                        if item_image:
-                            for item in item_image:
-                                product_url = urljoin(self.base_url, item.attrib.get('href', ''))
-                                if product_url and product_url not in links:
-                                    links.append(product_url)
-                                    self.logger.debug(f"添加产品链接: {product_url}")
+                    entries.append((True, urljoin(self.base_url, href)))
             else:
                 # 如果h4下没有a标签，直接获取a.item-image的href
                 item_image = div.css('a.item-image')
                 if item_image and 'href' in item_image.attrib:
-                    product_url = urljoin(self.base_url, item_image.attrib['href'])
-                    if product_url and product_url not in links:
-                        links.append(product_url)
-                        self.logger.debug(f"添加产品链接: {product_url}")
+                    entries.append((False, urljoin(self.base_url, item_image.attrib['href'])))
+        return entries
 
+    def _collect_links(self, url, entries, sub_pages):
+        """按条目顺序汇总商品链接，sub_pages为子列表页面URL到Selector的映射"""
+        links = []
+        for is_sub, entry_url in entries:
+            if is_sub:
+                sub_selector = sub_pages.get(entry_url)
+                item_image = sub_selector.css('a.item-image') if sub_selector else []
+                product_urls = [urljoin(self.base_url, item.attrib.get('href', '')) for item in item_image]
+            else:
+                product_urls = [entry_url]
+
+            links.extend(product_urls)
+
+        links = dedupe_urls(links)
         self.logger.info(f"从页面 {url} 共获取到 {len(links)} 个链接")
         return links
 
@@ -102,7 +114,26 @@ class CPlusWorldCrawler(BaseCrawler):
         selector = self.get_selector(url)
         if not selector:
             return None
+        return self.parse_product_page(url, selector)
+
+    async def aextract_product_details(self, url):
+        """extract_product_details的协程版本"""
+        selector = await self.aget_selector(url)
+        if not selector:
+            return None
+        return self.parse_product_page(url, selector)
 
+    def parse_product_page(self, url, selector):
+        """
+        从CPlusWorld产品页面的Selector解析产品详情
+
+        Args:
+            url: 产品页面URL
+            selector: 页面的Selector对象
+
+        Returns:
+            产品数据字典或None（如果提取失败）
+        """
         try:
             # 获取产品ID (产品标题)
             product_title = selector.css('.product-title::text').get()
@@ -167,3 +198,10 @@ class CPlusWorldCrawler(BaseCrawler):
         links = self.get_links_from_page(url)
         self.logger.info(f"从分类页面 {url} 获取到 {len(links)} 个产品链接")
         return links
+
+    async def aprocess_category_page(self, url):
+        """process_category_page的协程版本"""
+        self.logger.info(f"处理分类页面: {url}")
+        links = await self.aget_links_from_page(url)
+        self.logger.info(f"从分类页面 {url} 获取到 {len(links)} 个产品链接")
+        return links
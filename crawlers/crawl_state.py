@@ -0,0 +1,156 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS categories (
+    url TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS frontier (
+    url TEXT PRIMARY KEY,
+    category TEXT,
+    position INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS frontier_category ON frontier (category, position);
+CREATE TABLE IF NOT EXISTS results (
+    url TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+class CrawlState:
+    """
+    基于SQLite的爬取状态存储
+
+    记录类别页面是否已完成、待提取的产品链接（frontier）及其完成/失败状态，
+    以及已提取的产品数据，中断后可以从上次的进度继续
+    """
+
+    def __init__(self, path, reset=False):
+        """
+        打开状态数据库
+
+        Args:
+            path: 数据库文件路径
+            reset: 是否清空上次运行的状态
+        """
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.executescript(_SCHEMA)
+            if reset:
+                for table in ("categories", "frontier", "results"):
+                    self._conn.execute(f"DELETE FROM {table}")
+
+    def category_links(self, url):
+        """
+        获取已完成的类别页面上次发现的产品链接
+
+        Returns:
+            产品链接列表（保持发现顺序），类别页面未完成时返回None
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT status FROM categories WHERE url = ?", (url,)).fetchone()
+            if not row or row[0] != "done":
+                return None
+            rows = self._conn.execute(
+                "SELECT url FROM frontier WHERE category = ? ORDER BY position", (url,)
+            ).fetchall()
+        return [link for link, in rows]
+
+    def add_links(self, links, category=None):
+        """将产品链接加入frontier，已存在的链接保持原状态"""
+        now = time.time()
+        with self._lock, self._conn:
+            start = self._conn.execute("SELECT COUNT(*) FROM frontier").fetchone()[0]
+            # 流水线模式下链接可能先于类别页面完成就已加入，此时补上所属类别
+            self._conn.executemany(
+                "INSERT INTO frontier (url, category, position, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(url) DO UPDATE SET category = COALESCE(frontier.category, excluded.category)",
+                [(link, category, start + i, now) for i, link in enumerate(links)]
+            )
+
+    def mark_category_done(self, url, links):
+        """记录类别页面已完成及其发现的全部产品链接"""
+        self.add_links(links, category=url)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO categories (url, status, updated_at) VALUES (?, 'done', ?)",
+                (url, time.time())
+            )
+
+    def is_done(self, url):
+        """产品链接是否已经提取完成"""
+        with self._lock:
+            row = self._conn.execute("SELECT status FROM frontier WHERE url = ?", (url,)).fetchone()
+        return bool(row) and row[0] == "done"
+
+    def mark_done(self, url, product_data):
+        """记录产品提取完成并保存产品数据"""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (url, data, updated_at) VALUES (?, ?, ?)",
+                (url, json.dumps(product_data, ensure_ascii=False), now)
+            )
+            self._upsert_status(url, "done", None, now)
+
+    def mark_failed(self, url, error=None):
+        """记录产品提取失败，下次恢复运行时会重试"""
+        with self._lock, self._conn:
+            self._upsert_status(url, "failed", error, time.time())
+
+    def _upsert_status(self, url, status, error, now):
+        """更新frontier中链接的状态，链接不存在时插入（调用方需持有锁）"""
+        updated = self._conn.execute(
+            "UPDATE frontier SET status = ?, attempts = attempts + 1, error = ?, updated_at = ? WHERE url = ?",
+            (status, error, now, url)
+        ).rowcount
+        if not updated:
+            position = self._conn.execute("SELECT COUNT(*) FROM frontier").fetchone()[0]
+            self._conn.execute(
+                "INSERT INTO frontier (url, position, status, attempts, error, updated_at) "
+                "VALUES (?, ?, ?, 1, ?, ?)",
+                (url, position, status, error, now)
+            )
+
+    def iter_results(self):
+        """
+        逐条读取已保存的产品数据（按提取时间排序）
+
+        Yields:
+            (url, 产品数据字典)
+        """
+        # 使用独立的只读连接逐行读取，不把全部结果载入内存
+        conn = sqlite3.connect(self.path)
+        try:
+            for url, data in conn.execute("SELECT url, data FROM results ORDER BY updated_at"):
+                yield url, json.loads(data)
+        finally:
+            conn.close()
+
+    def summary(self):
+        """各状态的产品链接数量，如{"done": 10, "failed": 2, "pending": 5}"""
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM frontier GROUP BY status").fetchall()
+        return dict(rows)
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
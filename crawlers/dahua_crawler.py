@@ -1,12 +1,11 @@
-import time
-import requests
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urljoin
-from parsel import Selector
 
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, ElementClickInterceptedException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 
+from . import config
 from .base_crawler import BaseCrawler
 
 
@@ -14,6 +13,11 @@ class DahuaCrawler(BaseCrawler):
     """
     大华网站爬虫，继承自BaseCrawler
     """
+    # 页面和规格参数的就绪条件
+    page_ready_selector = ".info-font.fr > h2"
+    spec_ready_selector = ".parameter-info .parameter-value"
+    # 规格参数由后台请求加载，尝试捕获该接口后直接请求
+    spec_api_pattern = r"(?i)param|spec"
 
     def __init__(self, data_dir="data"):
         """
@@ -24,6 +28,7 @@ class DahuaCrawler(BaseCrawler):
 
         # 设置大华特定的属性
         self.base_url = "https://www.dahuatech.com"
+        self.request_timeout = 10
 
         # 设置起始页面列表
         self.start_urls = [
@@ -34,24 +39,6 @@ class DahuaCrawler(BaseCrawler):
             "https://www.dahuatech.com/product/lists/1492"
         ]
 
-    def get_selector(self, url):
-        """
-        使用requests获取页面的Selector对象
-
-        Args:
-            url: 要获取内容的URL
-
-        Returns:
-            Selector对象，失败则返回None
-        """
-        try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            return Selector(text=response.text)
-        except Exception as e:
-            self.logger.error(f"获取页面内容时出错 {url}: {str(e)}")
-            return None
-
     def get_links_from_page(self, url, selector=None):
         """
         从页面获取链接，使用requests而非selenium
@@ -98,22 +85,8 @@ class DahuaCrawler(BaseCrawler):
             产品数据字典或None（如果提取失败）
         """
         try:
-            self.driver.get(url)
-            time.sleep(2)  # 等待页面加载
-
-            # 获取产品ID和名称
-            try:
-                id_element = self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, ".info-font.fr > h2")))
-                product_id = id_element.text.strip()
-
-                name_element = self.driver.find_element(By.CSS_SELECTOR, ".info-font.fr > h3")
-                name = name_element.text.strip()
-
-                if not product_id or not name:
-                    self.logger.warning(f"产品ID或名称为空 {url}")
-                    return None
-            except (TimeoutException, NoSuchElementException) as e:
-                self.logger.error(f"无法获取产品ID或名称 {url}: {str(e)}")
+            if not self.load_page(url):
+                self.logger.error(f"无法获取产品ID或名称 {url}: 页面加载超时")
                 return None
 
             # 点击规格参数按钮 - 使用li[data-id="2"]选择器
@@ -124,67 +97,85 @@ class DahuaCrawler(BaseCrawler):
                 ))
                 # 尝试常规点击
                 spec_tab.click()
-                time.sleep(1.5)  # 延长等待时间，确保参数加载
+                self.wait_until_ready(css=self.spec_ready_selector, network_idle=True)  # 等待参数加载完成
             except (TimeoutException, NoSuchElementException, ElementClickInterceptedException) as e:
                 self.logger.warning(f"常规点击规格参数按钮失败 {url}: {str(e)}")
                 # 尝试JavaScript点击
                 try:
                     spec_tab = self.driver.find_element(By.CSS_SELECTOR, "li[data-id=\"2\"]")
                     self.driver.execute_script("arguments[0].click();", spec_tab)
-                    time.sleep(1.5)
+                    self.wait_until_ready(css=self.spec_ready_selector, network_idle=True)
                 except Exception as js_e:
                     self.logger.warning(f"JavaScript点击规格参数按钮失败 {url}: {str(js_e)}")
                     # 如果还是不行，继续但可能无法获取参数
 
-            # 获取规格参数
-            params = []
-            try:
-                parameter_sections = self.driver.find_elements(By.CSS_SELECTOR, ".parameter-info")
-
-                for section in parameter_sections:
-                    # 从第二个parameter-item开始获取
-                    parameter_items = section.find_elements(By.CSS_SELECTOR, ".parameter-item")
-
-                    for item in parameter_items[1:]:  # 跳过第一个
-                        try:
-                            label_element = item.find_element(By.CSS_SELECTOR, ".parameter-label")
-                            value_element = item.find_element(By.CSS_SELECTOR, ".parameter-value")
-
-                            param_name = label_element.text.strip()
-                            param_value = value_element.text.strip()
-
-                            if param_name and param_value:  # 确保参数名和值不为空
-                                params.append({
-                                    "paramName": param_name,
-                                    "param": param_value
-                                })
-                        except Exception as param_e:
-                            self.logger.debug(f"提取参数项时出错: {str(param_e)}")
-                            continue
-
-                # 检查是否提取到参数
-                if not params:
-                    self.logger.warning(f"未提取到任何规格参数 {url}")
-                    return None
-
-            except Exception as e:
-                self.logger.error(f"提取规格参数时出错 {url}: {str(e)}")
-                return None
-
-            # 准备产品数据
-            product_data = {
-                'product_id': product_id,
-                'product_name': name,
-                'params': params
-            }
-
-            self.logger.info(f"成功提取产品信息: {name} ({product_id})")
-            return product_data
+            # 一次性获取渲染后的页面，后续解析在本地完成
+            return self.parse_product_page(url, self.page_selector())
 
         except Exception as e:
             self.logger.error(f"提取产品详情时出错 {url}: {str(e)}")
             return None
 
+    def parse_product_identity(self, page):
+        """
+        从大华产品页面解析产品ID和名称
+
+        Args:
+            page: 页面的Selector对象
+
+        Returns:
+            (product_id, product_name)
+        """
+        product_id = self.element_text(page.css(".info-font.fr > h2"))
+        product_name = self.element_text(page.css(".info-font.fr > h3"))
+        return product_id, product_name
+
+    def parse_product_page(self, url, page):
+        """
+        从渲染后的大华产品页面解析产品详情
+
+        Args:
+            url: 产品页面URL
+            page: 页面的Selector对象
+
+        Returns:
+            产品数据字典或None（如果解析失败）
+        """
+        # 获取产品ID和名称
+        product_id, name = self.parse_product_identity(page)
+        if not product_id or not name:
+            self.logger.warning(f"产品ID或名称为空 {url}")
+            return None
+
+        # 获取规格参数
+        params = []
+        for section in page.css(".parameter-info"):
+            # 从第二个parameter-item开始获取
+            for item in section.css(".parameter-item")[1:]:  # 跳过第一个
+                param_name = self.element_text(item.css(".parameter-label"))
+                param_value = self.element_text(item.css(".parameter-value"))
+
+                if param_name and param_value:  # 确保参数名和值不为空
+                    params.append({
+                        "paramName": param_name,
+                        "param": param_value
+                    })
+
+        # 检查是否提取到参数
+        if not params:
+            self.logger.warning(f"未提取到任何规格参数 {url}")
+            return None
+
+        # 准备产品数据
+        product_data = {
+            'product_id': product_id,
+            'product_name': name,
+            'params': params
+        }
+
+        self.logger.info(f"成功提取产品信息: {name} ({product_id})")
+        return product_data
+
     def process_category_page(self, url):
         """
         处理大华类别页面并处理分页，使用requests获取页面内容
@@ -207,6 +198,7 @@ class DahuaCrawler(BaseCrawler):
         # 获取第一页的产品链接
         product_links = self.get_links_from_page(url)
         all_product_links.extend(product_links)
+        self.publish_links(product_links)
         self.logger.info(f"在第1页找到 {len(product_links)} 个产品链接")
 
         # 检查是否存在分页
@@ -229,17 +221,33 @@ class DahuaCrawler(BaseCrawler):
             self.logger.error(f"获取总页数出错: {str(e)}")
             return all_product_links
 
-        # 处理后续页面
-        for page in range(2, total_pages + 1):
-            page_url = f"{url}/{page}.html"
-            self.logger.info(f"处理第 {page} 页: {page_url}")
-
-            try:
-                page_links = self.get_links_from_page(page_url)
+        # 后续页面的URL都是已知的，并发获取，结果按页码顺序合并
+        pages = range(2, total_pages + 1)
+        with ThreadPoolExecutor(max_workers=min(config.PAGINATION_WORKERS, len(pages)) or 1,
+                                thread_name_prefix=f"{self.brand_name}-page") as executor:
+            for page, page_links in zip(pages, executor.map(lambda page: self._fetch_list_page(url, page), pages)):
                 all_product_links.extend(page_links)
+                self.publish_links(page_links)
                 self.logger.info(f"在第 {page} 页找到 {len(page_links)} 个产品链接")
-            except Exception as e:
-                self.logger.error(f"处理第 {page} 页时出错: {str(e)}")
 
         self.logger.info(f"类别 {url} 共找到 {len(all_product_links)} 个产品链接")
         return all_product_links
+
+    def _fetch_list_page(self, url, page):
+        """
+        获取类别页面第page页的产品链接
+
+        Args:
+            url: 类别页面URL
+            page: 页码
+
+        Returns:
+            产品链接列表，出错时返回空列表
+        """
+        page_url = f"{url}/{page}.html"
+        self.logger.info(f"处理第 {page} 页: {page_url}")
+        try:
+            return self.get_links_from_page(page_url)
+        except Exception as e:
+            self.logger.error(f"处理第 {page} 页时出错: {str(e)}")
+            return []
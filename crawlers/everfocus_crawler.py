@@ -1,10 +1,5 @@
-import time
 from urllib.parse import urljoin
 
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions as EC
-
 from .base_crawler import BaseCrawler
 
 
@@ -12,6 +7,10 @@ class EverFocusCrawler(BaseCrawler):
     """
     EverFocus网站爬虫，继承自BaseCrawler
     """
+    # 类别页面的链接也需要通过Selenium获取
+    discovery_uses_driver = True
+    # 产品页面的就绪条件
+    page_ready_selector = "div.introBox > div > h1"
 
     def __init__(self, data_dir="data"):
         """
@@ -51,18 +50,15 @@ class EverFocusCrawler(BaseCrawler):
         try:
             # 使用Selenium打开页面
             self.logger.info(f"正在打开页面获取链接: {url}")
-            self.driver.get(url)
-            time.sleep(2)  # 等待页面加载
-
-            # 查找所有div.Img > a元素
-            product_elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
+            # 一次性获取渲染后的页面（等待页面加载完成），查找所有div.Img > a元素
+            product_elements = self.render_page(url, network_idle=True).css(selector)
             self.logger.debug(f"找到 {len(product_elements)} 个产品元素")
 
             for element in product_elements:
-                href = element.get_attribute('href')
+                href = element.attrib.get('href')
                 if href:
                     # 处理相对URL
-                    full_url = urljoin(self.base_url, href)
+                    full_url = urljoin(url, href)
                     links.append(full_url)
                     self.logger.debug(f"添加产品链接: {full_url}")
 
@@ -85,75 +81,73 @@ class EverFocusCrawler(BaseCrawler):
         try:
             # 使用Selenium打开页面
             self.logger.info(f"正在提取产品详情: {url}")
-            self.driver.get(url)
-            time.sleep(2)  # 等待页面加载
-
-            # 获取产品ID（div.introBox > div > h1的text）
-            try:
-                product_id_elem = self.wait.until(EC.presence_of_element_located(
-                    (By.CSS_SELECTOR, 'div.introBox > div > h1')
-                ))
-                product_id = product_id_elem.text.strip()
-                if not product_id:
-                    self.logger.warning(f"产品ID为空 {url}")
-                    product_id = "未知ID"
-            except (TimeoutException, NoSuchElementException) as e:
-                self.logger.warning(f"无法获取产品ID {url}: {str(e)}")
-                product_id = "未知ID"
-
-            # 获取产品名称（div.introBox > div > b的text）
-            try:
-                name_elem = self.driver.find_element(By.CSS_SELECTOR, 'div.introBox > div > b')
-                name = name_elem.text.strip()
-                if not name:
-                    self.logger.warning(f"产品名称为空 {url}")
-                    name = "未知名称"
-            except (TimeoutException, NoSuchElementException) as e:
-                self.logger.warning(f"无法获取产品名称 {url}: {str(e)}")
-                name = "未知名称"
-
-            # 获取规格参数（div > table > tbody > tr）
-            params = []
-            try:
-                spec_rows = self.driver.find_elements(By.CSS_SELECTOR, 'div > table > tbody > tr')
-                self.logger.debug(f"找到 {len(spec_rows)} 行规格参数")
-
-                for row in spec_rows:
-                    # 提取每个单元格的文本
-                    cells = row.find_elements(By.TAG_NAME, 'td')
-                    if len(cells) >= 2:
-                        # 获取第一个单元格的文本内容
-                        param_name = cells[0].text.strip()
-                        # 获取第二个单元格的文本内容
-                        param_value = cells[1].text.strip()
-
-                        # 只保存非空参数
-                        if param_name and param_value:
-                            params.append({
-                                "paramName": param_name,
-                                "param": param_value
-                            })
-                            self.logger.debug(f"提取参数: {param_name} = {param_value}")
-            except Exception as e:
-                self.logger.error(f"提取规格参数时出错 {url}: {str(e)}")
-
-            # 检查是否获取到规格参数
-            if not params:
-                self.logger.warning(f"未提取到任何规格参数 {url}")
-
-            # 准备产品数据
-            product_data = {
-                'product_id': product_id,
-                'product_name': name,
-                'params': params
-            }
-
-            self.logger.info(f"成功提取产品信息: {name} ({product_id})")
-            return product_data
+            self.load_page(url)
+
+            # 一次性获取渲染后的页面，后续解析在本地完成
+            return self.parse_product_page(url, self.page_selector())
         except Exception as e:
             self.logger.error(f"提取产品详情时出错 {url}: {str(e)}")
             return None
 
+    def parse_product_page(self, url, page):
+        """
+        从渲染后的EverFocus产品页面解析产品详情
+
+        Args:
+            url: 产品页面URL
+            page: 页面的Selector对象
+
+        Returns:
+            产品数据字典
+        """
+        # 获取产品ID（div.introBox > div > h1的text）
+        product_id = self.element_text(page.css('div.introBox > div > h1'))
+        if not product_id:
+            self.logger.warning(f"无法获取产品ID {url}")
+            product_id = "未知ID"
+
+        # 获取产品名称（div.introBox > div > b的text）
+        name = self.element_text(page.css('div.introBox > div > b'))
+        if not name:
+            self.logger.warning(f"无法获取产品名称 {url}")
+            name = "未知名称"
+
+        # 获取规格参数（div > table > tbody > tr）
+        params = []
+        spec_rows = page.css('div > table > tbody > tr')
+        self.logger.debug(f"找到 {len(spec_rows)} 行规格参数")
+
+        for row in spec_rows:
+            # 提取每个单元格的文本
+            cells = row.css('td')
+            if len(cells) >= 2:
+                # 获取第一个单元格的文本内容
+                param_name = self.element_text(cells[0])
+                # 获取第二个单元格的文本内容
+                param_value = self.element_text(cells[1])
+
+                # 只保存非空参数
+                if param_name and param_value:
+                    params.append({
+                        "paramName": param_name,
+                        "param": param_value
+                    })
+                    self.logger.debug(f"提取参数: {param_name} = {param_value}")
+
+        # 检查是否获取到规格参数
+        if not params:
+            self.logger.warning(f"未提取到任何规格参数 {url}")
+
+        # 准备产品数据
+        product_data = {
+            'product_id': product_id,
+            'product_name': name,
+            'params': params
+        }
+
+        self.logger.info(f"成功提取产品信息: {name} ({product_id})")
+        return product_data
+
     def process_category_page(self, url):
         """
         处理类别页面
@@ -0,0 +1,113 @@
+import hashlib
+import threading
+from urllib.parse import parse_qsl, quote, unquote, urlencode, urlsplit, urlunsplit
+
+# 不影响页面内容的跟踪参数前缀
+_TRACKING_PREFIXES = ("utm_",)
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def canonicalize_url(url):
+    """
+    把URL规范化，使指向同一页面的不同写法得到相同的结果
+
+    协议和主机名转小写，去掉默认端口、锚点和utm_*跟踪参数，查询参数按名称排序，
+    路径统一百分号编码
+
+    Args:
+        url: 原始URL
+
+    Returns:
+        规范化后的URL
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+
+    path = quote(unquote(parts.path), safe="/:@!$&'()*+,;=-._~") or "/"
+    query = [
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not name.lower().startswith(_TRACKING_PREFIXES)
+    ]
+    query.sort()
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+def dedupe_urls(urls):
+    """
+    按规范化URL去重，保持首次出现的顺序
+
+    Args:
+        urls: URL列表
+
+    Returns:
+        去重后的URL列表（保留首次出现时的原始写法）
+    """
+    seen = set()
+    result = []
+    for url in urls:
+        if not url:
+            continue
+        key = canonicalize_url(url)
+        if key not in seen:
+            seen.add(key)
+            result.append(url)
+    return result
+
+
+class UrlFrontier:
+    """
+    单次运行内已发现链接的集合，按规范化URL的摘要判断是否重复，线程安全
+    """
+
+    def __init__(self):
+        """初始化空集合"""
+        self._digests = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _digest(url):
+        """规范化URL的16字节摘要，比保存完整URL更省内存"""
+        return hashlib.blake2b(canonicalize_url(url).encode("utf-8"), digest_size=16).digest()
+
+    def add(self, url):
+        """
+        加入一个链接
+
+        Returns:
+            链接此前没有出现过时返回True
+        """
+        digest = self._digest(url)
+        with self._lock:
+            if digest in self._digests:
+                return False
+            self._digests.add(digest)
+            return True
+
+    def filter_new(self, urls):
+        """
+        加入一组链接，返回其中此前没有出现过的链接（保持原顺序）
+
+        Args:
+            urls: 链接列表
+
+        Returns:
+            新链接列表
+        """
+        return [url for url in urls if url and self.add(url)]
+
+    def clear(self):
+        """清空集合"""
+        with self._lock:
+            self._digests.clear()
+
+    def __contains__(self, url):
+        digest = self._digest(url)
+        with self._lock:
+            return digest in self._digests
+
+    def __len__(self):
+        with self._lock:
+            return len(self._digests)
@@ -1,14 +1,17 @@
-import requests
 from urllib.parse import urljoin
-from parsel import Selector
 
 from .base_crawler import BaseCrawler
+from .frontier import dedupe_urls
 
 
 class GeoVisionCrawler(BaseCrawler):
     """
     GeoVision网站爬虫，继承自BaseCrawler
     """
+    # 增量模式下用于判断产品是否变化的规格区域
+    fingerprint_selector = "div.textWrapper > h1, p.intro, div.proDetailHtml"
+    # 不使用浏览器，所有页面通过异步抓取引擎并发获取
+    async_fetch = True
 
     def __init__(self, data_dir="data"):
         """
@@ -22,30 +25,13 @@ class GeoVisionCrawler(BaseCrawler):
 
         # 设置基础URL
         self.base_url = "https://www.geovision.com.tw"
+        self.request_timeout = 30
 
         # 设置起始URL
         self.start_urls = ["https://www.geovision.com.tw/products.php?c1=3"]
 
         self.logger.info("GeoVision爬虫初始化完成")
 
-    def get_selector(self, url):
-        """
-        获取页面的Selector对象
-
-        Args:
-            url: 页面URL
-
-        Returns:
-            Selector对象，如果请求失败则返回None
-        """
-        try:
-            response = requests.get(url, timeout=30)
-            response.raise_for_status()  # 如果响应状态码不是200，抛出异常
-            return Selector(text=response.text)
-        except Exception as e:
-            self.logger.error(f"获取页面内容时出错 {url}: {str(e)}")
-            return None
-
     def get_links_from_page(self, url, selector=None):
         """
         获取页面中的链接
@@ -63,15 +49,24 @@ class GeoVisionCrawler(BaseCrawler):
         if not selector:
             return []
 
-        links = []
+        return self._parse_product_links(selector)
 
+    async def aget_links_from_page(self, url, selector=None):
+        """get_links_from_page的协程版本"""
+        if not selector:
+            selector = await self.aget_selector(url)
+
+        if not selector:
+            return []
+
+        return self._parse_product_links(selector)
+
+    def _parse_product_links(self, selector):
+        """从类别页面中解析产品链接"""
         # 获取所有a.box的href属性
         product_links = selector.css('a.box::attr(href)').getall()
-        for link in product_links:
-            full_url = urljoin(self.base_url, link)
-            if full_url not in links:
-                links.append(full_url)
-                self.logger.debug(f"添加产品链接: {full_url}")
+        links = dedupe_urls(urljoin(self.base_url, link) for link in product_links)
+        self.logger.debug(f"添加 {len(links)} 个产品链接")
 
         return links
 
@@ -85,11 +80,30 @@ class GeoVisionCrawler(BaseCrawler):
         Returns:
             产品详情字典，如果提取失败则返回None
         """
-        try:
-            selector = self.get_selector(url)
-            if not selector:
-                return None
+        selector = self.get_selector(url)
+        if not selector:
+            return None
+        return self.parse_product_page(url, selector)
+
+    async def aextract_product_details(self, url):
+        """extract_product_details的协程版本"""
+        selector = await self.aget_selector(url)
+        if not selector:
+            return None
+        return self.parse_product_page(url, selector)
+
+    def parse_product_page(self, url, selector):
+        """
+        从产品页面的Selector解析产品详情
 
+        Args:
+            url: 产品页面URL
+            selector: 页面的Selector对象
+
+        Returns:
+            产品详情字典，如果提取失败则返回None
+        """
+        try:
             # 获取product_id（div.textWrapper > h1的text）
             product_id = selector.css('div.textWrapper > h1::text').get('').strip()
             if not product_id:
@@ -158,3 +172,10 @@ class GeoVisionCrawler(BaseCrawler):
         except Exception as e:
             self.logger.error(f"处理类别页面时出错 {url}: {str(e)}")
             return []
+
+    async def aprocess_category_page(self, url):
+        """process_category_page的协程版本"""
+        self.logger.info(f"处理类别页面: {url}")
+        product_links = await self.aget_links_from_page(url)
+        self.logger.info(f"类别页面 {url} 共找到 {len(product_links)} 个产品链接")
+        return product_links
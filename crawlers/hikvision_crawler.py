@@ -1,16 +1,32 @@
-import time
-from urllib.parse import urljoin
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, urljoin, urlsplit
 
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions as EC
 
+from . import config
 from .base_crawler import BaseCrawler
+from .frontier import dedupe_urls
+from .network_capture import capture_json_responses, drain_performance_log
+from .pagination import api_page_template, links_from_json, page_url_template
 
 
 class HikvisionCrawler(BaseCrawler):
     """
     Hikvision网站爬虫，继承自BaseCrawler
     """
+    # 类别页面的链接也需要通过Selenium获取
+    discovery_uses_driver = True
+    # 产品数量最多，链接发现占用一个会话后仍保留三个会话用于详情提取
+    driver_pool_size = 4
+    # 产品页面的就绪条件
+    page_ready_selector = ".modelName > span"
+    # 翻页时从网络日志中寻找列表接口，找到后直接请求接口获取各页产品
+    capture_network = True
+    list_api_pattern = r"(?i)list|search|page|product"
+    # 列表页中的产品链接
+    product_link_selector = ".btn-details-link"
 
     def __init__(self, data_dir="data"):
         """
@@ -25,97 +41,116 @@ class HikvisionCrawler(BaseCrawler):
         # 设置起始URL
         self.start_urls = ["https://www.hikvision.com/cn/products/front-end-product/"]
 
+        # 推断出的分页地址规则：("query", 参数名)或("suffix", 追加在类别地址后的路径模板)
+        self._page_rule = None
+        # 分页页面能否直接通过HTTP获取（None表示尚未验证），只在并发获取各页之前加锁确定
+        self._pages_over_http = None
+        self._pages_lock = threading.Lock()
+
         self.logger.info(f"HikvisionCrawler初始化完成，基础URL: {self.base_url}")
 
     def extract_product_details(self, url):
         """从产品页面提取产品详情"""
         try:
-            self.driver.get(url)
+            self.open_url(url)
             self.logger.info(f"正在加载产品页面: {url}")
-            time.sleep(2)  # 等待页面加载
-
-            # 获取产品名称和ID
-            name_element = self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, ".modelName > span")))
-            name = name_element.text.strip()
-
-            id_element = self.driver.find_element(By.CSS_SELECTOR, ".model > span")
-            product_id = id_element.text.strip()
+            if not self.wait_until_ready(css=self.page_ready_selector):
+                self.logger.error(f"产品页面加载超时 {url}")
+                return None
 
-            self.logger.info(f"找到产品: {name} (ID: {product_id})")
-
-            # 获取规格参数
-            params = []
-            spec_elements = self.driver.find_elements(By.CSS_SELECTOR, ".tech-specs-accordion-content-desc ul")
-            self.logger.info(f"找到 {len(spec_elements)} 个规格参数区块")
-
-            for ul in spec_elements:
-                li_elements = ul.find_elements(By.TAG_NAME, "li")
-                # 从第二个li元素开始，按照要求
-                for li in li_elements[1:]:
-                    try:
-                        spans = li.find_elements(By.TAG_NAME, "span")
-                        if len(spans) >= 2:
-                            param_name = spans[0].text.strip()
-                            param_value = spans[1].text.strip()
-                            params.append({
-                                "paramName": param_name,
-                                "param": param_value
-                            })
-                    except Exception as e:
-                        self.logger.warning(f"提取参数时出错 {url}: {str(e)}")
-
-            # 准备产品数据
-            product_data = {
-                'product_id': product_id,
-                'product_name': name,
-                'params': params
-            }
-
-            self.logger.info(f"成功提取产品详情，共 {len(params)} 个参数")
-            return product_data
+            # 一次性获取渲染后的页面，后续解析在本地完成
+            return self.parse_product_page(url, self.page_selector())
 
         except Exception as e:
             self.logger.error(f"提取产品详情时出错 {url}: {str(e)}")
             return None
 
-    def get_links_from_page(self, url, selector, mode=True):
-        """重写获取页面链接的方法，处理onclick属性中的链接"""
-        links = []
+    def parse_product_page(self, url, page):
+        """从渲染后的产品页面解析产品详情"""
+        # 获取产品名称和ID
+        name = self.element_text(page.css(".modelName > span"))
+        product_id = self.element_text(page.css(".model > span"))
+
+        self.logger.info(f"找到产品: {name} (ID: {product_id})")
+
+        # 获取规格参数
+        params = []
+        spec_elements = page.css(".tech-specs-accordion-content-desc ul")
+        self.logger.info(f"找到 {len(spec_elements)} 个规格参数区块")
+
+        for ul in spec_elements:
+            li_elements = ul.css("li")
+            # 从第二个li元素开始，按照要求
+            for li in li_elements[1:]:
+                spans = li.css("span")
+                if len(spans) >= 2:
+                    param_name = self.element_text(spans[0])
+                    param_value = self.element_text(spans[1])
+                    params.append({
+                        "paramName": param_name,
+                        "param": param_value
+                    })
+
+        # 准备产品数据
+        product_data = {
+            'product_id': product_id,
+            'product_name': name,
+            'params': params
+        }
+
+        self.logger.info(f"成功提取产品详情，共 {len(params)} 个参数")
+        return product_data
+
+    def get_links_from_page(self, url, selector, *, use_current_page=False):
+        """
+        重写获取页面链接的方法，处理onclick属性中的链接
+
+        Args:
+            url: 页面URL
+            selector: 链接元素的CSS选择器
+            use_current_page: 直接解析浏览器中当前显示的页面（如点击翻页后），不重新加载url
+        """
         try:
-            if mode:
-                self.driver.get(url)
+            # 一次性获取渲染后的页面，相对链接以页面地址为基准解析
+            if use_current_page:
+                page_url = self.driver.current_url
+                page = self.page_selector()
+            else:
                 self.logger.info(f"正在加载页面: {url}")
-                time.sleep(2)  # 等待页面加载
-
-            elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-            self.logger.info(f"找到 {len(elements)} 个潜在链接元素")
-
-            for element in elements:
-                href = element.get_attribute('href')
-                if href:
-                    # 处理相对URL
-                    if not href.startswith(('http://', 'https://')):
-                        href = urljoin(self.base_url, href)
-                    links.append(href)
-                else:
-                    # 如果href为空，尝试获取onclick属性
-                    onclick = element.get_attribute('onclick')
-                    if onclick and "window.location" in onclick:
-                        # 从onclick属性中提取URL
-                        try:
-                            url_in_onclick = onclick.split("'")[1]
-                            if not url_in_onclick.startswith(('http://', 'https://')):
-                                url_in_onclick = urljoin(self.base_url, url_in_onclick)
-                            links.append(url_in_onclick)
-                        except:
-                            pass
-
-            self.logger.info(f"成功提取 {len(links)} 个链接")
-            return links
+                page_url = url
+                page = self.render_page(url, network_idle=True)  # 等待列表加载完成
+            return self._parse_links(page, page_url, selector)
         except Exception as e:
             self.logger.error(f"获取链接时出错 {url}: {str(e)}")
             return []
 
+    def _parse_links(self, page, page_url, selector):
+        """从页面的Selector中解析链接，处理onclick属性中的链接"""
+        links = []
+        elements = page.css(selector)
+        self.logger.info(f"找到 {len(elements)} 个潜在链接元素")
+
+        for element in elements:
+            href = element.attrib.get('href')
+            if href:
+                # 处理相对URL
+                links.append(urljoin(page_url, href))
+            else:
+                # 如果href为空，尝试获取onclick属性
+                onclick = element.attrib.get('onclick')
+                if onclick and "window.location" in onclick:
+                    # 从onclick属性中提取URL
+                    try:
+                        url_in_onclick = onclick.split("'")[1]
+                        if not url_in_onclick.startswith(('http://', 'https://')):
+                            url_in_onclick = urljoin(self.base_url, url_in_onclick)
+                        links.append(url_in_onclick)
+                    except:
+                        pass
+
+        self.logger.info(f"成功提取 {len(links)} 个链接")
+        return links
+
     def process_category_page(self, url):
         """处理类别页面，包括分页处理"""
         # 如果是主页，需要先获取所有类别链接，然后获取子类别链接
@@ -128,6 +163,8 @@ class HikvisionCrawler(BaseCrawler):
                 sub_links = self.get_links_from_page(link, ".tile-card")
                 subcategory_links.extend(sub_links)
                 self.logger.info(f"从 {link} 找到 {len(sub_links)} 个子类别链接")
+            # 同一子类别可能出现在多个类别下，只处理一次
+            subcategory_links = dedupe_urls(subcategory_links)
 
             self.logger.info(f"子类别链接总数: {len(subcategory_links)}")
 
@@ -136,6 +173,7 @@ class HikvisionCrawler(BaseCrawler):
             for sub_link in subcategory_links:
                 product_links = self.process_product_page_with_pagination(sub_link)
                 all_product_links.extend(product_links)
+                self.publish_links(product_links)
 
             return all_product_links
         else:
@@ -147,39 +185,26 @@ class HikvisionCrawler(BaseCrawler):
         product_links = []
 
         # 处理第一页
-        page_product_links = self.get_links_from_page(url, ".btn-details-link")
+        try:
+            self.logger.info(f"正在加载页面: {url}")
+            page = self.render_page(url, network_idle=True)  # 等待列表加载完成
+        except Exception as e:
+            self.logger.error(f"获取链接时出错 {url}: {str(e)}")
+            return product_links
+        page_product_links = self._parse_links(page, url, self.product_link_selector)
         product_links.extend(page_product_links)
         self.logger.info(f"第1页找到 {len(page_product_links)} 个产品链接")
 
-        # 检查分页
+        # 检查分页（分页信息直接从已渲染的第一页中读取）
         try:
-            self.driver.get(url)
-            pagination_elements = self.driver.find_elements(By.CSS_SELECTOR, ".paginationjs-pages > ul > li")
-            self.logger.info(f"找到 {len(pagination_elements)} 个分页元素")
+            pagination_items = page.css(".paginationjs-pages > ul > li")
+            self.logger.info(f"找到 {len(pagination_items)} 个分页元素")
 
             # 如果有分页并且元素数量大于3（排除上一页、当前页和下一页）
-            if len(pagination_elements) > 3:
-                page_num = int(pagination_elements[-2].get_attribute("data-num"))
+            if len(pagination_items) > 3:
+                page_num = int(pagination_items[-2].attrib.get("data-num"))
                 self.logger.info(f"总共有 {page_num} 页需要处理")
-
-                for page_idx in range(2, page_num + 1):
-                    try:
-                        # 找到并点击分页元素
-                        pagination_elements = self.driver.find_elements(By.CSS_SELECTOR,
-                                                                        ".paginationjs-pages > ul > li")
-                        page_element = pagination_elements[-1]
-                        self.logger.info(f"点击下一页按钮，处理第 {page_idx} 页")
-                        page_element.click()
-                        time.sleep(3)  # 点击后等待页面加载
-
-                        # 获取新页面中的产品链接
-                        page_product_links = self.get_links_from_page(self.driver.current_url, ".btn-details-link",
-                                                                      False)
-                        product_links.extend(page_product_links)
-                        self.logger.info(f"第 {page_idx} 页找到 {len(page_product_links)} 个产品链接")
-
-                    except Exception as e:
-                        self.logger.error(f"处理分页 {page_idx} 时出错 {url}: {str(e)}")
+                product_links.extend(self._fetch_remaining_pages(url, page_product_links, page_num))
             else:
                 self.logger.info("没有找到分页元素或只有一页")
 
@@ -188,3 +213,263 @@ class HikvisionCrawler(BaseCrawler):
 
         self.logger.info(f"该类别页面共找到 {len(product_links)} 个产品链接")
         return product_links
+
+    @staticmethod
+    def _pages_key(url):
+        """类别页面第2页起的产品链接在磁盘缓存中的键"""
+        return f"pages:{url}"
+
+    def _fetch_remaining_pages(self, url, first_links, page_num):
+        """
+        获取第2页到最后一页的产品链接，结果写入磁盘缓存
+
+        分页规则要在浏览器中点击翻页才能推断，离线重放模式下不访问网络，改为使用上次在线运行时缓存的链接
+
+        Args:
+            url: 类别页面URL
+            first_links: 第一页的产品链接，用于校验推断出的规则
+            page_num: 总页数
+
+        Returns:
+            第2页起的产品链接列表（按页码顺序）
+        """
+        if self.offline:
+            entry = self.cache.lookup(self._pages_key(url))
+            if entry is None:
+                self.logger.warning(f"离线模式下缓存中没有第2页到第{page_num}页的产品链接，只使用第1页: {url}")
+                return []
+            links = json.loads(entry["body"].decode("utf-8"))
+            self.logger.info(f"离线模式：从缓存读取第2页到第{page_num}页的 {len(links)} 个产品链接")
+            return links
+
+        links = self._collect_remaining_pages(url, first_links, page_num)
+        if links and self.cache is not None:
+            self.cache.store(self._pages_key(url), json.dumps(links, ensure_ascii=False).encode("utf-8"),
+                             encoding="utf-8")
+        return links
+
+    def _collect_remaining_pages(self, url, first_links, page_num):
+        """
+        在线获取第2页到最后一页的产品链接
+
+        优先按推断出的地址规则或列表接口直接并发获取各页，都无法使用时才逐页点击翻页
+        """
+        # 已经推断出地址规则时直接拼出第2页地址，校验通过后就不需要点击
+        template = self._apply_page_rule(url)
+        if template:
+            page2_links = self._probe_page_url(template.format(page=2), first_links)
+            if page2_links:
+                self.logger.info(f"按已推断的分页规则直接获取各页: {template}")
+                return page2_links + self._fetch_pages_concurrently(
+                    lambda page: self._fetch_page_url(template.format(page=page), first_links),
+                    range(3, page_num + 1))
+
+        template, api_template, page2_links = self._detect_page_scheme(url)
+        if page2_links is None:
+            return self._walk_pages_by_clicking(url, 2, page_num)
+        self.logger.info(f"第 2 页找到 {len(page2_links)} 个产品链接")
+
+        if template:
+            if self._probe_page_url(template.format(page=2), first_links, page2_links):
+                self.logger.info(f"推断出分页地址规则，直接获取其余各页: {template}")
+                return page2_links + self._fetch_pages_concurrently(
+                    lambda page: self._fetch_page_url(template.format(page=page), first_links),
+                    range(3, page_num + 1))
+            # 直接打开推断出的地址得不到第2页，放弃该规则；校验时当前会话可能已离开第2页，从头点击
+            self._page_rule = None
+            self.logger.info("推断出的分页地址无法直接打开，改为逐页点击")
+            return self._walk_pages_by_clicking(url, 2, page_num)
+        if api_template:
+            self.logger.info(f"发现分页列表接口，直接请求其余各页: {api_template}")
+            return page2_links + self._fetch_pages_concurrently(
+                lambda page: self._fetch_page_api(api_template.format(page=page), url), range(3, page_num + 1))
+
+        self.logger.info("无法推断分页规则，继续逐页点击")
+        return page2_links + self._walk_pages_by_clicking(url, 3, page_num)
+
+    def _apply_page_rule(self, url):
+        """按已推断的分页规则生成该类别的分页地址模板，尚未推断出规则时返回None"""
+        if not self._page_rule:
+            return None
+        kind, value = self._page_rule
+        escaped = url.replace("{", "{{").replace("}", "}}")
+        if kind == "query":
+            separator = "&" if "?" in url.split("#", 1)[0] else "?"
+            return escaped.split("#", 1)[0] + f"{separator}{value}={{page}}"
+        return escaped + value
+
+    def _learn_page_rule(self, url, template):
+        """把某个类别的分页地址模板归纳为可用于其他类别的规则"""
+        for name, value in parse_qsl(urlsplit(template).query):
+            if value == "{page}":
+                self._page_rule = ("query", name)
+                return
+        escaped_url = url.replace("{", "{{").replace("}", "}}")
+        if template.startswith(escaped_url) and "#" not in template:
+            self._page_rule = ("suffix", template[len(escaped_url):])
+
+    def _detect_page_scheme(self, url):
+        """
+        在浏览器中点击一次下一页，推断分页的地址规则或列表接口
+
+        Returns:
+            (地址模板, 接口模板, 第2页的产品链接)，点击失败时第2页的产品链接为None
+        """
+        try:
+            if not self.is_loaded(url):
+                self.load_page(url, network_idle=True)
+            drain_performance_log(self.driver)
+            first_url = self.driver.current_url
+
+            self.logger.info("点击下一页按钮，推断分页规则")
+            self.driver.find_elements(By.CSS_SELECTOR, ".paginationjs-pages > ul > li")[-1].click()
+            self.wait_until_ready(network_idle=True)  # 点击后等待列表刷新
+
+            page_url = self.driver.current_url
+            page2_links = self._parse_links(self.page_selector(), page_url, self.product_link_selector)
+        except Exception as e:
+            self.logger.error(f"点击分页推断规则时出错 {url}: {str(e)}")
+            return None, None, None
+
+        template = page_url_template(first_url, page_url, 2)
+        if template:
+            self._learn_page_rule(first_url, template)
+            return template, None, page2_links
+
+        # 地址没有变化，从网络日志中寻找返回第2页数据的列表接口
+        try:
+            responses = capture_json_responses(self.driver, self.list_api_pattern)
+        except Exception as e:
+            self.logger.debug(f"读取浏览器网络日志失败: {str(e)}")
+            responses = []
+        for api_url, payload in responses:
+            api_template = api_page_template(api_url, 2)
+            api_links = links_from_json(payload, url)
+            # 接口返回的链接需要覆盖页面上第2页的大部分产品
+            if api_template and api_links and len(set(api_links) & set(page2_links)) >= len(page2_links) / 2:
+                return None, api_template, page2_links
+        return None, None, page2_links
+
+    @staticmethod
+    def _valid_page_links(links, first_links, expected_links=None):
+        """
+        校验获取到的分页链接：不能为空，不能与第一页相同，提供了expected_links时需要覆盖其中大部分
+        """
+        if not links or links == first_links:
+            return False
+        return expected_links is None or len(set(links) & set(expected_links)) >= len(expected_links) / 2
+
+    def _http_page_links(self, page_url):
+        """通过HTTP获取分页地址中的产品链接，失败时返回空列表"""
+        page = self.get_selector(page_url)
+        return self._parse_links(page, page_url, self.product_link_selector) if page else []
+
+    def _probe_page_url(self, page_url, first_links, expected_links=None):
+        """
+        在并发获取其余各页之前获取第2页，第一次调用时确定分页能否通过HTTP获取
+
+        Args:
+            page_url: 第2页的地址
+            first_links: 第一页的产品链接
+            expected_links: 浏览器中第2页的产品链接，提供时用于校验获取的结果
+
+        Returns:
+            第2页的产品链接列表，校验不通过时返回空列表
+        """
+        with self._pages_lock:
+            # 只有锚点不同的地址通过HTTP获取到的总是第一页，不能用来判断
+            if self._pages_over_http is None and "#" not in page_url:
+                self._pages_over_http = self._valid_page_links(self._http_page_links(page_url),
+                                                               first_links, expected_links)
+                self.logger.info(f"分页页面{'可以' if self._pages_over_http else '不能'}直接通过HTTP获取")
+        return self._fetch_page_url(page_url, first_links, expected_links)
+
+    def _fetch_page_url(self, page_url, first_links, expected_links=None):
+        """
+        获取一个分页地址中的产品链接，能通过HTTP获取时优先使用HTTP，结果校验不通过时改用浏览器会话池渲染该页
+
+        Args:
+            page_url: 分页地址
+            first_links: 第一页的产品链接，用于校验获取到的确实是另一页
+            expected_links: 浏览器中第2页的产品链接，提供时用于校验获取的结果
+
+        Returns:
+            产品链接列表，校验不通过时返回空列表
+        """
+        if self._pages_over_http and "#" not in page_url:
+            links = self._http_page_links(page_url)
+            if self._valid_page_links(links, first_links, expected_links):
+                return links
+            self.logger.info(f"通过HTTP获取的分页内容无效，改用浏览器: {page_url}")
+
+        with self.driver_session():
+            page = self.render_page(page_url, network_idle=True)
+            links = self._parse_links(page, page_url, self.product_link_selector)
+        return links if self._valid_page_links(links, first_links, expected_links) else []
+
+    def _fetch_page_api(self, api_url, url):
+        """直接请求分页列表接口，返回其中的产品链接"""
+        response = self.http.get(api_url, timeout=self.request_timeout, headers={
+            "Accept": "application/json, text/plain, */*",
+            "X-Requested-With": "XMLHttpRequest",
+            "Referer": url,
+        })
+        response.raise_for_status()
+        return links_from_json(response.json(), url)
+
+    def _fetch_pages_concurrently(self, fetch, pages):
+        """
+        并发获取多个分页的产品链接，结果按页码顺序合并
+
+        Args:
+            fetch: 接收页码、返回产品链接列表的函数
+            pages: 页码序列
+
+        Returns:
+            产品链接列表
+        """
+        pages = list(pages)
+        if not pages:
+            return []
+
+        def fetch_page(page):
+            try:
+                return fetch(page)
+            except Exception as e:
+                self.logger.error(f"处理分页 {page} 时出错: {str(e)}")
+                return []
+
+        # 归还链接发现占用的会话，供各分页的渲染使用
+        self.release_driver()
+        product_links = []
+        with ThreadPoolExecutor(max_workers=min(config.PAGINATION_WORKERS, len(pages)),
+                                thread_name_prefix=f"{self.brand_name}-page") as executor:
+            for page, page_links in zip(pages, executor.map(fetch_page, pages)):
+                self.logger.info(f"第 {page} 页找到 {len(page_links)} 个产品链接")
+                product_links.extend(page_links)
+        return product_links
+
+    def _walk_pages_by_clicking(self, url, start_page, page_num):
+        """在浏览器中从start_page开始逐页点击下一页获取产品链接（无法推断分页规则时使用）"""
+        product_links = []
+        if start_page == 2:
+            self.load_page(url, network_idle=True)
+
+        for page_idx in range(start_page, page_num + 1):
+            try:
+                # 找到并点击分页元素
+                pagination_elements = self.driver.find_elements(By.CSS_SELECTOR, ".paginationjs-pages > ul > li")
+                page_element = pagination_elements[-1]
+                self.logger.info(f"点击下一页按钮，处理第 {page_idx} 页")
+                page_element.click()
+                self.wait_until_ready(network_idle=True)  # 点击后等待列表刷新
+
+                # 获取新页面中的产品链接
+                page_product_links = self.get_links_from_page(self.driver.current_url, self.product_link_selector,
+                                                              use_current_page=True)
+                product_links.extend(page_product_links)
+                self.logger.info(f"第 {page_idx} 页找到 {len(page_product_links)} 个产品链接")
+
+            except Exception as e:
+                self.logger.error(f"处理分页 {page_idx} 时出错 {url}: {str(e)}")
+        return product_links
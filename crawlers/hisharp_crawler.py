@@ -1,11 +1,8 @@
-import time
 from urllib.parse import urljoin
 
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-import requests
-from parsel import Selector
 
 from .base_crawler import BaseCrawler
 
@@ -14,6 +11,9 @@ class HisharpCrawler(BaseCrawler):
     """
     Hisharp网站爬虫，继承自BaseCrawler
     """
+    # 页面和规格参数的就绪条件
+    page_ready_selector = "h1 > span.en"
+    spec_ready_selector = "tbody > tr"
 
     def __init__(self, data_dir="data"):
         """
@@ -24,6 +24,7 @@ class HisharpCrawler(BaseCrawler):
 
         # 设置Hisharp特定的属性
         self.base_url = "https://www.hisharp.com"
+        self.request_timeout = 20
 
         # 设置起始URL列表
         self.start_urls = [
@@ -32,38 +33,20 @@ class HisharpCrawler(BaseCrawler):
             "https://www.hisharp.com/zh-tw/product.php?act=list&cid=88&lang_id=1&page=2"
         ]
 
-    def get_selector(self, url):
-        """
-        使用requests获取页面的Selector对象
-
-        Args:
-            url: 要获取的页面URL
-
-        Returns:
-            Selector对象，失败则返回None
-        """
-        try:
-            response = requests.get(url, timeout=20)
-            response.raise_for_status()
-            self.logger.info(f"成功获取页面: {url}")
-            return Selector(text=response.text)
-        except Exception as e:
-            self.logger.error(f"获取页面内容时出错 {url}: {str(e)}")
-            return None
-
     def get_links_from_page(self, url, selector=None):
         """
         从页面获取所有.pic-box的href属性
 
         Args:
             url: 要获取链接的页面URL
-            selector: CSS选择器（可选）
+            selector: 页面的Selector对象，如果为None则重新获取
 
         Returns:
             产品链接列表
         """
         links = []
-        selector = self.get_selector(url)
+        if not selector:
+            selector = self.get_selector(url)
         if not selector:
             self.logger.warning(f"无法获取页面选择器: {url}")
             return links
@@ -92,80 +75,77 @@ class HisharpCrawler(BaseCrawler):
         """
         try:
             self.logger.info(f"开始提取产品详情: {url}")
-            self.driver.get(url)
-            time.sleep(2)  # 等待页面加载
-
-            # 获取产品ID (h1 > span.en的text)
-            try:
-                product_id_elem = self.wait.until(EC.presence_of_element_located(
-                    (By.CSS_SELECTOR, 'h1 > span.en')
-                ))
-                product_id = product_id_elem.text.strip()
-                if not product_id:
-                    self.logger.warning(f"无法获取产品ID {url}")
-                    return None
-            except (TimeoutException, NoSuchElementException) as e:
-                self.logger.error(f"无法获取产品ID {url}: {str(e)}")
+            if not self.load_page(url):
+                self.logger.error(f"无法获取产品ID {url}: 页面加载超时")
                 return None
 
-            # 获取产品名称 (h1 > span.ch的text)
-            try:
-                product_name_elem = self.driver.find_element(By.CSS_SELECTOR, 'h1 > span.ch')
-                product_name = product_name_elem.text.strip()
-                if not product_name:
-                    product_name = "未知名称"
-            except NoSuchElementException as e:
-                self.logger.error(f"无法获取产品名称 {url}: {str(e)}")
-                product_name = "未知名称"
-
             # 点击"產品規格"按钮
             try:
                 spec_button = self.wait.until(EC.element_to_be_clickable(
                     (By.CSS_SELECTOR, 'a[title="產品規格"]')
                 ))
                 spec_button.click()
-                time.sleep(1.5)  # 等待规格内容加载
+                self.wait_until_ready(css=self.spec_ready_selector, network_idle=True)  # 等待规格内容加载
             except (TimeoutException, NoSuchElementException) as e:
                 self.logger.warning(f"无法点击产品规格按钮 {url}: {str(e)}")
                 try:
                     spec_button = self.driver.find_element(By.CSS_SELECTOR, 'a[title="產品規格"]')
                     self.driver.execute_script("arguments[0].click();", spec_button)
-                    time.sleep(1.5)
+                    self.wait_until_ready(css=self.spec_ready_selector, network_idle=True)
                 except Exception as js_e:
                     print(f"JavaScript点击產品規格按钮失败 {url}: {str(js_e)}")
 
-            # 获取参数表格
-            params = []
-            try:
-                table_rows = self.driver.find_elements(By.CSS_SELECTOR, 'tbody > tr')
-                for row in table_rows:
-                    cells = row.find_elements(By.TAG_NAME, 'td')
-                    if len(cells) >= 2:
-                        param_name = cells[0].text.strip()
-                        param_value = cells[1].text.strip()
-
-                        if param_name:
-                            params.append({
-                                "paramName": param_name,
-                                "param": param_value
-                            })
-            except Exception as e:
-                self.logger.warning(f"获取参数表格时出错 {url}: {str(e)}")
-
-            # 构建产品数据
-            product_data = {
-                'product_id': product_id,
-                'product_name': product_name,
-                'params': params
-            }
-
-            self.logger.info(f"成功提取产品详情: {product_id}")
-            return product_data
+            # 一次性获取渲染后的页面，后续解析在本地完成
+            return self.parse_product_page(url, self.page_selector())
 
         except Exception as e:
             self.logger.error(f"提取产品详情时出错 {url}: {str(e)}")
             return None
 
+    def parse_product_page(self, url, page):
+        """
+        从渲染后的Hisharp产品页面解析产品详情
+
+        Args:
+            url: 产品页面URL
+            page: 页面的Selector对象
+
+        Returns:
+            产品数据字典或None（如果解析失败）
+        """
+        # 获取产品ID (h1 > span.en的text)
+        product_id = self.element_text(page.css('h1 > span.en'))
+        if not product_id:
+            self.logger.warning(f"无法获取产品ID {url}")
+            return None
+
+        # 获取产品名称 (h1 > span.ch的text)
+        product_name = self.element_text(page.css('h1 > span.ch')) or "未知名称"
+
+        # 获取参数表格
+        params = []
+        for row in page.css('tbody > tr'):
+            cells = row.css('td')
+            if len(cells) >= 2:
+                param_name = self.element_text(cells[0])
+                param_value = self.element_text(cells[1])
+
+                if param_name:
+                    params.append({
+                        "paramName": param_name,
+                        "param": param_value
+                    })
+
+        # 构建产品数据
+        product_data = {
+            'product_id': product_id,
+            'product_name': product_name,
+            'params': params
+        }
+
+        self.logger.info(f"成功提取产品详情: {product_id}")
+        return product_data
+
     def process_category_page(self, url):
         """
         处理分类页面，获取所有产品链接
@@ -0,0 +1,161 @@
+# 表格展开工具只依赖lxml，不依赖爬虫基类，目前只有crawl_cn_purchase.py使用。
+# 放在crawlers包中是为了与frontier、pagination等其他解析工具一起维护和测试，以后其他爬虫也可以直接复用；
+# 与BaseCrawler.element_text（parsel Selector的文本）不同，这里处理的是lxml元素，因此命名为lxml_text
+from collections import namedtuple
+
+# 文本不计入单元格内容的标签
+_SKIP_TAGS = {"script", "style"}
+# rowspan/colspan的上限，防止异常属性值生成巨大的网格
+_MAX_SPAN = 1000
+
+# 展开后的表格行：各列文本、是否位于thead中、是否包含th单元格
+TableRow = namedtuple("TableRow", ["cells", "in_thead", "has_th"])
+
+
+def _collect_text(element, parts):
+    """按文档顺序收集元素下的文本，跳过script/style及注释的内容"""
+    if element.text:
+        parts.append(element.text)
+    for child in element:
+        if isinstance(child.tag, str) and child.tag.lower() not in _SKIP_TAGS:
+            _collect_text(child, parts)
+        if child.tail:
+            parts.append(child.tail)
+
+
+def lxml_text(element):
+    """
+    获取lxml元素的文本（不含script/style中的内容），一次遍历完成
+
+    Args:
+        element: lxml元素
+
+    Returns:
+        去掉首尾空白的文本
+    """
+    parts = []
+    _collect_text(element, parts)
+    return "".join(parts).strip()
+
+
+def _span(cell, name):
+    """读取单元格的rowspan/colspan，无效值按1处理"""
+    try:
+        return min(max(int(cell.get(name, 1)), 1), _MAX_SPAN)
+    except (TypeError, ValueError):
+        return 1
+
+
+def table_grid(table):
+    """
+    把表格展开成二维文本网格，rowspan/colspan覆盖的每个位置都填入原单元格的文本
+
+    每个单元格的文本只计算一次，所有行补齐到相同的列数
+
+    Args:
+        table: table元素（lxml）
+
+    Returns:
+        TableRow列表
+    """
+    rows = []
+    # 被上方单元格的rowspan占用的列：列号 -> [剩余行数, 文本]
+    pending = {}
+
+    def take_pending(col, row):
+        remaining, text = pending[col]
+        row.append(text)
+        if remaining > 1:
+            pending[col][0] = remaining - 1
+        else:
+            del pending[col]
+
+    for tr in table.iter("tr"):
+        row = []
+        has_th = False
+        for cell in tr:
+            if not isinstance(cell.tag, str) or cell.tag.lower() not in ("td", "th"):
+                continue
+            has_th = has_th or cell.tag.lower() == "th"
+            while len(row) in pending:
+                take_pending(len(row), row)
+
+            text = lxml_text(cell)
+            rowspan, colspan = _span(cell, "rowspan"), _span(cell, "colspan")
+            for _ in range(colspan):
+                if rowspan > 1:
+                    pending[len(row)] = [rowspan - 1, text]
+                row.append(text)
+
+        # 行尾仍被rowspan占用的列
+        while pending and len(row) <= max(pending):
+            if len(row) in pending:
+                take_pending(len(row), row)
+            else:
+                row.append("")
+
+        parent = tr.getparent()
+        in_thead = parent is not None and isinstance(parent.tag, str) and parent.tag.lower() == "thead"
+        rows.append(TableRow(row, in_thead, has_th))
+
+    width = max((len(row.cells) for row in rows), default=0)
+    for row in rows:
+        row.cells.extend([""] * (width - len(row.cells)))
+    return rows
+
+
+def extract_table(table):
+    """
+    识别表格的表头行，返回表头和表头之后的数据行
+
+    有thead时以thead的最后一行为表头，否则以第一个包含th或有文本的行为表头
+
+    Args:
+        table: table元素（lxml）
+
+    Returns:
+        (表头列表, 数据行列表)，数据行与表头按列对齐；表格为空时返回([], [])
+    """
+    grid = table_grid(table)
+    thead_rows = [i for i, row in enumerate(grid) if row.in_thead]
+    if thead_rows:
+        header_index = thead_rows[-1]
+    else:
+        header_index = next((i for i, row in enumerate(grid) if row.has_th or any(row.cells)), None)
+    if header_index is None:
+        return [], []
+
+    headers = grid[header_index].cells
+    rows = [row.cells for row in grid[header_index + 1:] if not row.in_thead]
+    return headers, rows
+
+
+def table_records(table, keyword=None):
+    """
+    把表格转换为“表头 -> 单元格文本”的记录
+
+    Args:
+        table: table元素（lxml）
+        keyword: 只保留任一单元格包含该关键词的行，None表示保留所有行
+
+    Returns:
+        记录字典列表，只包含表头和单元格都不为空的列，同名表头的内容以空格连接
+    """
+    headers, rows = extract_table(table)
+    records = []
+    for cells in rows:
+        if keyword and not any(keyword in cell for cell in cells):
+            continue
+        record = {}
+        for header, cell in zip(headers, cells):
+            if not header or not cell:
+                continue
+            # 表头跨多列时把各列的不同内容合并到同一个键下
+            if header in record:
+                if cell != record[header]:
+                    record[header] = f"{record[header]} {cell}"
+            else:
+                record[header] = cell
+        if record:
+            records.append(record)
+    return records
@@ -0,0 +1,200 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from . import config
+
+
+class CacheMissError(Exception):
+    """离线模式下请求的URL不在缓存中"""
+
+
+class ResponseCache:
+    """
+    磁盘响应缓存
+
+    响应体按内容哈希压缩存储（相同内容只存一份），URL元数据记录对应的内容哈希和
+    ETag/Last-Modified，过期后通过条件请求重新验证。超过容量上限时按最近访问时间淘汰。
+    """
+
+    def __init__(self, cache_dir=None, ttl=None, max_bytes=None, offline=None):
+        """
+        初始化响应缓存
+
+        Args:
+            cache_dir: 缓存目录，默认取配置
+            ttl: 缓存在多少秒内无需重新验证，默认取配置
+            max_bytes: 缓存响应体的总大小上限（字节），默认取配置
+            offline: 是否为离线重放模式（只读缓存，从不访问网络），默认取配置
+        """
+        self.cache_dir = cache_dir or config.HTTP_CACHE_DIR
+        self.ttl = config.HTTP_CACHE_TTL if ttl is None else ttl
+        self.max_bytes = max_bytes or config.HTTP_CACHE_MAX_BYTES
+        self.offline = config.HTTP_CACHE_OFFLINE if offline is None else offline
+
+        self._meta_dir = os.path.join(self.cache_dir, "meta")
+        self._body_dir = os.path.join(self.cache_dir, "bodies")
+        os.makedirs(self._meta_dir, exist_ok=True)
+        os.makedirs(self._body_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._size = self._scan_size()
+
+    @staticmethod
+    def _hash(data):
+        return hashlib.sha256(data).hexdigest()
+
+    def _meta_path(self, key):
+        return os.path.join(self._meta_dir, f"{self._hash(key.encode('utf-8'))}.json")
+
+    def _body_path(self, digest):
+        return os.path.join(self._body_dir, digest[:2], f"{digest}.gz")
+
+    def _scan_size(self):
+        """统计当前缓存响应体的总大小"""
+        total = 0
+        for root, _, files in os.walk(self._body_dir):
+            for name in files:
+                try:
+                    total += os.path.getsize(os.path.join(root, name))
+                except OSError:
+                    pass
+        return total
+
+    @staticmethod
+    def _write_atomic(path, data):
+        """先写临时文件再替换，避免并发读到写了一半的文件"""
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def lookup(self, key):
+        """
+        查找缓存条目
+
+        Args:
+            key: 缓存键（通常是URL）
+
+        Returns:
+            包含元数据和响应体(body)的字典，不存在或已被淘汰时返回None
+        """
+        try:
+            with open(self._meta_path(key), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            body_path = self._body_path(entry["digest"])
+            with gzip.open(body_path, "rb") as f:
+                entry["body"] = f.read()
+            # 更新访问时间，供淘汰时参考
+            os.utime(body_path, None)
+            return entry
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def is_fresh(self, entry):
+        """缓存条目是否仍在有效期内"""
+        return time.time() - entry.get("stored_at", 0) < self.ttl
+
+    @staticmethod
+    def conditional_headers(entry):
+        """根据缓存条目生成条件请求头"""
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, key, body, headers=None, encoding=None):
+        """
+        写入缓存
+
+        Args:
+            key: 缓存键（通常是URL）
+            body: 响应体字节
+            headers: 响应头，用于记录ETag/Last-Modified/Content-Type
+            encoding: 响应文本编码
+
+        Returns:
+            写入的缓存条目（不含响应体）
+        """
+        headers = headers or {}
+        digest = self._hash(body)
+        body_path = self._body_path(digest)
+        if not os.path.exists(body_path):
+            os.makedirs(os.path.dirname(body_path), exist_ok=True)
+            compressed = gzip.compress(body)
+            self._write_atomic(body_path, compressed)
+            with self._lock:
+                self._size += len(compressed)
+
+        entry = {
+            "key": key,
+            "digest": digest,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "content_type": headers.get("Content-Type"),
+            "encoding": encoding,
+            "stored_at": time.time(),
+        }
+        self._write_atomic(self._meta_path(key), json.dumps(entry, ensure_ascii=False).encode("utf-8"))
+
+        if self._size > self.max_bytes:
+            self.evict()
+        return entry
+
+    def refresh(self, key, entry):
+        """重新验证通过（304）后刷新缓存条目的存储时间"""
+        entry = {k: v for k, v in entry.items() if k != "body"}
+        entry["stored_at"] = time.time()
+        self._write_atomic(self._meta_path(key), json.dumps(entry, ensure_ascii=False).encode("utf-8"))
+
+    def evict(self):
+        """按最近访问时间淘汰响应体，直到总大小降到上限的90%以下"""
+        with self._lock:
+            bodies = []
+            for root, _, files in os.walk(self._body_dir):
+                for name in files:
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    bodies.append((stat.st_mtime, stat.st_size, path))
+
+            total = sum(size for _, size, _ in bodies)
+            target = self.max_bytes * 0.9
+            for _, size, path in sorted(bodies):
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    pass
+            # 元数据指向的响应体被淘汰后，lookup会按未命中处理
+            self._size = total
+
+    @staticmethod
+    def to_response(url, entry):
+        """将缓存条目还原为requests.Response对象"""
+        response = requests.Response()
+        response._content = entry["body"]
+        response.status_code = 200
+        response.url = url
+        response.encoding = entry.get("encoding")
+        response.headers = CaseInsensitiveDict({
+            k: v for k, v in (
+                ("Content-Type", entry.get("content_type")),
+                ("ETag", entry.get("etag")),
+                ("Last-Modified", entry.get("last_modified")),
+                ("X-From-Cache", "1"),
+            ) if v
+        })
+        return response
@@ -0,0 +1,140 @@
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from . import config
+from .http_cache import CacheMissError
+from .scheduler import get_scheduler
+
+
+class HttpClient:
+    """
+    按主机复用连接的HTTP客户端，每个主机对应一个保持长连接的Session，
+    所有请求都经过按主机的调度器限速
+    """
+
+    def __init__(self, pool_connections=None, pool_maxsize=None, timeout=None, max_retries=None, cache=None,
+                 scheduler=None):
+        """
+        初始化HTTP客户端
+
+        Args:
+            pool_connections: 每个Session缓存的连接池数量，默认取配置
+            pool_maxsize: 每个主机连接池的最大连接数，默认取配置
+            timeout: 默认请求超时时间（秒），默认取配置
+            max_retries: 建立连接失败时的重试次数，默认取配置
+            cache: ResponseCache对象，None表示不使用磁盘缓存
+            scheduler: HostScheduler对象，默认使用进程内共享的调度器
+        """
+        self.pool_connections = pool_connections or config.HTTP_POOL_CONNECTIONS
+        self.pool_maxsize = pool_maxsize or config.HTTP_POOL_MAXSIZE
+        self.timeout = timeout or config.HTTP_TIMEOUT
+        self.max_retries = config.HTTP_MAX_RETRIES if max_retries is None else max_retries
+        self.cache = cache
+        self.scheduler = scheduler or get_scheduler()
+
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def _create_session(self):
+        """创建挂载了连接池适配器的Session"""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_connections,
+                              pool_maxsize=self.pool_maxsize,
+                              max_retries=self.max_retries)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def get_session(self, url):
+        """
+        获取URL所属主机的Session，不存在则创建
+
+        Args:
+            url: 请求URL
+
+        Returns:
+            requests.Session对象
+        """
+        host = urlsplit(url).netloc
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = self._create_session()
+                self._sessions[host] = session
+            return session
+
+    def get(self, url, timeout=None, use_cache=True, **kwargs):
+        """
+        发送GET请求，启用缓存时优先使用磁盘缓存，过期后通过条件请求重新验证
+
+        Args:
+            url: 请求URL
+            timeout: 超时时间（秒），None则使用默认值
+            use_cache: 是否使用磁盘缓存
+            **kwargs: 传递给requests的其他参数
+
+        Returns:
+            requests.Response对象
+
+        Raises:
+            CacheMissError: 离线模式下缓存中没有该URL
+        """
+        cache = self.cache if use_cache else None
+        entry = None
+        if cache is not None:
+            entry = cache.lookup(url)
+            if entry and (cache.offline or cache.is_fresh(entry)):
+                return cache.to_response(url, entry)
+            if cache.offline:
+                raise CacheMissError(f"离线模式下缓存中没有该页面: {url}")
+            if entry:
+                headers = dict(kwargs.pop("headers", None) or {})
+                headers.update(cache.conditional_headers(entry))
+                kwargs["headers"] = headers
+
+        response = self.request("GET", url, timeout=timeout, **kwargs)
+
+        if cache is not None:
+            if response.status_code == 304 and entry:
+                cache.refresh(url, entry)
+                return cache.to_response(url, entry)
+            if response.status_code == 200:
+                cache.store(url, response.content, response.headers, response.encoding)
+        return response
+
+    def request(self, method, url, timeout=None, **kwargs):
+        """
+        经调度器限速后发送请求（不使用缓存），收到429/503时按退避时间等待后重试
+
+        Args:
+            method: 请求方法
+            url: 请求URL
+            timeout: 超时时间（秒），None则使用默认值
+            **kwargs: 传递给requests的其他参数
+
+        Returns:
+            requests.Response对象
+        """
+        session = self.get_session(url)
+        for attempt in range(config.SCHEDULER_MAX_RETRIES + 1):
+            with self.scheduler.slot(url):
+                response = session.request(method, url, timeout=timeout or self.timeout, **kwargs)
+            throttled = self.scheduler.feedback(url, response.status_code, response.headers.get("Retry-After"))
+            if not throttled or attempt == config.SCHEDULER_MAX_RETRIES:
+                return response
+            response.close()
+        return response
+
+    def head(self, url, timeout=None, **kwargs):
+        """经调度器限速后发送HEAD请求"""
+        return self.request("HEAD", url, timeout=timeout, **kwargs)
+
+    def close(self):
+        """关闭所有Session并释放连接"""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
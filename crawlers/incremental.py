@@ -0,0 +1,201 @@
+import json
+import os
+import shutil
+import threading
+
+
+class FingerprintStore:
+    """
+    增量爬取使用的产品指纹存储
+
+    按产品URL只记录上次运行得到的指纹（规格区域内容哈希或HTTP验证头），保存为JSON文件；
+    产品数据不在这里保存，沿用时从上次运行的输出快照（ProductSnapshot）中按URL读取
+    """
+
+    def __init__(self, path):
+        """
+        初始化指纹存储并加载上次运行的记录
+
+        Args:
+            path: 指纹文件路径
+        """
+        self.path = path
+        self._entries = {}
+        self._visited = set()
+        self._lock = threading.Lock()
+
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self._entries = json.load(f)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def unchanged(self, url, fingerprint):
+        """
+        判断产品的指纹是否与上次运行相同
+
+        Args:
+            url: 产品URL
+            fingerprint: 本次计算得到的指纹，None表示无法计算
+
+        Returns:
+            指纹相同时返回True，产品是新的、已变化或无法判断时返回False
+        """
+        with self._lock:
+            return bool(fingerprint) and self._entries.get(url) == fingerprint
+
+    def update(self, url, fingerprint):
+        """记录产品的最新指纹，并将该URL标记为本次运行已访问"""
+        with self._lock:
+            self._visited.add(url)
+            self._entries[url] = fingerprint
+
+    def visited(self, url):
+        """该URL本次运行是否已访问（重新提取成功或沿用了上次的数据）"""
+        with self._lock:
+            return url in self._visited
+
+    def save(self):
+        """原子地写回指纹文件"""
+        with self._lock:
+            self._write(self.path, self._entries)
+
+    def save_visited(self, path):
+        """
+        只把本次运行访问到的产品指纹原子地写入path
+
+        分片模式下各分片进程共用同一份历史指纹，访问记录分别保存，合并时再用merge_visited汇总
+        """
+        with self._lock:
+            self._write(path, {url: self._entries[url] for url in self._visited if url in self._entries})
+
+    def merge_visited(self, path):
+        """
+        合并save_visited保存的记录，其中的产品视为本次运行已访问，文件不存在时忽略
+
+        Returns:
+            合并的记录数
+        """
+        if not os.path.exists(path):
+            return 0
+        with open(path, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+        with self._lock:
+            self._entries.update(entries)
+            self._visited.update(entries)
+        return len(entries)
+
+    @staticmethod
+    def _write(path, entries):
+        """先写临时文件再替换（调用方需持有锁）"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entries, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+
+class ProductSnapshot:
+    """
+    上次运行输出的产品数据快照（JsonlWriter写出的JSON Lines文件）
+
+    内存中只保留URL到行偏移量的索引，产品数据按需从文件中读取；同一URL出现多次时以最后一行为准
+    """
+
+    def __init__(self, path):
+        """
+        打开快照文件并建立索引，文件不存在时视为空快照
+
+        Args:
+            path: 快照文件路径
+        """
+        self.path = path
+        self._offsets = {}
+        self._file = None
+        self._lock = threading.Lock()
+
+        if os.path.exists(path):
+            self._file = open(path, "rb")
+            for offset, record in self._iter_records(self._file):
+                if record.get("url"):
+                    self._offsets[record["url"]] = offset
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def get(self, url):
+        """
+        读取某个URL上次的产品数据
+
+        Returns:
+            产品数据字典，快照中没有该URL时返回None
+        """
+        offset = self._offsets.get(url)
+        if offset is None:
+            return None
+        with self._lock:
+            self._file.seek(offset)
+            line = self._file.readline()
+        return json.loads(line)["data"]
+
+    def iter_products(self):
+        """
+        按文件顺序逐个读取快照中的产品
+
+        Yields:
+            (url, 产品数据)
+        """
+        if not self._offsets:
+            return
+        with open(self.path, "rb") as f:
+            for offset, record in self._iter_records(f):
+                url = record.get("url")
+                if url and self._offsets.get(url) == offset:
+                    yield url, record["data"]
+
+    def close(self):
+        """关闭快照文件"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    @staticmethod
+    def _iter_records(f):
+        """逐行解析文件，跳过崩溃时写了一半的行，生成(行偏移量, 记录)"""
+        offset = f.tell()
+        for line in iter(f.readline, b""):
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            if isinstance(record, dict) and "data" in record:
+                yield offset, record
+            offset += len(line)
+
+    @staticmethod
+    def save(path, jsonl_paths):
+        """
+        把本次运行的输出（一个或多个JSON Lines文件）原子地保存为下次运行使用的快照
+
+        Args:
+            path: 快照文件路径
+            jsonl_paths: 本次运行的JSON Lines文件路径列表，不存在的文件会被跳过
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as out:
+            for jsonl_path in jsonl_paths:
+                if os.path.exists(jsonl_path):
+                    with open(jsonl_path, "rb") as f:
+                        shutil.copyfileobj(f, out)
+                        # 崩溃时写了一半的末行不能和下一个文件的首行连在一起
+                        size = f.tell()
+                        if size:
+                            f.seek(size - 1)
+                            if f.read(1) != b"\n":
+                                out.write(b"\n")
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(tmp_path, path)
@@ -0,0 +1,143 @@
+import json
+import os
+import threading
+import time
+
+from . import config
+
+
+class JsonlWriter:
+    """
+    产品数据的追加写入器
+
+    每提取到一个产品就以{"url": ..., "data": ...}的形式追加一行到JSON Lines文件，
+    按条数或时间间隔批量fsync，进程崩溃时最多丢失最后一批数据
+    """
+
+    def __init__(self, path, append=False, fsync_every=None, fsync_interval=None):
+        """
+        打开JSON Lines文件
+
+        Args:
+            path: 文件路径
+            append: 是否在已有内容后追加，False则清空重写
+            fsync_every: 累计写入多少条后fsync，默认取配置
+            fsync_interval: 距上次fsync超过多少秒后fsync，默认取配置
+        """
+        self.path = path
+        self.fsync_every = fsync_every or config.OUTPUT_FSYNC_EVERY
+        self.fsync_interval = config.OUTPUT_FSYNC_INTERVAL if fsync_interval is None else fsync_interval
+        self.count = 0
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, "a" if append else "w", encoding="utf-8")
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        self._lock = threading.Lock()
+
+    def write(self, url, product):
+        """
+        追加一个产品
+
+        Args:
+            url: 产品页面URL，合并时用于去重
+            product: 产品数据字典
+        """
+        line = json.dumps({"url": url, "data": product}, ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+            self.count += 1
+            self._pending += 1
+            if (self._pending >= self.fsync_every
+                    or time.monotonic() - self._last_sync >= self.fsync_interval):
+                self._sync()
+
+    def _sync(self):
+        """将已写入的数据落盘（调用方需持有锁）"""
+        os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        """落盘并关闭文件"""
+        with self._lock:
+            if self._file.closed:
+                return
+            self._sync()
+            self._file.close()
+
+
+def iter_jsonl(path):
+    """
+    逐行读取JSON Lines文件，跳过崩溃时写了一半的行
+
+    Args:
+        path: 文件路径
+
+    Yields:
+        (行号, 解析后的记录)
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict) and "data" in record:
+                yield line_no, record
+
+
+def _iter_jsonl_files(paths):
+    """依次读取多个JSON Lines文件，行号在所有文件中连续编号"""
+    offset = 0
+    for path in paths:
+        line_no = -1
+        for line_no, record in iter_jsonl(path):
+            yield offset + line_no, record
+        offset += line_no + 1
+
+
+def finalize_jsonl(jsonl_path, json_path):
+    """
+    将JSON Lines文件合并为产品列表JSON文件（与原来的<brand>.json格式相同）
+
+    可以传入多个文件（如各分片的输出），按顺序合并。同一URL出现多次时保留最后一条。先写入临时文件再替换，输出文件不会出现写了一半的状态；
+    没有任何产品时不覆盖已有的输出文件。内存中只保留URL到行号的映射，不保留产品数据
+
+    Args:
+        jsonl_path: JSON Lines文件路径或路径列表
+        json_path: 输出的JSON文件路径
+
+    Returns:
+        写入的产品数量
+    """
+    paths = [jsonl_path] if isinstance(jsonl_path, str) else list(jsonl_path)
+    last_line = {}
+    for line_no, record in _iter_jsonl_files(paths):
+        last_line[record.get("url") or f"#{line_no}"] = line_no
+    keep = set(last_line.values())
+    del last_line
+
+    tmp_path = f"{json_path}.tmp"
+    count = 0
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write("[")
+        for line_no, record in _iter_jsonl_files(paths):
+            if line_no not in keep:
+                continue
+            item = json.dumps(record["data"], ensure_ascii=False, indent=4)
+            f.write(("," if count else "") + "\n    " + item.replace("\n", "\n    "))
+            count += 1
+        f.write("\n]")
+        f.flush()
+        os.fsync(f.fileno())
+
+    if count:
+        os.replace(tmp_path, json_path)
+    else:
+        os.remove(tmp_path)
+    return count
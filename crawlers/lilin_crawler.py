@@ -1,14 +1,18 @@
-import requests
+import asyncio
 from urllib.parse import urljoin
-from parsel import Selector
 
 from .base_crawler import BaseCrawler
+from .frontier import dedupe_urls
 
 
 class LilinCrawler(BaseCrawler):
     """
     梅力光电网站爬虫，继承自BaseCrawler
     """
+    # 增量模式下用于判断产品是否变化的规格区域
+    fingerprint_selector = "h2.red, tbody"
+    # 不使用浏览器，所有页面通过异步抓取引擎并发获取
+    async_fetch = True
 
     def __init__(self, data_dir="data"):
         """
@@ -22,30 +26,13 @@ class LilinCrawler(BaseCrawler):
 
         # 设置基础URL
         self.base_url = "https://www.meritlilin.com"
+        self.request_timeout = 30
 
         # 设置起始URL
         self.start_urls = ["https://www.meritlilin.com/index.php"]
 
         self.logger.info("梅力光电爬虫初始化完成")
 
-    def get_selector(self, url):
-        """
-        获取页面的Selector对象
-
-        Args:
-            url: 页面URL
-
-        Returns:
-            Selector对象，如果请求失败则返回None
-        """
-        try:
-            response = requests.get(url, timeout=30)
-            response.raise_for_status()  # 如果响应状态码不是200，抛出异常
-            return Selector(text=response.text)
-        except Exception as e:
-            self.logger.error(f"获取页面内容时出错 {url}: {str(e)}")
-            return None
-
     def get_links_from_page(self, url, selector=None):
         """
         获取页面中的链接
@@ -63,15 +50,24 @@ class LilinCrawler(BaseCrawler):
         if not selector:
             return []
 
-        links = []
+        return self._parse_product_links(selector)
+
+    async def aget_links_from_page(self, url, selector=None):
+        """get_links_from_page的协程版本"""
+        if not selector:
+            selector = await self.aget_selector(url)
+
+        if not selector:
+            return []
+
+        return self._parse_product_links(selector)
 
+    def _parse_product_links(self, selector):
+        """从子分类页面中解析产品链接"""
         # 获取子分类页面中的产品链接
         product_links = selector.css('div.pic > a::attr(href)').getall()
-        for link in product_links:
-            full_url = urljoin(self.base_url, link)
-            if full_url not in links:
-                links.append(full_url)
-                self.logger.debug(f"添加产品链接: {full_url}")
+        links = dedupe_urls(urljoin(self.base_url, link) for link in product_links)
+        self.logger.debug(f"添加 {len(links)} 个产品链接")
 
         return links
 
@@ -85,11 +81,30 @@ class LilinCrawler(BaseCrawler):
         Returns:
             产品详情字典，如果提取失败则返回None
         """
-        try:
-            selector = self.get_selector(url)
-            if not selector:
-                return None
+        selector = self.get_selector(url)
+        if not selector:
+            return None
+        return self.parse_product_page(url, selector)
+
+    async def aextract_product_details(self, url):
+        """extract_product_details的协程版本"""
+        selector = await self.aget_selector(url)
+        if not selector:
+            return None
+        return self.parse_product_page(url, selector)
+
+    def parse_product_page(self, url, selector):
+        """
+        从产品页面的Selector解析产品详情
+
+        Args:
+            url: 产品页面URL
+            selector: 页面的Selector对象
 
+        Returns:
+            产品详情字典，如果提取失败则返回None
+        """
+        try:
             # 获取product_id（URL最后一个斜杠后的字符串）
             product_id = url.rstrip('/').split('/')[-1]
 
@@ -153,20 +168,7 @@ class LilinCrawler(BaseCrawler):
                 return []
 
             # 获取所有分类页面链接
-            category_links = []
-
-            # 获取第2、3、4个ul.secondsubmenu
-            submenus = selector.css('ul.secondsubmenu')[1:4]  # 索引1,2,3对应第2,3,4个元素
-
-            for submenu in submenus:
-                # 获取ul下的所有li > a的href属性
-                links = submenu.css('li > a::attr(href)').getall()
-                for link in links:
-                    full_url = urljoin(self.base_url, link)
-                    if full_url not in category_links:
-                        category_links.append(full_url)
-                        self.logger.debug(f"添加分类页面链接: {full_url}")
-
+            category_links = self._parse_category_links(selector)
             self.logger.info(f"找到 {len(category_links)} 个分类页面")
 
             # 处理所有分类页面和子分类页面
@@ -181,22 +183,9 @@ class LilinCrawler(BaseCrawler):
                 if not category_selector:
                     continue
 
-                # 检查是否有子分类
-                subcategory_elements = category_selector.css('div.containerToMix > div a')
-
-                if subcategory_elements:
-                    # 有子分类，获取所有子分类链接
-                    for element in subcategory_elements:
-                        href = element.attrib.get('href', '')
-                        if href:
-                            full_url = urljoin(self.base_url, href)
-                            if full_url not in subcategory_links:
-                                subcategory_links.append(full_url)
-                                self.logger.debug(f"添加子分类页面链接: {full_url}")
-                else:
-                    # 没有子分类，当前页面即为子分类页面
-                    subcategory_links.append(category_link)
+                subcategory_links.extend(self._parse_subcategory_links(category_link, category_selector))
 
+            subcategory_links = dedupe_urls(subcategory_links)
             self.logger.info(f"找到 {len(subcategory_links)} 个子分类页面")
 
             # 处理所有子分类页面
@@ -205,6 +194,7 @@ class LilinCrawler(BaseCrawler):
 
                 product_links = self.get_links_from_page(subcategory_link)
                 all_product_links.extend(product_links)
+                self.publish_links(product_links)
                 self.logger.info(f"在子分类 {subcategory_link} 中找到 {len(product_links)} 个产品链接")
 
             self.logger.info(f"总共找到 {len(all_product_links)} 个产品链接")
@@ -213,3 +203,69 @@ class LilinCrawler(BaseCrawler):
         except Exception as e:
             self.logger.error(f"处理类别页面时出错 {url}: {str(e)}")
             return []
+
+    async def aprocess_category_page(self, url):
+        """process_category_page的协程版本，分类页面和子分类页面分别并发获取"""
+        try:
+            self.logger.info(f"处理首页: {url}")
+
+            selector = await self.aget_selector(url)
+            if not selector:
+                return []
+
+            category_links = self._parse_category_links(selector)
+            self.logger.info(f"找到 {len(category_links)} 个分类页面")
+
+            # 并发获取所有分类页面，结果保持分类顺序
+            category_selectors = await asyncio.gather(*(self.aget_selector(link) for link in category_links))
+            subcategory_links = []
+            for category_link, category_selector in zip(category_links, category_selectors):
+                if not category_selector:
+                    continue
+                subcategory_links.extend(self._parse_subcategory_links(category_link, category_selector))
+            subcategory_links = dedupe_urls(subcategory_links)
+
+            self.logger.info(f"找到 {len(subcategory_links)} 个子分类页面")
+
+            # 并发获取所有子分类页面中的产品链接
+            link_lists = await asyncio.gather(*(self.aget_links_from_page(link) for link in subcategory_links))
+            all_product_links = []
+            for subcategory_link, product_links in zip(subcategory_links, link_lists):
+                all_product_links.extend(product_links)
+                self.logger.info(f"在子分类 {subcategory_link} 中找到 {len(product_links)} 个产品链接")
+
+            self.logger.info(f"总共找到 {len(all_product_links)} 个产品链接")
+            return all_product_links
+
+        except Exception as e:
+            self.logger.error(f"处理类别页面时出错 {url}: {str(e)}")
+            return []
+
+    def _parse_category_links(self, selector):
+        """从首页菜单中解析分类页面链接"""
+        category_links = []
+
+        # 获取第2、3、4个ul.secondsubmenu
+        submenus = selector.css('ul.secondsubmenu')[1:4]  # 索引1,2,3对应第2,3,4个元素
+
+        for submenu in submenus:
+            # 获取ul下的所有li > a的href属性
+            links = submenu.css('li > a::attr(href)').getall()
+            category_links.extend(urljoin(self.base_url, link) for link in links)
+
+        category_links = dedupe_urls(category_links)
+        self.logger.debug(f"添加 {len(category_links)} 个分类页面链接")
+        return category_links
+
+    def _parse_subcategory_links(self, category_link, category_selector):
+        """解析分类页面中的子分类链接，没有子分类时分类页面本身即为子分类页面"""
+        # 检查是否有子分类
+        subcategory_elements = category_selector.css('div.containerToMix > div a')
+        if not subcategory_elements:
+            return [category_link]
+
+        # 有子分类，获取所有子分类链接
+        hrefs = (element.attrib.get('href', '') for element in subcategory_elements)
+        subcategory_links = dedupe_urls(urljoin(self.base_url, href) for href in hrefs if href)
+        self.logger.debug(f"添加 {len(subcategory_links)} 个子分类页面链接")
+        return subcategory_links
@@ -0,0 +1,184 @@
+import base64
+import json
+import os
+import re
+from urllib.parse import quote, unquote, unquote_plus, urlsplit, urlunsplit
+
+# 规格接口JSON中常见的参数名/参数值字段（不区分大小写）
+_NAME_KEYS = {"name", "label", "title", "key", "paramname", "attrname", "specname", "itemname"}
+_VALUE_KEYS = {"value", "values", "content", "param", "val", "desc", "description", "attrvalue", "specvalue",
+               "itemvalue"}
+
+
+def enable_performance_log(chrome_options):
+    """开启Chrome的performance日志，用于记录页面发起的网络请求"""
+    chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+
+def drain_performance_log(driver):
+    """读取并丢弃当前积压的performance日志"""
+    try:
+        driver.get_log("performance")
+    except Exception:
+        pass
+
+
+def capture_json_responses(driver, url_pattern):
+    """
+    从performance日志中找出URL匹配且内容为JSON的响应，并通过DevTools读取响应体
+
+    Args:
+        driver: WebDriver对象（需已开启performance日志）
+        url_pattern: 响应URL需要匹配的正则表达式
+
+    Returns:
+        [(响应URL, 解析后的JSON数据)]列表
+    """
+    responses = []
+    for entry in driver.get_log("performance"):
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, ValueError):
+            continue
+        if message.get("method") != "Network.responseReceived":
+            continue
+
+        params = message.get("params", {})
+        response = params.get("response", {})
+        response_url = response.get("url", "")
+        if "json" not in response.get("mimeType", "") or not re.search(url_pattern, response_url):
+            continue
+
+        try:
+            body = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": params["requestId"]})
+            text = body.get("body", "")
+            if body.get("base64Encoded"):
+                text = base64.b64decode(text).decode("utf-8", errors="replace")
+            responses.append((response_url, json.loads(text)))
+        except Exception:
+            # 响应体可能已被浏览器释放或不是合法JSON
+            continue
+
+    return responses
+
+
+def _escape_braces(text):
+    """转义str.format中的花括号"""
+    return text.replace("{", "{{").replace("}", "}}")
+
+
+def _key_segment(segment, product_key):
+    """
+    路径段等于产品标识（或产品标识加扩展名）时返回模板中的写法，否则返回None
+    """
+    text = unquote(segment)
+    if text == product_key:
+        return "{key}"
+    stem, ext = os.path.splitext(text)
+    if ext and stem == product_key:
+        return "{key}" + _escape_braces(quote(ext))
+    return None
+
+
+def build_endpoint_template(api_url, product_key):
+    """
+    把接口URL中等于产品标识的路径段或查询参数值替换成{key}占位符，得到可用于其他产品的URL模板
+
+    只替换完整等于产品标识的部分，不会改动碰巧包含产品标识的时间戳、其他ID等内容
+
+    Args:
+        api_url: 捕获到的接口URL
+        product_key: 当前产品的标识（通常取自产品页面URL）
+
+    Returns:
+        URL模板，接口URL中没有等于产品标识的部分或有多处（无法确定是哪一处）时返回None
+    """
+    if not product_key:
+        return None
+    parts = urlsplit(api_url)
+    segments = parts.path.split("/")
+    pairs = parts.query.split("&") if parts.query else []
+
+    matches = []
+    for i, segment in enumerate(segments):
+        replacement = _key_segment(segment, product_key)
+        if replacement:
+            matches.append(("path", i, replacement))
+    for i, pair in enumerate(pairs):
+        name, separator, value = pair.partition("=")
+        if separator and unquote_plus(value) == product_key:
+            matches.append(("query", i, f"{_escape_braces(name)}={{key}}"))
+    if len(matches) != 1:
+        return None
+
+    kind, index, replacement = matches[0]
+    segments = [_escape_braces(segment) for segment in segments]
+    pairs = [_escape_braces(pair) for pair in pairs]
+    if kind == "path":
+        segments[index] = replacement
+    else:
+        pairs[index] = replacement
+    # 锚点不会发送给服务器，直接去掉
+    return urlunsplit((parts.scheme, _escape_braces(parts.netloc), "/".join(segments), "&".join(pairs), ""))
+
+
+def param_names(params):
+    """
+    参数列表中的参数名集合，忽略大小写、空白和末尾的冒号，用于比较不同来源的参数
+
+    Args:
+        params: [{"paramName": ..., "param": ...}]列表
+
+    Returns:
+        规范化后的参数名集合
+    """
+    names = set()
+    for param in params:
+        name = re.sub(r"\s+", "", str(param.get("paramName", ""))).rstrip(":：").lower()
+        if name:
+            names.add(name)
+    return names
+
+
+def _scalar_text(value):
+    """将JSON中的值转换为参数文本，列表用分号拼接"""
+    if isinstance(value, (str, int, float)) and not isinstance(value, bool):
+        return str(value).strip()
+    if isinstance(value, list) and value and all(isinstance(v, (str, int, float)) for v in value):
+        return "; ".join(str(v).strip() for v in value if str(v).strip())
+    return ""
+
+
+def extract_params_from_json(payload):
+    """
+    在任意结构的JSON中查找"名称-值"形式的对象，转换为参数列表
+
+    Args:
+        payload: 解析后的JSON数据
+
+    Returns:
+        [{"paramName": ..., "param": ...}]列表，保持出现顺序并去重
+    """
+    params = []
+    seen = set()
+    stack = [payload]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            lowered = {str(k).lower(): v for k, v in node.items()}
+            name_key = next((k for k in lowered if k in _NAME_KEYS and _scalar_text(lowered[k])), None)
+            value_key = next((k for k in lowered if k in _VALUE_KEYS and _scalar_text(lowered[k])), None)
+            if name_key and value_key:
+                param_name = _scalar_text(lowered[name_key])
+                param_value = _scalar_text(lowered[value_key])
+                if (param_name, param_value) not in seen:
+                    seen.add((param_name, param_value))
+                    params.append({"paramName": param_name, "param": param_value})
+            children = list(node.values())
+        elif isinstance(node, list):
+            children = node
+        else:
+            continue
+        # 逆序压栈以保持原始顺序
+        stack.extend(reversed(children))
+    return params
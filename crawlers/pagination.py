@@ -0,0 +1,108 @@
+import re
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+# 常见的页码参数名（不区分大小写）
+_PAGE_PARAMS = {"page", "pageno", "pagenum", "pageindex", "pagenumber", "current", "currentpage", "p", "pn"}
+# JSON中表示链接的字段名需要包含的关键字
+_LINK_KEY = re.compile(r"(?i)url|link|href|path")
+
+
+def _template_from_query(url, page):
+    """把URL查询参数中等于page的页码参数替换成{page}占位符"""
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    candidates = [i for i, (name, value) in enumerate(query) if value == str(page)]
+    # 有多个参数等于页码时优先选择常见的页码参数名
+    named = [i for i in candidates if query[i][0].lower() in _PAGE_PARAMS]
+    index = (named or candidates or [None])[0]
+    if index is None:
+        return None
+    query[index] = (query[index][0], "__PAGE__")
+    template = urlunsplit(parts._replace(query=urlencode(query)))
+    return template.replace("{", "{{").replace("}", "}}").replace("__PAGE__", "{page}")
+
+
+def page_url_template(first_url, page_url, page):
+    """
+    比较第一页和第page页的地址，推断出可以直接拼出任意页地址的模板
+
+    支持查询参数（如?page=2）、路径段（如/page/2、/2.html）和锚点（如#page=2）三种形式
+
+    Args:
+        first_url: 第一页的地址
+        page_url: 翻到第page页后的地址
+        page: page_url对应的页码
+
+    Returns:
+        包含{page}占位符的地址模板，无法推断时返回None
+    """
+    if not page_url or page_url == first_url:
+        return None
+
+    template = _template_from_query(page_url, page)
+    if template:
+        return template
+
+    first, current = urlsplit(first_url), urlsplit(page_url)
+    for field in ("path", "fragment"):
+        before, after = getattr(first, field), getattr(current, field)
+        if before == after:
+            continue
+        # 找出唯一一处变成页码的数字
+        matches = list(re.finditer(r"(?<!\d)%d(?!\d)" % page, after))
+        if len(matches) != 1:
+            continue
+        m = matches[0]
+        filled = after[:m.start()] + "__PAGE__" + after[m.end():]
+        template = urlunsplit(current._replace(**{field: filled}))
+        return template.replace("{", "{{").replace("}", "}}").replace("__PAGE__", "{page}")
+    return None
+
+
+def api_page_template(api_url, page):
+    """
+    把列表接口URL中的页码参数替换成{page}占位符
+
+    Args:
+        api_url: 翻页时捕获到的接口URL
+        page: 该请求对应的页码
+
+    Returns:
+        接口URL模板，URL中找不到页码参数时返回None
+    """
+    return _template_from_query(api_url, page)
+
+
+def links_from_json(payload, base_url):
+    """
+    从列表接口返回的JSON中收集链接字段的值
+
+    Args:
+        payload: 解析后的JSON数据
+        base_url: 解析相对链接使用的基础URL
+
+    Returns:
+        链接列表（保持出现顺序并去重）
+    """
+    links = []
+    seen = set()
+    stack = [payload]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if isinstance(value, str) and _LINK_KEY.search(str(key)) and value.strip():
+                    value = value.strip()
+                    if value.startswith(("http://", "https://", "/")):
+                        link = urljoin(base_url, value)
+                        if link not in seen:
+                            seen.add(link)
+                            links.append(link)
+            children = list(node.values())
+        elif isinstance(node, list):
+            children = node
+        else:
+            continue
+        # 逆序压栈以保持原始顺序
+        stack.extend(reversed(children))
+    return links
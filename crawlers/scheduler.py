@@ -0,0 +1,204 @@
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+from . import config
+
+
+class _HostState:
+    """
+    单个主机的调度状态：令牌桶、并发数和退避状态
+    """
+
+    def __init__(self, rate, burst, max_concurrency):
+        self.rate = rate  # 每秒补充的令牌数
+        self.burst = max(1.0, burst)  # 令牌桶容量
+        self.max_concurrency = max(1, max_concurrency)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.active = 0
+        self.penalty = 1.0  # 退避倍数，实际速率为rate / penalty
+        self.blocked_until = 0.0
+
+    def refill(self, now):
+        """按经过的时间补充令牌"""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate / self.penalty)
+        self.updated = now
+
+    def delay(self, now):
+        """距离可以发出下一个请求还需等待的秒数，0表示可以立即发出"""
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        if self.active >= self.max_concurrency:
+            return None  # 需要等待其他请求完成
+        if self.tokens >= 1:
+            return 0
+        return (1 - self.tokens) * self.penalty / self.rate
+
+
+class HostScheduler:
+    """
+    按主机调度请求的礼貌性调度器
+
+    每个主机有独立的令牌桶（限制请求速率）和并发上限，收到429/503时降低该主机的速率并按
+    Retry-After暂停，之后随着成功请求逐步恢复
+    """
+
+    def __init__(self, rate=None, burst=None, max_concurrency=None, host_overrides=None):
+        """
+        初始化调度器
+
+        Args:
+            rate: 每个主机每秒的请求数，默认取配置
+            burst: 令牌桶容量（允许的突发请求数），默认取配置
+            max_concurrency: 每个主机同时进行的请求数上限，默认取配置
+            host_overrides: 按主机覆盖上述设置的字典，如{"example.com": {"rate": 1}}，默认取配置
+        """
+        self.rate = rate or config.SCHEDULER_RATE
+        self.burst = burst or config.SCHEDULER_BURST
+        self.max_concurrency = max_concurrency or config.SCHEDULER_MAX_CONCURRENCY
+        self.host_overrides = config.SCHEDULER_HOST_OVERRIDES if host_overrides is None else host_overrides
+
+        self._hosts = {}
+        self._cond = threading.Condition()
+
+    @staticmethod
+    def host_of(url):
+        """取URL的主机名，传入的已经是主机名时原样返回"""
+        return urlsplit(url).netloc or url
+
+    def _state(self, host):
+        """获取主机的调度状态，不存在则按配置创建（调用方需持有锁）"""
+        state = self._hosts.get(host)
+        if state is None:
+            override = self.host_overrides.get(host, {})
+            state = _HostState(override.get("rate", self.rate),
+                               override.get("burst", self.burst),
+                               override.get("max_concurrency", self.max_concurrency))
+            self._hosts[host] = state
+        return state
+
+    def _try_acquire(self, host):
+        """
+        尝试占用主机的请求名额（调用方需持有锁）
+
+        Returns:
+            0表示已占用，正数表示需要等待的秒数，None表示需要等待其他请求完成
+        """
+        state = self._state(host)
+        now = time.monotonic()
+        state.refill(now)
+        delay = state.delay(now)
+        if delay == 0:
+            state.tokens -= 1
+            state.active += 1
+        return delay
+
+    def acquire(self, url):
+        """等待直到可以向该主机发出请求，并占用一个并发名额"""
+        host = self.host_of(url)
+        with self._cond:
+            while True:
+                delay = self._try_acquire(host)
+                if delay == 0:
+                    return
+                self._cond.wait(delay)
+
+    async def async_acquire(self, url):
+        """acquire的协程版本，等待期间不阻塞事件循环"""
+        host = self.host_of(url)
+        while True:
+            with self._cond:
+                delay = self._try_acquire(host)
+            if delay == 0:
+                return
+            await asyncio.sleep(delay if delay is not None else config.SCHEDULER_ASYNC_POLL_INTERVAL)
+
+    def release(self, url):
+        """归还并发名额"""
+        with self._cond:
+            state = self._state(self.host_of(url))
+            state.active = max(0, state.active - 1)
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, url):
+        """
+        以上下文管理器的方式占用主机的请求名额
+
+        Args:
+            url: 请求URL（或主机名）
+        """
+        self.acquire(url)
+        try:
+            yield
+        finally:
+            self.release(url)
+
+    @asynccontextmanager
+    async def async_slot(self, url):
+        """slot的异步版本，供asyncio抓取引擎使用"""
+        await self.async_acquire(url)
+        try:
+            yield
+        finally:
+            self.release(url)
+
+    @staticmethod
+    def _retry_after_seconds(value):
+        """解析Retry-After头（秒数或HTTP日期），无法解析时返回None"""
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def feedback(self, url, status_code, retry_after=None):
+        """
+        根据响应状态调整主机的请求速率
+
+        Args:
+            url: 请求URL（或主机名）
+            status_code: 响应状态码
+            retry_after: 响应的Retry-After头
+
+        Returns:
+            是否为限流响应（429/503），调用方可据此重试
+        """
+        throttled = status_code in (429, 503)
+        with self._cond:
+            state = self._state(self.host_of(url))
+            if throttled:
+                # 速率减半并暂停，暂停时间优先使用服务器给出的Retry-After
+                state.penalty = min(state.penalty * 2, config.SCHEDULER_MAX_PENALTY)
+                wait = self._retry_after_seconds(retry_after)
+                if wait is None:
+                    wait = config.SCHEDULER_BACKOFF_BASE * state.penalty
+                state.blocked_until = max(state.blocked_until, time.monotonic() + wait)
+                state.tokens = 0
+            elif state.penalty > 1:
+                # 成功请求逐步恢复速率
+                state.penalty = max(1.0, state.penalty - config.SCHEDULER_RECOVERY_STEP)
+            self._cond.notify_all()
+        return throttled
+
+
+_default_scheduler = None
+_default_lock = threading.Lock()
+
+
+def get_scheduler():
+    """获取进程内共享的调度器，所有爬虫对同一主机的请求共用一套限制"""
+    global _default_scheduler
+    with _default_lock:
+        if _default_scheduler is None:
+            _default_scheduler = HostScheduler()
+        return _default_scheduler
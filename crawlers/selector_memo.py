@@ -0,0 +1,42 @@
+import threading
+from collections import OrderedDict
+
+
+class SelectorMemo:
+    """
+    单次运行内按URL缓存已解析Selector的LRU表，避免同一页面被重复下载和解析
+    """
+
+    def __init__(self, max_size):
+        """
+        初始化缓存表
+
+        Args:
+            max_size: 最多缓存的Selector数量，0表示不缓存
+        """
+        self.max_size = max_size
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """获取缓存的Selector，不存在时返回None"""
+        with self._lock:
+            selector = self._items.get(key)
+            if selector is not None:
+                self._items.move_to_end(key)
+            return selector
+
+    def put(self, key, selector):
+        """缓存Selector，超过数量上限时淘汰最久未使用的条目"""
+        if not self.max_size:
+            return
+        with self._lock:
+            self._items[key] = selector
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._items.clear()
@@ -0,0 +1,225 @@
+import bisect
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+from .frontier import canonicalize_url
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    url TEXT PRIMARY KEY,
+    shard INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_shard ON tasks (shard, status, position);
+"""
+
+
+def _hash(key):
+    """把字符串映射到64位整数"""
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """
+    一致性哈希环，按规范化URL把产品链接分配到分片
+
+    每个分片在环上放置多个虚拟节点，分片数量变化时只有少量链接会换到别的分片
+    """
+
+    def __init__(self, shard_count, replicas=64):
+        """
+        构建哈希环
+
+        Args:
+            shard_count: 分片数量
+            replicas: 每个分片的虚拟节点数
+        """
+        self.shard_count = shard_count
+        points = sorted((_hash(f"shard-{shard}#{i}"), shard)
+                        for shard in range(shard_count) for i in range(replicas))
+        self._keys = [key for key, _ in points]
+        self._shards = [shard for _, shard in points]
+
+    def shard_of(self, url):
+        """返回链接所属的分片编号"""
+        index = bisect.bisect(self._keys, _hash(canonicalize_url(url))) % len(self._keys)
+        return self._shards[index]
+
+
+class ShardQueue:
+    """
+    基于SQLite的分片任务队列
+
+    链接发现进程把产品链接按一致性哈希写入队列，各分片进程只领取属于自己的链接，
+    多个进程通过同一个数据库文件协调，中断后未完成的链接可以重新领取
+    """
+
+    def __init__(self, path, shard_count=None, reset=False):
+        """
+        打开任务队列
+
+        Args:
+            path: 数据库文件路径
+            shard_count: 分片数量，None表示沿用创建队列时的设置
+            reset: 是否清空已有的任务
+
+        Raises:
+            ValueError: 队列尚未创建且没有指定分片数量
+        """
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        self._lock = threading.Lock()
+        # 多个进程同时写入，等待其他进程释放写锁而不是立即报错；事务由_transaction显式控制
+        self._conn = sqlite3.connect(path, timeout=60, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+        with self._transaction():
+            stored = self._conn.execute("SELECT value FROM meta WHERE key = 'shard_count'").fetchone()
+            stored_count = int(stored[0]) if stored else None
+            shard_count = shard_count or stored_count
+            if shard_count is None:
+                raise ValueError(f"任务队列尚未创建，需要指定分片数量: {path}")
+            # 分片数量变化时已有任务的分配失效，需要重新发现链接
+            self.fresh = reset or shard_count != stored_count
+            if self.fresh:
+                self._conn.execute("DELETE FROM tasks")
+                self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('shard_count', ?)",
+                                   (str(shard_count),))
+
+        self.shard_count = shard_count
+        self.ring = HashRing(shard_count)
+
+    def _transaction(self):
+        """开启立即获取写锁的事务，保证领取任务时不会被其他进程抢走同一批链接"""
+        return _ImmediateTransaction(self._conn, self._lock)
+
+    def add(self, urls):
+        """
+        加入产品链接，已存在的链接保持原有状态
+
+        Args:
+            urls: 产品链接列表
+
+        Returns:
+            新加入的链接数
+        """
+        now = time.time()
+        with self._transaction():
+            position = self._conn.execute("SELECT COALESCE(MAX(position), -1) + 1 FROM tasks").fetchone()[0]
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO tasks (url, shard, position, updated_at) VALUES (?, ?, ?, ?)",
+                [(url, self.ring.shard_of(url), position + i, now) for i, url in enumerate(urls)]
+            )
+            return self._conn.total_changes - before
+
+    def claim(self, shard, limit):
+        """
+        领取分片中的一批待处理链接并标记为处理中
+
+        Args:
+            shard: 分片编号
+            limit: 最多领取的链接数
+
+        Returns:
+            链接列表，没有待处理链接时为空列表
+        """
+        with self._transaction():
+            rows = self._conn.execute(
+                "SELECT url FROM tasks WHERE shard = ? AND status = 'pending' ORDER BY position LIMIT ?",
+                (shard, limit)
+            ).fetchall()
+            urls = [row[0] for row in rows]
+            now = time.time()
+            self._conn.executemany(
+                "UPDATE tasks SET status = 'running', attempts = attempts + 1, updated_at = ? WHERE url = ?",
+                [(now, url) for url in urls]
+            )
+        return urls
+
+    def requeue_running(self, shard):
+        """分片进程启动时把上次中断时处理中的链接放回待处理状态"""
+        with self._transaction():
+            self._conn.execute(
+                "UPDATE tasks SET status = 'pending', updated_at = ? WHERE shard = ? AND status = 'running'",
+                (time.time(), shard)
+            )
+
+    def retry_failed(self):
+        """恢复运行时把上次失败的链接放回待处理状态"""
+        with self._transaction():
+            self._conn.execute("UPDATE tasks SET status = 'pending', updated_at = ? WHERE status = 'failed'",
+                               (time.time(),))
+
+    def mark_done(self, url):
+        """标记链接处理完成"""
+        with self._transaction():
+            self._conn.execute("UPDATE tasks SET status = 'done', error = NULL, updated_at = ? WHERE url = ?",
+                               (time.time(), url))
+
+    def mark_failed(self, url, error=None):
+        """标记链接处理失败"""
+        with self._transaction():
+            self._conn.execute("UPDATE tasks SET status = 'failed', error = ?, updated_at = ? WHERE url = ?",
+                               (error, time.time(), url))
+
+    def summary(self, shard=None):
+        """
+        统计各状态的链接数
+
+        Args:
+            shard: 分片编号，None表示统计所有分片
+
+        Returns:
+            状态到数量的字典
+        """
+        with self._lock:
+            if shard is None:
+                rows = self._conn.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status")
+            else:
+                rows = self._conn.execute("SELECT status, COUNT(*) FROM tasks WHERE shard = ? GROUP BY status",
+                                          (shard,))
+            return dict(rows.fetchall())
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
+
+
+class _ImmediateTransaction:
+    """BEGIN IMMEDIATE事务的上下文管理器，出错时回滚"""
+
+    def __init__(self, conn, lock):
+        self._conn = conn
+        self._lock = lock
+
+    def __enter__(self):
+        self._lock.acquire()
+        try:
+            self._conn.execute("BEGIN IMMEDIATE")
+        except Exception:
+            self._lock.release()
+            raise
+        return self._conn
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self._conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self._lock.release()
+        return False
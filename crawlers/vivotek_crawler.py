@@ -1,18 +1,18 @@
-import time
-
-import requests
-from parsel import Selector
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions as EC
 
 from .base_crawler import BaseCrawler
+from .frontier import dedupe_urls
 
 
 class VivotekCrawler(BaseCrawler):
     """
     VIVOTEK网站爬虫，继承自BaseCrawler
     """
+    # 页面和规格参数的就绪条件
+    page_ready_selector = "h1.mt-4"
+    spec_ready_selector = "frontend-collapses-general > div > div > div"
+    # 规格参数由后台请求加载，尝试捕获该接口后直接请求
+    spec_api_pattern = r"(?i)spec"
 
     def __init__(self, data_dir="data"):
         """
@@ -23,29 +23,11 @@ class VivotekCrawler(BaseCrawler):
 
         # 设置VIVOTEK特定的属性
         self.base_url = "https://www.vivotek.com"
+        self.request_timeout = 10
 
-        # 不使用起始URL列表，而是在process_category_page中处理
+        # 起始URL为分类卡片页面，在process_category_page中逐个处理卡片
         self.start_urls = ["https://www.vivotek.com/products/network_cameras"]
 
-    def get_selector(self, url):
-        """
-        使用requests和Parsel获取页面内容
-
-        Args:
-            url: 要获取的URL
-
-        Returns:
-            Selector对象
-        """
-        try:
-            resp = requests.get(url, timeout=10)
-            resp.raise_for_status()
-            selector = Selector(text=resp.text)
-            return selector
-        except Exception as e:
-            self.logger.error(f"获取页面内容时出错 {url}: {str(e)}")
-            return None
-
     def get_links_from_page(self, url, selector=None):
         """
         获取页面中的链接，根据URL类型自动判断是获取分类卡片还是产品链接
@@ -65,7 +47,7 @@ class VivotekCrawler(BaseCrawler):
                 return []
 
         # 根据URL类型选择不同的链接提取方法
-        if url == self.start_urls[0]:
+        if url in self.start_urls:
             # 处理主分类页面，获取分类卡片链接
             cards = selector.css("frontend-cards-general > a")
             links = []
@@ -101,29 +83,8 @@ class VivotekCrawler(BaseCrawler):
         try:
             # 添加spec标签页到URL
             url_with_tab = url + "?tab=spec"
-            self.driver.get(url_with_tab)
-            time.sleep(2)  # 等待页面加载
-
-            # 获取产品ID
-            try:
-                id_elem = self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "h1.mt-4")))
-                prod_id = id_elem.text.strip()
-                if not prod_id:
-                    self.logger.warning(f"产品ID为空 {url}")
-                    return None
-            except (TimeoutException, NoSuchElementException) as e:
-                self.logger.error(f"无法获取产品ID {url}: {str(e)}")
-                return None
-
-            # 获取产品名称
-            try:
-                name_elem = self.driver.find_element(By.CSS_SELECTOR, "h3.mt-2")
-                prod_name = name_elem.text.strip()
-                if not prod_name:
-                    self.logger.warning(f"产品名称为空 {url}")
-                    return None
-            except (TimeoutException, NoSuchElementException) as e:
-                self.logger.error(f"无法获取产品名称 {url}: {str(e)}")
+            if not self.load_page(url_with_tab):
+                self.logger.error(f"无法获取产品ID {url}: 页面加载超时")
                 return None
 
             # 点击规格参数按钮
@@ -131,56 +92,86 @@ class VivotekCrawler(BaseCrawler):
                 btn = self.driver.find_element(By.CSS_SELECTOR, ".shrink-0 > button:nth-child(1)")
                 # 使用JavaScript执行点击，解决无头模式下点击不生效的问题
                 self.driver.execute_script("arguments[0].click();", btn)
-                time.sleep(2)  # 等待参数加载
+                self.wait_until_ready(css=self.spec_ready_selector, network_idle=True)  # 等待参数加载
             except Exception as e:
                 self.logger.warning(f"点击规格按钮时出错 {url}: {str(e)}")
                 # 继续尝试获取参数
 
-            # 获取规格参数
-            params = []
-            try:
-                groups = self.driver.find_elements(By.CSS_SELECTOR, "frontend-collapses-general > div > div > div")
-                for g in groups:
-                    divs = g.find_elements(By.XPATH, "./div")
-                    if len(divs) >= 2:
-                        param_name = divs[0].text.strip()
-                        param_p = []
-                        sub_divs = divs[1].find_elements(By.XPATH, "./div")
-                        for sub_div in sub_divs:
-                            ps = sub_div.find_elements(By.TAG_NAME, "p")
-                            for p in ps:
-                                if p.text.strip():
-                                    param_p.append(p.text.strip())
-                        param_value = "; ".join(param_p)
-                        if param_name and param_value:
-                            params.append({
-                                "paramName": param_name,
-                                "param": param_value
-                            })
-
-                # 检查是否提取到参数
-                if not params:
-                    self.logger.warning(f"未提取到任何规格参数 {url}")
-                    return None
+            # 一次性获取渲染后的页面，后续解析在本地完成
+            return self.parse_product_page(url, self.page_selector())
 
-            except Exception as e:
-                self.logger.error(f"提取规格参数时出错 {url}: {str(e)}")
-                return None
+        except Exception as e:
+            self.logger.error(f"提取产品详情时出错 {url}: {str(e)}")
+            return None
 
-            # 准备产品数据
-            product_data = {
-                'product_id': prod_id,
-                'product_name': prod_name,
-                'params': params
-            }
+    def parse_product_identity(self, page):
+        """
+        从VIVOTEK产品页面解析产品ID和名称
 
-            self.logger.info(f"成功提取产品信息: {prod_name} ({prod_id})")
-            return product_data
+        Args:
+            page: 页面的Selector对象
 
-        except Exception as e:
-            self.logger.error(f"提取产品详情时出错 {url}: {str(e)}")
+        Returns:
+            (product_id, product_name)
+        """
+        product_id = self.element_text(page.css("h1.mt-4"))
+        product_name = self.element_text(page.css("h3.mt-2"))
+        return product_id, product_name
+
+    def parse_product_page(self, url, page):
+        """
+        从渲染后的VIVOTEK产品页面解析产品详情
+
+        Args:
+            url: 产品页面URL
+            page: 页面的Selector对象
+
+        Returns:
+            产品数据字典或None（如果解析失败）
+        """
+        # 获取产品ID和名称
+        prod_id, prod_name = self.parse_product_identity(page)
+        if not prod_id:
+            self.logger.warning(f"产品ID为空 {url}")
+            return None
+
+        if not prod_name:
+            self.logger.warning(f"产品名称为空 {url}")
+            return None
+
+        # 获取规格参数
+        params = []
+        for g in page.css("frontend-collapses-general > div > div > div"):
+            divs = g.xpath("./div")
+            if len(divs) >= 2:
+                param_name = self.element_text(divs[0])
+                param_p = []
+                for p in divs[1].xpath("./div//p"):
+                    text = self.element_text(p)
+                    if text:
+                        param_p.append(text)
+                param_value = "; ".join(param_p)
+                if param_name and param_value:
+                    params.append({
+                        "paramName": param_name,
+                        "param": param_value
+                    })
+
+        # 检查是否提取到参数
+        if not params:
+            self.logger.warning(f"未提取到任何规格参数 {url}")
             return None
 
+        # 准备产品数据
+        product_data = {
+            'product_id': prod_id,
+            'product_name': prod_name,
+            'params': params
+        }
+
+        self.logger.info(f"成功提取产品信息: {prod_name} ({prod_id})")
+        return product_data
+
     def process_category_page(self, url):
         """
         处理VIVOTEK类别页面，从分类卡片到产品列表
@@ -195,7 +186,7 @@ class VivotekCrawler(BaseCrawler):
         all_product_links = []
 
         # 获取所有分类卡片
-        card_links = self.get_links_from_page(self.start_urls[0])
+        card_links = dedupe_urls(self.get_links_from_page(url))
         self.logger.info(f"共获取到{len(card_links)}个大类页面")
 
         # 从每个卡片获取产品链接
@@ -203,6 +194,7 @@ class VivotekCrawler(BaseCrawler):
             product_links = self.get_links_from_page(card_link)
             self.logger.info(f"处理大类页面: {card_link}，产品数量: {len(product_links)}")
             all_product_links.extend(product_links)
+            self.publish_links(product_links)
 
         self.logger.info(f"所有类别共找到 {len(all_product_links)} 个产品链接")
         return all_product_links
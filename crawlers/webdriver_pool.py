@@ -0,0 +1,136 @@
+import threading
+from contextlib import contextmanager
+
+
+class PooledDriver:
+    """
+    池中的一个WebDriver会话
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0  # 该会话已经处理的页面数
+        self.loaded_url = None  # 最近一次通过open_url打开的URL
+
+
+class WebDriverPool:
+    """
+    WebDriver会话池，支持借出/归还、健康检查，以及按处理页数或崩溃回收会话
+    """
+
+    def __init__(self, factory, size, max_pages, logger):
+        """
+        初始化会话池（会话在首次借出时才创建）
+
+        Args:
+            factory: 创建新WebDriver的无参函数
+            size: 池中最多同时存在的会话数
+            max_pages: 单个会话处理多少个页面后回收重建，0表示不回收
+            logger: 日志记录器
+        """
+        self._factory = factory
+        self.size = max(1, size)
+        self.max_pages = max_pages
+        self.logger = logger
+
+        self._idle = []
+        self._created = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def _is_healthy(self, session):
+        """通过一次轻量的WebDriver调用检查会话是否仍然可用"""
+        try:
+            session.driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, session, reason):
+        """关闭并丢弃一个会话"""
+        self.logger.info(f"回收WebDriver会话（{reason}），已处理 {session.pages} 个页面")
+        try:
+            session.driver.quit()
+        except Exception as e:
+            self.logger.debug(f"关闭WebDriver会话时出错: {str(e)}")
+        with self._cond:
+            self._created -= 1
+            self._cond.notify()
+
+    def acquire(self):
+        """
+        借出一个健康的会话，池满时阻塞等待其他会话归还
+
+        Returns:
+            PooledDriver对象
+        """
+        while True:
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("WebDriver会话池已关闭")
+                    if self._idle:
+                        session = self._idle.pop()
+                        break
+                    if self._created < self.size:
+                        self._created += 1
+                        session = None
+                        break
+                    self._cond.wait()
+
+            if session is None:
+                try:
+                    driver = self._factory()
+                except Exception:
+                    with self._cond:
+                        self._created -= 1
+                        self._cond.notify()
+                    raise
+                return PooledDriver(driver)
+
+            if self._is_healthy(session):
+                return session
+            self._discard(session, "健康检查失败")
+
+    def release(self, session, broken=False):
+        """
+        归还会话，已损坏、已达到页数上限或不健康的会话会被回收
+
+        Args:
+            session: acquire借出的PooledDriver
+            broken: 调用方是否已确认该会话出错
+        """
+        if self._closed:
+            self._discard(session, "会话池已关闭")
+        elif broken:
+            self._discard(session, "会话出错")
+        elif self.max_pages and session.pages >= self.max_pages:
+            self._discard(session, "达到页数上限")
+        elif not self._is_healthy(session):
+            self._discard(session, "健康检查失败")
+        else:
+            with self._cond:
+                self._idle.append(session)
+                self._cond.notify()
+
+    @contextmanager
+    def lease(self):
+        """以上下文管理器的方式借出会话，退出时自动归还"""
+        session = self.acquire()
+        broken = False
+        try:
+            yield session
+        except Exception:
+            broken = True
+            raise
+        finally:
+            self.release(session, broken)
+
+    def close(self):
+        """关闭会话池中所有空闲会话，借出中的会话在归还时关闭"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for session in idle:
+            self._discard(session, "会话池已关闭")
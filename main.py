@@ -1,11 +1,20 @@
+from __future__ import annotations
+
 import argparse
 import concurrent.futures
 import logging
+import logging.handlers
+import multiprocessing
 import os
+import signal
 import sys
-from typing import List, Type, Optional
+from typing import TYPE_CHECKING, List, Type, Optional
+
+from crawlers import CRAWLER_REGISTRY, load_crawler
+from crawlers import config as crawler_config
 
-from crawlers import BaseCrawler
+if TYPE_CHECKING:
+    from crawlers import BaseCrawler
 
 
 def ensure_dir_exists(directory):
@@ -20,6 +29,10 @@ def setup_logging():
     logger = logging.getLogger("main")
     logger.setLevel(logging.INFO)
 
+    # 进程模式下子进程也会导入本模块，子进程的日志交给主进程统一输出
+    if multiprocessing.current_process().name != "MainProcess":
+        return logger
+
     # 添加控制台处理器
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(logging.INFO)
@@ -45,29 +58,38 @@ def setup_logging():
 logger = setup_logging()
 
 
-def get_crawler_classes() -> List[Type[BaseCrawler]]:
+def get_crawler_classes(class_names: Optional[List[str]] = None) -> List[Type[BaseCrawler]]:
     """
-    使用__subclasses__()方法获取所有BaseCrawler的子类
+    从爬虫注册表中导入爬虫类，只导入需要运行的爬虫模块
+
+    Args:
+        class_names: 要运行的爬虫类名列表，如果为None则导入所有爬虫
 
     Returns:
         BaseCrawler子类列表
     """
-    # 获取所有BaseCrawler的子类
-    crawler_classes = BaseCrawler.__subclasses__()
-
-    for cls in crawler_classes:
-        logger.info(f"找到爬虫类: {cls.__name__}")
+    names = class_names or list(CRAWLER_REGISTRY)
+    crawler_classes = []
+    for name in names:
+        if name not in CRAWLER_REGISTRY:
+            logger.error(f"未注册的爬虫类: {name}")
+            continue
+        crawler_classes.append(load_crawler(name))
+        logger.info(f"找到爬虫类: {name}")
 
     return crawler_classes
 
 
-def execute_crawler(crawler_class: Type[BaseCrawler], data_dir: str) -> str:
+def execute_crawler(crawler_class: Type[BaseCrawler], data_dir: str,
+                    pipeline: bool = False, detail_workers: Optional[int] = None) -> str:
     """
     执行单个爬虫的函数，用于并行执行
 
     Args:
         crawler_class: 要执行的爬虫类
         data_dir: 数据保存目录
+        pipeline: 是否使用流水线模式（边发现链接边提取详情）
+        detail_workers: 流水线模式下的详情提取线程数，None表示使用默认配置
 
     Returns:
         执行结果信息
@@ -76,19 +98,197 @@ def execute_crawler(crawler_class: Type[BaseCrawler], data_dir: str) -> str:
     try:
         logger.info(f"开始运行爬虫: {crawler_name}")
         crawler = crawler_class(data_dir=data_dir)
-        crawler.run()
+        if pipeline:
+            crawler.pipeline = True
+        if detail_workers:
+            crawler.detail_workers = detail_workers
+        product_count = crawler.run()
         logger.info(f"爬虫 {crawler_name} 运行完成")
-        return f"爬虫 {crawler_name} 运行成功"
+        return f"爬虫 {crawler_name} 运行成功，共保存 {product_count} 个产品"
     except Exception as e:
         error_msg = f"运行爬虫 {crawler_name} 时出错: {str(e)}"
         logger.error(error_msg)
         return error_msg
 
 
+def _config_snapshot() -> dict:
+    """收集命令行参数修改后的爬虫配置，传给子进程"""
+    return {name: value for name, value in vars(crawler_config).items() if name.isupper()}
+
+
+def init_worker_process(log_queue, config_values: dict) -> None:
+    """
+    进程模式下子进程的初始化函数
+
+    Args:
+        log_queue: 把日志记录发回主进程的队列
+        config_values: 主进程中的爬虫配置
+    """
+    for name, value in config_values.items():
+        setattr(crawler_config, name, value)
+    # 爬虫日志不直接写控制台，经队列交给主进程输出，各品牌的日志文件仍由子进程写入
+    crawler_config.LOG_CONSOLE = False
+    root = logging.getLogger()
+    root.handlers = [logging.handlers.QueueHandler(log_queue)]
+    root.setLevel(logging.INFO)
+
+    # 主进程终止子进程时转换为SystemExit，使爬虫的finally块能关闭浏览器
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(1))
+
+
+def execute_crawler_in_process(class_name: str, data_dir: str,
+                               pipeline: bool = False, detail_workers: Optional[int] = None) -> str:
+    """
+    在子进程中按类名执行单个爬虫（爬虫类本身不跨进程传递）
+
+    Args:
+        class_name: 爬虫类名
+        data_dir: 数据保存目录
+        pipeline: 是否使用流水线模式
+        detail_workers: 流水线模式下的详情提取线程数
+
+    Returns:
+        执行结果信息
+    """
+    if class_name not in CRAWLER_REGISTRY:
+        return f"子进程中未找到爬虫类: {class_name}"
+    return execute_crawler(load_crawler(class_name), data_dir, pipeline, detail_workers)
+
+
+def execute_shard_task(class_name: str, data_dir: str, task: str, shard_count: int,
+                       shard: Optional[int] = None) -> str:
+    """
+    在子进程中执行分片模式的一个步骤
+
+    Args:
+        class_name: 爬虫类名
+        data_dir: 数据保存目录
+        task: discover（发现链接并写入任务队列）、shard（提取一个分片）或merge（合并分片输出）
+        shard_count: 分片数量
+        shard: 分片编号，仅task为shard时使用
+
+    Returns:
+        执行结果信息
+
+    Raises:
+        Exception: 步骤执行失败，由主进程决定是否继续后续步骤
+    """
+    if class_name not in CRAWLER_REGISTRY:
+        raise ValueError(f"子进程中未找到爬虫类: {class_name}")
+
+    crawler = load_crawler(class_name)(data_dir=data_dir)
+    if task == "discover":
+        count = crawler.run_discovery(shard_count)
+        return f"爬虫 {class_name} 链接发现完成，新加入 {count} 个产品链接"
+    if task == "shard":
+        count = crawler.run_shard(shard)
+        return f"爬虫 {class_name} 分片 {shard} 完成，提取 {count} 个产品"
+    count = crawler.merge_shards(shard_count)
+    return f"爬虫 {class_name} 运行成功，合并 {shard_count} 个分片共保存 {count} 个产品"
+
+
+def _run_sharded_crawler(executor, class_name: str, data_dir: str, shard_count: int) -> str:
+    """
+    按分片模式运行一个爬虫：先发现链接，再由各分片进程并行提取，最后合并输出
+
+    Args:
+        executor: 子进程池
+        class_name: 爬虫类名
+        data_dir: 数据保存目录
+        shard_count: 分片数量
+
+    Returns:
+        执行结果信息
+    """
+    logger.info(executor.submit(execute_shard_task, class_name, data_dir, "discover", shard_count).result())
+
+    shard_futures = [
+        executor.submit(execute_shard_task, class_name, data_dir, "shard", shard_count, shard)
+        for shard in range(shard_count)
+    ]
+    for shard, future in enumerate(shard_futures):
+        try:
+            logger.info(future.result())
+        except Exception as e:
+            # 失败的分片保留在任务队列中，使用--resume可以只重跑未完成的链接
+            logger.error(f"爬虫 {class_name} 分片 {shard} 执行失败: {str(e)}")
+
+    return executor.submit(execute_shard_task, class_name, data_dir, "merge", shard_count).result()
+
+
+def _run_in_threads(crawler_classes, data_dir, max_workers, pipeline, detail_workers):
+    """在当前进程中用线程池并行执行爬虫"""
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # 创建任务
+        future_to_crawler = {
+            executor.submit(execute_crawler, crawler_class, data_dir, pipeline, detail_workers):
+                crawler_class.__name__
+            for crawler_class in crawler_classes
+        }
+        _collect_results(future_to_crawler)
+
+
+def _run_in_processes(crawler_classes, data_dir, max_workers, pipeline, detail_workers, shards=1):
+    """
+    每个爬虫（分片模式下每个分片）在独立的子进程中执行，子进程的日志经队列汇总到主进程的控制台
+    """
+    # 使用spawn启动子进程，避免复制主进程中的线程和锁
+    context = multiprocessing.get_context("spawn")
+    log_queue = context.Queue()
+    console_handlers = [handler for handler in logger.handlers if not isinstance(handler, logging.FileHandler)]
+    listener = logging.handlers.QueueListener(log_queue, *console_handlers, respect_handler_level=True)
+    listener.start()
+
+    executor = concurrent.futures.ProcessPoolExecutor(
+        max_workers=max_workers or len(crawler_classes) * shards, mp_context=context,
+        initializer=init_worker_process, initargs=(log_queue, _config_snapshot()))
+    try:
+        if shards > 1:
+            # 每个爬虫由主进程中的一个线程按步骤调度，各步骤在子进程中执行
+            with concurrent.futures.ThreadPoolExecutor(max_workers=len(crawler_classes)) as coordinators:
+                future_to_crawler = {
+                    coordinators.submit(_run_sharded_crawler, executor, crawler_class.__name__, data_dir, shards):
+                        crawler_class.__name__
+                    for crawler_class in crawler_classes
+                }
+                _collect_results(future_to_crawler)
+        else:
+            future_to_crawler = {
+                executor.submit(execute_crawler_in_process, crawler_class.__name__, data_dir,
+                                pipeline, detail_workers):
+                    crawler_class.__name__
+                for crawler_class in crawler_classes
+            }
+            _collect_results(future_to_crawler)
+    except KeyboardInterrupt:
+        # 子进程同样收到中断信号，会在退出前关闭各自的浏览器
+        logger.warning("收到中断信号，等待子进程关闭浏览器后退出")
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    finally:
+        executor.shutdown(wait=True)
+        listener.stop()
+
+
+def _collect_results(future_to_crawler):
+    """等待所有爬虫任务完成并记录结果"""
+    for future in concurrent.futures.as_completed(future_to_crawler):
+        crawler_name = future_to_crawler[future]
+        try:
+            result = future.result()
+            logger.info(f"任务结果: {result}")
+        except Exception as e:
+            logger.error(f"爬虫 {crawler_name} 执行过程中发生异常: {str(e)}")
+
+
 def run_crawlers_parallel(crawler_classes: List[Type[BaseCrawler]],
                           data_dir: str = "data",
                           class_names: Optional[List[str]] = None,
-                          max_workers: int = None) -> None:
+                          max_workers: int = None,
+                          pipeline: bool = False,
+                          detail_workers: Optional[int] = None,
+                          mode: str = "thread",
+                          shards: int = 1) -> None:
     """
     并行运行指定的爬虫类
 
@@ -96,7 +296,11 @@ def run_crawlers_parallel(crawler_classes: List[Type[BaseCrawler]],
         crawler_classes: 要运行的爬虫类列表
         data_dir: 数据保存目录
         class_names: 要运行的爬虫类名列表，如果为None则运行所有类
-        max_workers: 最大工作线程数，None表示使用默认值(CPU数量*5)
+        max_workers: 最大并行数，None表示使用默认值（线程模式为CPU数量*5，进程模式为爬虫数量）
+        pipeline: 是否使用流水线模式
+        detail_workers: 每个爬虫的详情提取线程数
+        mode: 并行方式，thread表示所有爬虫在同一进程的线程池中运行，process表示每个爬虫一个子进程
+        shards: 每个爬虫的产品链接分成几个分片，大于1时每个分片一个子进程（强制使用process模式）
     """
     if not crawler_classes:
         logger.error("未找到任何爬虫类")
@@ -116,25 +320,17 @@ def run_crawlers_parallel(crawler_classes: List[Type[BaseCrawler]],
 
         crawler_classes = filtered_classes
 
-    # 并行执行所有爬虫
-    logger.info(f"将并行执行 {len(crawler_classes)} 个爬虫任务")
+    if shards > 1 and mode != "process":
+        logger.info("分片模式需要每个分片一个子进程，改用process模式运行")
+        mode = "process"
 
-    # 使用ThreadPoolExecutor并行执行爬虫
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # 创建任务
-        future_to_crawler = {
-            executor.submit(execute_crawler, crawler_class, data_dir): crawler_class.__name__
-            for crawler_class in crawler_classes
-        }
+    # 并行执行所有爬虫
+    logger.info(f"将以{mode}模式并行执行 {len(crawler_classes)} 个爬虫任务")
 
-        # 处理完成的任务
-        for future in concurrent.futures.as_completed(future_to_crawler):
-            crawler_name = future_to_crawler[future]
-            try:
-                result = future.result()
-                logger.info(f"任务结果: {result}")
-            except Exception as e:
-                logger.error(f"爬虫 {crawler_name} 执行过程中发生异常: {str(e)}")
+    if mode == "process":
+        _run_in_processes(crawler_classes, data_dir, max_workers, pipeline, detail_workers, shards)
+    else:
+        _run_in_threads(crawler_classes, data_dir, max_workers, pipeline, detail_workers)
 
     logger.info("所有爬虫任务已完成")
 
@@ -147,19 +343,47 @@ def main():
     parser.add_argument("--crawlers", type=str, nargs="*",
                         help="要运行的爬虫类名列表，如不指定则运行所有爬虫")
     parser.add_argument("--workers", type=int, default=None,
-                        help="最大并行工作线程数，默认为CPU核心数*5")
+                        help="最大并行数，线程模式默认为CPU核心数*5，进程模式默认为爬虫数量")
+    parser.add_argument("--mode", choices=["thread", "process"], default="thread",
+                        help="并行方式：thread为同一进程内的线程池，process为每个爬虫一个子进程")
+    parser.add_argument("--shards", type=int, default=1,
+                        help="把每个爬虫的产品链接按一致性哈希分成N个分片，各分片在独立的进程和浏览器中提取后合并输出")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="使用流水线模式，边发现产品链接边提取产品详情")
+    parser.add_argument("--detail-workers", type=int, default=None,
+                        help="流水线模式下每个爬虫的详情提取线程数")
+    parser.add_argument("--offline", action="store_true",
+                        help="离线重放模式，只使用磁盘缓存中的页面，不访问网络")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="不使用磁盘响应缓存")
+    parser.add_argument("--incremental", action="store_true",
+                        help="增量模式，只重新提取新增或内容有变化的产品，并与上次的数据合并")
+    parser.add_argument("--resume", action="store_true",
+                        help="从上次中断的进度继续，跳过已完成的类别页面和产品")
 
     args = parser.parse_args()
 
+    # 磁盘缓存设置需要在创建爬虫之前生效
+    if args.no_cache:
+        crawler_config.HTTP_CACHE_ENABLED = False
+    if args.offline:
+        crawler_config.HTTP_CACHE_ENABLED = True
+        crawler_config.HTTP_CACHE_OFFLINE = True
+    if args.incremental:
+        crawler_config.INCREMENTAL_ENABLED = True
+    if args.resume:
+        crawler_config.RESUME_ENABLED = True
+
     # 确保数据目录存在
     ensure_dir_exists(args.data_dir)
 
     logger.info("开始查找爬虫类...")
-    crawler_classes = get_crawler_classes()
+    crawler_classes = get_crawler_classes(args.crawlers)
 
     if crawler_classes:
         logger.info(f"共找到 {len(crawler_classes)} 个爬虫类")
-        run_crawlers_parallel(crawler_classes, args.data_dir, args.crawlers, args.workers)
+        run_crawlers_parallel(crawler_classes, args.data_dir, args.crawlers, args.workers,
+                              args.pipeline, args.detail_workers, args.mode, max(1, args.shards))
     else:
         logger.error("未找到任何爬虫类，请确保爬虫文件已正确导入")
 
@@ -0,0 +1,57 @@
+import json
+import os
+import tempfile
+import unittest
+
+from convert import iter_json_array
+
+
+class IterJsonArrayTest(unittest.TestCase):
+    """iter_json_array must return the same elements as json.load for every block size."""
+
+    def _check(self, text):
+        expected = json.loads(text)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'data.json')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            for block_size in range(1, len(text) + 2):
+                with self.subTest(block_size=block_size):
+                    self.assertEqual(list(iter_json_array(path, block_size=block_size)), expected)
+
+    def test_numbers_split_at_every_block_size(self):
+        self._check('[1.25, -3e10, 42, 0.5E-3 , 7]')
+
+    def test_products_split_at_every_block_size(self):
+        products = [
+            {'product_id': 1, 'product_name': 'IPC-1', 'params': [{'paramName': '分辨率', 'param': '4MP'}]},
+            {'product_id': 2.5, 'product_name': 'a "quoted" ] name', 'params': []},
+            [True, False, None, 'x,y]'],
+        ]
+        self._check(json.dumps(products, ensure_ascii=False, indent=2))
+
+    def test_empty_array(self):
+        self._check(' [ ] ')
+
+    def test_missing_separator_raises(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'data.json')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write('[1 2]')
+            with self.assertRaises(ValueError):
+                list(iter_json_array(path, block_size=2))
+
+    def test_stray_commas_raise(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'data.json')
+            for text in ['[,1]', '[1,,2]', '[1,]', '[1, ,2]', '[,]']:
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(text)
+                for block_size in (1, 3, 64):
+                    with self.subTest(text=text, block_size=block_size):
+                        with self.assertRaises(ValueError):
+                            list(iter_json_array(path, block_size=block_size))
+
+
+if __name__ == '__main__':
+    unittest.main()
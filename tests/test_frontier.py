@@ -0,0 +1,59 @@
+import unittest
+
+from crawlers.frontier import UrlFrontier, canonicalize_url, dedupe_urls
+
+
+class CanonicalizeUrlTest(unittest.TestCase):
+    """Different spellings of the same page canonicalize to the same URL."""
+
+    def test_equivalent_spellings(self):
+        expected = 'https://example.com/products/a%20b?id=1&lang=en'
+        for url in [
+            'https://example.com/products/a%20b?id=1&lang=en',
+            'HTTPS://Example.COM:443/products/a b?lang=en&id=1',
+            'https://example.com/products/a%20b?id=1&lang=en#specs',
+            'https://example.com/products/a%20b?utm_source=mail&id=1&UTM_medium=x&lang=en',
+            '  https://example.com/products/a%20b?id=1&lang=en\n',
+        ]:
+            with self.subTest(url=url):
+                self.assertEqual(canonicalize_url(url), expected)
+
+    def test_meaningful_differences_are_kept(self):
+        self.assertNotEqual(canonicalize_url('https://example.com:8443/a'), canonicalize_url('https://example.com/a'))
+        self.assertNotEqual(canonicalize_url('http://example.com/a'), canonicalize_url('https://example.com/a'))
+        self.assertNotEqual(canonicalize_url('https://example.com/a?id=1'), canonicalize_url('https://example.com/a?id=2'))
+        self.assertNotEqual(canonicalize_url('https://example.com/A'), canonicalize_url('https://example.com/a'))
+
+    def test_empty_path_and_blank_values(self):
+        self.assertEqual(canonicalize_url('https://example.com'), 'https://example.com/')
+        self.assertEqual(canonicalize_url('https://example.com/a?b=&a=1'), 'https://example.com/a?a=1&b=')
+
+    def test_dedupe_keeps_first_spelling(self):
+        urls = ['https://example.com/a#x', None, 'https://EXAMPLE.com/a', 'https://example.com/b', '']
+        self.assertEqual(dedupe_urls(urls), ['https://example.com/a#x', 'https://example.com/b'])
+
+
+class UrlFrontierTest(unittest.TestCase):
+
+    def test_filter_new(self):
+        frontier = UrlFrontier()
+        self.assertEqual(frontier.filter_new(['https://example.com/a', 'https://example.com/a?utm_x=1',
+                                              'https://example.com/b']),
+                         ['https://example.com/a', 'https://example.com/b'])
+        self.assertEqual(frontier.filter_new(['https://Example.com/b#top', 'https://example.com/c', None]),
+                         ['https://example.com/c'])
+        self.assertEqual(len(frontier), 3)
+        self.assertIn('https://example.com/a#anchor', frontier)
+        self.assertNotIn('https://example.com/d', frontier)
+
+    def test_add_and_clear(self):
+        frontier = UrlFrontier()
+        self.assertTrue(frontier.add('https://example.com/a'))
+        self.assertFalse(frontier.add('https://example.com:443/a'))
+        frontier.clear()
+        self.assertEqual(len(frontier), 0)
+        self.assertTrue(frontier.add('https://example.com/a'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+
+from lxml import html
+
+from crawlers.html_tables import extract_table, table_grid, table_records
+
+
+def _table(markup):
+    return html.fromstring(markup)
+
+
+class TableGridTest(unittest.TestCase):
+    """rowspan/colspan cells are copied into every grid position they cover."""
+
+    def test_rowspan_and_colspan(self):
+        table = _table("""
+            <table>
+              <tr><th rowspan="2">Item</th><th colspan="2">Budget</th><th>Note</th></tr>
+              <tr><th>Amount</th><th>Unit</th><th>-</th></tr>
+              <tr><td>Camera</td><td rowspan="2" colspan="2">1,000 元</td><td>x</td></tr>
+              <tr><td>NVR</td><td>y</td></tr>
+            </table>""")
+        self.assertEqual([row.cells for row in table_grid(table)], [
+            ['Item', 'Budget', 'Budget', 'Note'],
+            ['Item', 'Amount', 'Unit', '-'],
+            ['Camera', '1,000 元', '1,000 元', 'x'],
+            ['NVR', '1,000 元', '1,000 元', 'y'],
+        ])
+
+    def test_rowspan_past_row_end_and_short_rows(self):
+        table = _table("""
+            <table>
+              <tr><td>a</td><td>b</td><td rowspan="3">c</td></tr>
+              <tr><td>d</td></tr>
+              <tr></tr>
+            </table>""")
+        self.assertEqual([row.cells for row in table_grid(table)], [
+            ['a', 'b', 'c'],
+            ['d', '', 'c'],
+            ['', '', 'c'],
+        ])
+
+    def test_invalid_and_huge_spans(self):
+        table = _table('<table><tr><td colspan="x">a</td><td rowspan="0">b</td>'
+                       '<td colspan="100000">c</td></tr></table>')
+        cells = table_grid(table)[0].cells
+        self.assertEqual(cells[:3], ['a', 'b', 'c'])
+        self.assertEqual(len(cells), 1002)
+
+    def test_text_skips_scripts_and_comments(self):
+        table = _table('<table><tr><td> 型号 <script>var x = 1;</script><!-- c --><b>IPC</b>-1 </td></tr></table>')
+        self.assertEqual(table_grid(table)[0].cells, ['型号 IPC-1'])
+
+    def test_thead_and_th_flags(self):
+        table = _table('<table><thead><tr><th>A</th></tr></thead><tbody><tr><td>1</td></tr></tbody></table>')
+        grid = table_grid(table)
+        self.assertEqual([(row.in_thead, row.has_th) for row in grid], [(True, True), (False, False)])
+
+
+class TableRecordsTest(unittest.TestCase):
+
+    def test_header_detection_and_records(self):
+        table = _table("""
+            <table>
+              <tr><td></td><td></td></tr>
+              <tr><th>名称</th><th colspan="2">规格</th></tr>
+              <tr><td>摄像机</td><td>4MP</td><td>2.8mm</td></tr>
+              <tr><td>录像机</td><td>8路</td><td>8路</td></tr>
+              <tr><td></td><td></td><td></td></tr>
+            </table>""")
+        headers, rows = extract_table(table)
+        self.assertEqual(headers, ['名称', '规格', '规格'])
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(table_records(table), [
+            {'名称': '摄像机', '规格': '4MP 2.8mm'},
+            {'名称': '录像机', '规格': '8路'},
+        ])
+        self.assertEqual(table_records(table, keyword='录像'), [{'名称': '录像机', '规格': '8路'}])
+
+    def test_empty_table(self):
+        self.assertEqual(extract_table(_table('<table></table>')), ([], []))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import json
+import os
+import tempfile
+import unittest
+
+from crawlers.jsonl_writer import JsonlWriter, finalize_jsonl, iter_jsonl
+
+PRODUCTS = [
+    {'product_id': 'IPC-1', 'product_name': '网络摄像机', 'params': [{'paramName': '分辨率', 'param': '4MP'}]},
+    {'product_id': 'NVR-8', 'product_name': 'line\nbreak "quoted"', 'params': [], 'extra': {}},
+    {'product_id': 3, 'params': [{'paramName': 'Lens', 'param': ['2.8mm', '4mm']}], 'ok': True, 'x': None},
+]
+
+
+class JsonlWriterTest(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+
+    def _path(self, name):
+        return os.path.join(self.dir, name)
+
+    def _write(self, name, items, append=False):
+        writer = JsonlWriter(self._path(name), append=append, fsync_every=2)
+        for url, product in items:
+            writer.write(url, product)
+        writer.close()
+        return self._path(name)
+
+    def test_finalize_matches_json_dump(self):
+        """The finalized file is byte-for-byte what json.dump(indent=4) used to write."""
+        jsonl = self._write('a.jsonl', [(f'https://example.com/{i}', p) for i, p in enumerate(PRODUCTS)])
+        json_path = self._path('a.json')
+        self.assertEqual(finalize_jsonl(jsonl, json_path), len(PRODUCTS))
+        with open(json_path, encoding='utf-8') as f:
+            self.assertEqual(f.read(), json.dumps(PRODUCTS, ensure_ascii=False, indent=4))
+
+    def test_last_record_per_url_wins_across_files(self):
+        first = self._write('0.jsonl', [('u1', PRODUCTS[0]), ('u2', PRODUCTS[1])])
+        second = self._write('1.jsonl', [('u1', PRODUCTS[2])])
+        json_path = self._path('out.json')
+        self.assertEqual(finalize_jsonl([first, second], json_path), 2)
+        with open(json_path, encoding='utf-8') as f:
+            self.assertEqual(json.load(f), [PRODUCTS[1], PRODUCTS[2]])
+
+    def test_append_and_truncated_last_line(self):
+        path = self._write('a.jsonl', [('u1', PRODUCTS[0])])
+        self._write('a.jsonl', [('u2', PRODUCTS[1])], append=True)
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write('{"url": "u3", "data": {"prod')
+        self.assertEqual([record['url'] for _, record in iter_jsonl(path)], ['u1', 'u2'])
+
+    def test_empty_input_keeps_existing_output(self):
+        jsonl = self._write('empty.jsonl', [])
+        json_path = self._path('out.json')
+        with open(json_path, 'w', encoding='utf-8') as f:
+            f.write('[1]')
+        self.assertEqual(finalize_jsonl(jsonl, json_path), 0)
+        with open(json_path, encoding='utf-8') as f:
+            self.assertEqual(f.read(), '[1]')
+        self.assertFalse(os.path.exists(json_path + '.tmp'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+
+from crawlers.network_capture import build_endpoint_template, extract_params_from_json, param_names
+
+
+class BuildEndpointTemplateTest(unittest.TestCase):
+    """Only a path segment or query value that equals the product key becomes {key}."""
+
+    def test_path_segment(self):
+        template = build_endpoint_template('https://api.example.com/v1/spec/IPC-2T/detail', 'IPC-2T')
+        self.assertEqual(template, 'https://api.example.com/v1/spec/{key}/detail')
+        self.assertEqual(template.format(key='NVR-8'), 'https://api.example.com/v1/spec/NVR-8/detail')
+
+    def test_path_segment_with_extension(self):
+        template = build_endpoint_template('https://example.com/data/IPC-2T.json', 'IPC-2T')
+        self.assertEqual(template, 'https://example.com/data/{key}.json')
+
+    def test_query_value(self):
+        template = build_endpoint_template('https://example.com/api?lang=en&model=IPC%202T&t=1', 'IPC 2T')
+        self.assertEqual(template, 'https://example.com/api?lang=en&model={key}&t=1')
+
+    def test_partial_matches_are_left_alone(self):
+        # 123 appears inside the timestamp and the other id, but only the exact segment is the key
+        template = build_endpoint_template('https://example.com/p/123/spec?ts=1700123999&ref=9123', '123')
+        self.assertEqual(template, 'https://example.com/p/{key}/spec?ts=1700123999&ref=9123')
+
+    def test_ambiguous_or_missing_key(self):
+        self.assertIsNone(build_endpoint_template('https://example.com/p/123?id=123', '123'))
+        self.assertIsNone(build_endpoint_template('https://example.com/p/456', '123'))
+        self.assertIsNone(build_endpoint_template('https://example.com/p/123', ''))
+
+    def test_braces_and_fragment(self):
+        template = build_endpoint_template('https://example.com/p/123?q={x}#top', '123')
+        self.assertEqual(template.format(key='9'), 'https://example.com/p/9?q={x}')
+
+
+class ExtractParamsTest(unittest.TestCase):
+    """Name/value objects are found anywhere in a JSON payload."""
+
+    def test_nested_payload(self):
+        payload = {
+            'code': 0,
+            'data': {'groups': [
+                {'title': 'Camera', 'items': [{'name': 'Sensor', 'value': '1/2.8" CMOS'},
+                                              {'Label': 'Lens', 'Values': ['2.8mm', '4mm']}]},
+                {'items': [{'name': 'Sensor', 'value': '1/2.8" CMOS'}, {'name': 'Empty', 'value': ''}]},
+            ]},
+        }
+        self.assertEqual(extract_params_from_json(payload), [
+            {'paramName': 'Sensor', 'param': '1/2.8" CMOS'},
+            {'paramName': 'Lens', 'param': '2.8mm; 4mm'},
+        ])
+
+    def test_param_names_are_normalized(self):
+        params = [{'paramName': 'Image Sensor:', 'param': 'x'}, {'paramName': 'image sensor', 'param': 'y'},
+                  {'paramName': '分辨率：', 'param': 'z'}, {'paramName': '', 'param': 'w'}]
+        self.assertEqual(param_names(params), {'imagesensor', '分辨率'})
+
+
+if __name__ == '__main__':
+    unittest.main()
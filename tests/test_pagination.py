@@ -0,0 +1,67 @@
+import unittest
+
+from crawlers.pagination import api_page_template, links_from_json, page_url_template
+
+
+class PageUrlTemplateTest(unittest.TestCase):
+    """page_url_template recognises query, path and fragment page numbers."""
+
+    def test_query_parameter(self):
+        template = page_url_template('https://example.com/list?cat=5', 'https://example.com/list?cat=5&page=2', 2)
+        self.assertEqual(template.format(page=7), 'https://example.com/list?cat=5&page=7')
+
+    def test_prefers_known_page_parameter(self):
+        template = page_url_template('https://example.com/list?size=2',
+                                     'https://example.com/list?size=2&pageNo=2', 2)
+        self.assertEqual(template.format(page=3), 'https://example.com/list?size=2&pageNo=3')
+
+    def test_path_segment(self):
+        template = page_url_template('https://example.com/products/cameras/',
+                                     'https://example.com/products/cameras/page/2/', 2)
+        self.assertEqual(template, 'https://example.com/products/cameras/page/{page}/')
+
+    def test_path_file_name(self):
+        template = page_url_template('https://example.com/ipc/index.html', 'https://example.com/ipc/index_3.html', 3)
+        self.assertEqual(template.format(page=10), 'https://example.com/ipc/index_10.html')
+
+    def test_fragment(self):
+        template = page_url_template('https://example.com/list#/cat/1', 'https://example.com/list#/cat/1/p/2', 2)
+        self.assertEqual(template.format(page=4), 'https://example.com/list#/cat/1/p/4')
+
+    def test_unrecognised(self):
+        self.assertIsNone(page_url_template('https://example.com/list', 'https://example.com/list', 2))
+        self.assertIsNone(page_url_template('https://example.com/list', None, 2))
+        # 2 appears twice, so the page number cannot be located
+        self.assertIsNone(page_url_template('https://example.com/a', 'https://example.com/2/b/2', 2))
+
+    def test_literal_braces_are_escaped(self):
+        template = page_url_template('https://example.com/l?f={x}', 'https://example.com/l?f={x}&p=2', 2)
+        self.assertEqual(template.format(page=5), 'https://example.com/l?f=%7Bx%7D&p=5')
+
+
+class ApiPageTemplateTest(unittest.TestCase):
+
+    def test_page_parameter(self):
+        template = api_page_template('https://example.com/api/list?pageSize=20&pageIndex=3&lang=en', 3)
+        self.assertEqual(template.format(page=4), 'https://example.com/api/list?pageSize=20&pageIndex=4&lang=en')
+
+    def test_missing_page_parameter(self):
+        self.assertIsNone(api_page_template('https://example.com/api/list?pageSize=20', 3))
+
+
+class LinksFromJsonTest(unittest.TestCase):
+
+    def test_collects_link_fields_in_order(self):
+        payload = {'data': {'list': [
+            {'name': 'IPC-1', 'detailUrl': '/product/1'},
+            {'name': 'IPC-2', 'link': 'https://cdn.example.com/product/2', 'imagePath': 'img/2.png'},
+            {'name': 'IPC-1 again', 'detailUrl': '/product/1'},
+        ]}, 'total': 3}
+        self.assertEqual(links_from_json(payload, 'https://www.example.com/list'), [
+            'https://www.example.com/product/1',
+            'https://cdn.example.com/product/2',
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()
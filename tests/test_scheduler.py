@@ -0,0 +1,91 @@
+import unittest
+from email.utils import formatdate
+from unittest import mock
+
+from crawlers.scheduler import HostScheduler
+
+
+class FakeClock:
+    """Monotonic clock that only moves when the test advances it."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class HostSchedulerTest(unittest.TestCase):
+    """The token bucket and throttling feedback of HostScheduler, driven by a fake clock."""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch('crawlers.scheduler.time.monotonic', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.scheduler = HostScheduler(rate=2.0, burst=3, max_concurrency=10, host_overrides={})
+
+    def _delay(self, url='https://example.com/a'):
+        with self.scheduler._cond:
+            return self.scheduler._try_acquire(self.scheduler.host_of(url))
+
+    def test_burst_then_rate_limited(self):
+        self.assertEqual([self._delay() for _ in range(3)], [0, 0, 0])
+        self.assertAlmostEqual(self._delay(), 0.5)
+
+        self.clock.now += 0.5
+        self.assertEqual(self._delay(), 0)
+        self.assertAlmostEqual(self._delay(), 0.5)
+
+    def test_hosts_have_separate_buckets(self):
+        for _ in range(3):
+            self._delay('https://a.example.com/')
+        self.assertGreater(self._delay('https://a.example.com/'), 0)
+        self.assertEqual(self._delay('https://b.example.com/'), 0)
+
+    def test_concurrency_limit_waits_for_release(self):
+        scheduler = HostScheduler(rate=100.0, burst=100, max_concurrency=1, host_overrides={})
+        scheduler.acquire('https://example.com/a')
+        with scheduler._cond:
+            self.assertIsNone(scheduler._try_acquire('example.com'))
+        scheduler.release('https://example.com/a')
+        with scheduler._cond:
+            self.assertEqual(scheduler._try_acquire('example.com'), 0)
+
+    def test_host_override(self):
+        scheduler = HostScheduler(rate=2.0, burst=3, max_concurrency=10,
+                                  host_overrides={'slow.example.com': {'rate': 0.5, 'burst': 1}})
+        with scheduler._cond:
+            self.assertEqual(scheduler._try_acquire('slow.example.com'), 0)
+            self.assertAlmostEqual(scheduler._try_acquire('slow.example.com'), 2.0)
+
+    def test_retry_after_seconds_pauses_host(self):
+        self.assertTrue(self.scheduler.feedback('https://example.com/a', 429, '7'))
+        self.assertAlmostEqual(self._delay(), 7.0)
+
+        # After the pause the bucket refills, but at half the configured rate
+        self.clock.now += 7.0
+        self.assertEqual([self._delay() for _ in range(3)], [0, 0, 0])
+        self.assertAlmostEqual(self._delay(), 1.0)
+
+    def test_retry_after_http_date(self):
+        wait = HostScheduler._retry_after_seconds(formatdate(usegmt=True))
+        self.assertIsNotNone(wait)
+        self.assertLess(wait, 1.0)
+        self.assertIsNone(HostScheduler._retry_after_seconds('soon'))
+        self.assertIsNone(HostScheduler._retry_after_seconds(None))
+
+    def test_successful_responses_restore_rate(self):
+        self.scheduler.feedback('https://example.com/a', 503, '0')
+        state = self.scheduler._hosts['example.com']
+        self.assertEqual(state.penalty, 2.0)
+
+        self.assertFalse(self.scheduler.feedback('https://example.com/a', 200))
+        self.assertLess(state.penalty, 2.0)
+        for _ in range(20):
+            self.scheduler.feedback('https://example.com/a', 200)
+        self.assertEqual(state.penalty, 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import os
+import tempfile
+import unittest
+
+from crawlers.sharding import HashRing, ShardQueue
+
+URLS = [f'https://example.com/products/{i}' for i in range(2000)]
+
+
+class HashRingTest(unittest.TestCase):
+    """Links are assigned to shards deterministically and move little when the shard count changes."""
+
+    def test_assignment_is_stable(self):
+        first, second = HashRing(4), HashRing(4)
+        self.assertEqual([first.shard_of(url) for url in URLS], [second.shard_of(url) for url in URLS])
+
+    def test_equivalent_urls_share_a_shard(self):
+        ring = HashRing(8)
+        for url in URLS[:50]:
+            variant = url.replace('https://example.com', 'HTTPS://EXAMPLE.COM:443') + '#top'
+            self.assertEqual(ring.shard_of(url), ring.shard_of(variant))
+
+    def test_every_shard_gets_work(self):
+        ring = HashRing(4)
+        counts = [0] * 4
+        for url in URLS:
+            counts[ring.shard_of(url)] += 1
+        for count in counts:
+            self.assertGreater(count, len(URLS) / 4 * 0.5)
+
+    def test_adding_a_shard_moves_few_links(self):
+        before, after = HashRing(4), HashRing(5)
+        moved = [url for url in URLS if before.shard_of(url) != after.shard_of(url)]
+        # Only links taken over by the new shard move
+        self.assertTrue(all(after.shard_of(url) == 4 for url in moved))
+        self.assertLess(len(moved), len(URLS) * 0.35)
+
+
+class ShardQueueTest(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, 'queue.sqlite3')
+
+    def _open(self, *args, **kwargs):
+        queue = ShardQueue(self.path, *args, **kwargs)
+        self.addCleanup(queue.close)
+        return queue
+
+    def test_claim_only_own_links_in_order(self):
+        queue = self._open(3)
+        self.assertEqual(queue.add(URLS[:30]), 30)
+        self.assertEqual(queue.add(URLS[:40]), 10)
+
+        for shard in range(3):
+            expected = [url for url in URLS[:40] if queue.ring.shard_of(url) == shard]
+            self.assertEqual(queue.claim(shard, 100), expected)
+            self.assertEqual(queue.claim(shard, 100), [])
+        self.assertEqual(queue.summary(), {'running': 40})
+
+    def test_status_transitions(self):
+        queue = self._open(2)
+        queue.add(URLS[:20])
+        links = queue.claim(0, 3)
+        queue.mark_done(links[0])
+        queue.mark_failed(links[1], 'boom')
+        self.assertEqual(queue.summary(0)['running'], 1)
+
+        # An interrupted worker's running links go back to pending, failed ones only on retry
+        queue.requeue_running(0)
+        self.assertNotIn('running', queue.summary(0))
+        queue.retry_failed()
+        self.assertEqual(queue.summary(0)['done'], 1)
+        self.assertNotIn('failed', queue.summary(0))
+        self.assertNotIn(links[0], queue.claim(0, 100))
+
+    def test_reopen_keeps_shard_count_and_tasks(self):
+        queue = self._open(3)
+        queue.add(URLS[:10])
+        self.assertTrue(queue.fresh)
+        queue.close()
+
+        reopened = self._open()
+        self.assertFalse(reopened.fresh)
+        self.assertEqual(reopened.shard_count, 3)
+        self.assertEqual(reopened.summary(), {'pending': 10})
+
+    def test_changed_shard_count_resets(self):
+        self._open(3).add(URLS[:10])
+        queue = self._open(4)
+        self.assertTrue(queue.fresh)
+        self.assertEqual(queue.summary(), {})
+
+    def test_missing_shard_count(self):
+        with self.assertRaises(ValueError):
+            ShardQueue(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()